@@ -0,0 +1,6 @@
+import sys
+
+from .hfclib import cli
+
+
+sys.exit(cli())
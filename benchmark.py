@@ -0,0 +1,122 @@
+import hfclib
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+
+
+# Builds a HFC text with the given number of sections and variables per section
+def generate_hfc(sections: int, variables: int) -> str:
+    hfc = ""
+
+    for section in range(sections):
+        hfc += f"== Section {section} ==\n"
+        for variable in range(variables):
+            # Mix integers and strings
+            value = variable if variable % 2 == 0 else f'"value {variable}"'
+            hfc += f"var_{variable} = {value}\n"
+
+    return hfc
+
+
+def bench_attribute_access(sections=20, variables=20, number=200000):
+    hfc = hfclib.parseHfc(hfc_text=generate_hfc(sections, variables))
+    config = hfclib.buildConfig(hfc)
+
+    section_name = f"Section {sections - 1}"
+    variable_name = f"var_{variables - 1}"
+    section = getattr(config, hfclib._attribute_name(section_name))
+
+    plain_hfc = list(hfc)
+
+    results = {
+        "getVariableValue": timeit.timeit(lambda: hfclib.getVariableValue(section_name, variable_name, plain_hfc), number=number),
+        "getVariableValue (memoized)": timeit.timeit(lambda: hfclib.getVariableValue(section_name, variable_name, hfc), number=number),
+        "attribute": timeit.timeit(f"section.{variable_name}", globals={"section": section}, number=number),
+    }
+    memory = {
+        "dict": sys.getsizeof(hfclib.getVariables(section_name, hfc)),
+        "__slots__": sys.getsizeof(section),
+    }
+
+    print(f"Attribute access ({sections} sections x {variables} variables, {number} reads)")
+    for name, seconds in results.items():
+        print(f"  {name}: {seconds / number * 1e9:.0f} ns/read")
+    for name, size in memory.items():
+        print(f"  {name}: {size} bytes/section")
+
+
+def bench_memory(sections=50, variables=1000):
+    hfc_text = generate_hfc(sections, variables)
+    total = sections * variables
+    results = {}
+
+    for name, parse in [("parseHfc", hfclib.parseHfc), ("parseCompact", hfclib.parseCompact)]:
+        tracemalloc.start()
+        parsed = parse(hfc_text=hfc_text)
+        results[name] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del parsed
+
+    print(f"Memory ({total} variables)")
+    for name, size in results.items():
+        print(f"  {name}: {size / total:.1f} bytes/variable")
+
+
+def bench_snapshot_reads(threads=(1, 2, 4, 8), reads=100000):
+    store = hfclib.HfcStore(hfclib.parseHfc(hfc_text=generate_hfc(20, 20)))
+    lock = threading.Lock()
+
+    def read_snapshot():
+        for _ in range(reads):
+            store.snapshot().getVariableValue("Section 19", "var_19")
+
+    def read_locked():
+        for _ in range(reads):
+            with lock:
+                store.snapshot().getVariableValue("Section 19", "var_19")
+
+    print(f"Concurrent reads ({reads} reads per thread)")
+    for count in threads:
+        for name, target in [("snapshot", read_snapshot), ("global lock", read_locked)]:
+            workers = [threading.Thread(target=target) for _ in range(count)]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            seconds = time.perf_counter() - start
+
+            print(f"  {count} thread(s), {name}: {count * reads / seconds:.0f} reads/s")
+
+
+def bench_numeric_list(items=100000, number=3):
+    hfc_text = "== Weights ==\nshards = [" + ", ".join(str(item) for item in range(items)) + "]\n"
+
+    print(f"Numeric list ({items} integers)")
+    for name, numeric_arrays in [("python list", ""), ("array.array", "array")]:
+        seconds = timeit.timeit(lambda: hfclib.parseHfc(hfc_text=hfc_text, numeric_arrays=numeric_arrays), number=number) / number
+        print(f"  {name}: {seconds * 1000:.1f} ms/parse")
+
+
+def bench_dialect(sections=100, variables=50, number=5):
+    hfc_text = generate_hfc(sections, variables)
+    dialect = hfclib.compileDialect()
+
+    print(f"Parse ({sections} sections x {variables} variables)")
+    for name, parse_dialect in [("langconf", None), ("compiled dialect", dialect)]:
+        seconds = timeit.timeit(lambda: hfclib.parseHfc(hfc_text=hfc_text, dialect=parse_dialect), number=number) / number
+        print(f"  {name}: {seconds * 1000:.1f} ms/parse")
+
+
+def main():
+    bench_attribute_access()
+    bench_memory()
+    bench_snapshot_reads()
+    bench_numeric_list()
+    bench_dialect()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,9 @@ class NotHFC(Exception):
 class MaxDepth(Exception):
     pass
 
+class IncludeCycle(Exception):
+    pass
+
 
 class langconf:
     COMMENT_CHARS = ["->", "//"]
@@ -28,6 +31,8 @@ class langconf:
     LIST_REGEXES = [r"^\[.*\]$", r"^\(.*\)$"]  # Match [] and ()
     LIST_CHARS = ["[", "]", "(", ")"]
     LIST_INDEX_SEP = ", "
+    INTEGER_LIST_REGEX = r"^\[(-?\d+(?:, -?\d+)*)\]$" # Homogeneous numeric lists, see parseHfc(numeric_arrays=...)
+    FLOAT_LIST_REGEX = r"^\[(\d+(?:[.,]\d+)?(?:, \d+(?:[.,]\d+)?)*)\]$"
     BOOLEAN_TRUE = ["yes", "true", "sim", "verdadeiro", "y", "s"]
     BOOLEAN_FALSE = ["no", "false", "nao", "falso", "n"]
     IP_ADDR_REGEX = r"\b((25[0-5]|2[0-4]\d|1\d{2}|[1-9]?\d)\.){3}(25[0-5]|2[0-4]\d|1\d{2}|[1-9]?\d)\b"
@@ -38,6 +43,8 @@ class langconf:
     HEX_VALUE_REGEX_0x = r"\b0[xX][0-9a-fA-F]+\b"
     COLOR_HEX_REGEX = r"^#([0-9a-fA-F]{6}|[0-9a-fA-F]{3})$"
     INVALID_NAME_REGEXES = [r"^\s*$"] # Contains regexes with invalid naming
+    INCLUDE_DIRECTIVE = "@include"
+    INCLUDE_REGEX = fr'^{INCLUDE_DIRECTIVE}\s+{STRING_CHAR}(.+){STRING_CHAR}$'
     #URL_REGEX = r"^https?:\/\/(?:www\.)?([-a-zA-Z0-9@:%._\+~#=]{2,256}\.[a-z]{2,6}\b)*(\/[\/\d\w\.-]*)*(?:[\?])*(.+)*$"
 
 
@@ -94,6 +101,10 @@ def _replace(text: str, chars: list, replace_to: str, outside_only=False) -> str
 
 
 def _validate(regex: str, text: str) -> bool:
+    # Compiled regexes (see Dialect) skip the lookup in the re module cache
+    if type(regex) == re.Pattern:
+        return regex.fullmatch(text.strip())
+
     result = re.fullmatch(regex, text.strip())
 
     return result
@@ -154,102 +165,204 @@ def _join_list_with_char(input_list: list, chars: list[str, str], list_separator
     return output_list
 
 
+# Split the items of a list value, keeping nested lists and strings together
+def _split_list(value: str, lang=langconf) -> list[str]:
+    # Remove brackets and split by space
+    value_fix = _replace(text=value, chars=lang.LIST_CHARS, replace_to="", outside_only=True)
+
+    value_list = value_fix.split(lang.LIST_INDEX_SEP)
+
+    # Convert lists
+    index = 0
+    for char in lang.LIST_CHARS:
+        if index % 2 == 0: # To separate by pairs.
+            char_1 = char
+            char_2 = lang.LIST_CHARS[index+1]
+            value_list = _join_list_with_char(input_list=value_list, chars=[char_1, char_2], list_separator=lang.LIST_INDEX_SEP, is_nlist=True)
+
+        index += 1
+
+    # Value list corrected with strings
+    return _join_list_with_char(input_list=value_list, chars=[lang.STRING_CHAR, lang.STRING_CHAR], list_separator=lang.LIST_INDEX_SEP)
+
+
+# Get the special type of a string value, or None if it isn't special
+def _special_type(value: str, lang=langconf):
+    special_validators = [
+        ("ip_address", lang.IP_ADDR_REGEX), ("ip_address", lang.IP_ADDR_WPORT_REGEX),
+        ("ip6_address", lang.IPV6_ADDR_REGEX), ("ip6_address", lang.IPV6_ADDR_WPORT_REGEX),
+        ("hexadecimal", lang.HEX_VALUE_REGEX), ("hexadecimal", lang.HEX_VALUE_REGEX_0x),
+        ("hex_color", lang.COLOR_HEX_REGEX),
+        #("url", lang.URL_REGEX),
+    ]
+
+    for name, regex in special_validators:
+        if _validate(regex, value):
+            return name
+
+    return None
+
+
 # Convert the value and output it
-def _get_converted(value: str, line_num: int):
+def _get_converted(value: str, line_num: int, lang=langconf):
     """
     Converts a string value to its appropriate type.
 
     Args:
         value (str): The value to be converted
         line_num (int): The line number of the value in the parsed HFC file
+        lang: The syntax settings, langconf or a Dialect
 
     Returns:
         Any: The converted value
     """
     converted = ""
-    is_list = False
 
     # First, going to check if it's a list
-    for regex in langconf.LIST_REGEXES:
+    for regex in lang.LIST_REGEXES:
         if _validate(regex, value):
-            is_list = True
-
-            # Remove brackets and split by space
-            value_fix = _replace(text=value, chars=langconf.LIST_CHARS, replace_to="", outside_only=True)
-            
-            value_list = value_fix.split(langconf.LIST_INDEX_SEP)
+            value_list = _split_list(value, lang)
             converted_list = []
 
-            # Convert lists
-            index = 0
-            for char in langconf.LIST_CHARS:
-                if index % 2 == 0: # To separate by pairs.
-                    char_1 = char
-                    char_2 = langconf.LIST_CHARS[index+1]
-                    value_list = _join_list_with_char(input_list=value_list, chars=[char_1, char_2], list_separator=langconf.LIST_INDEX_SEP, is_nlist=True)
-
-                index += 1
-
-            # Value list corrected with strings
-            value_list = _join_list_with_char(input_list=value_list, chars=[langconf.STRING_CHAR, langconf.STRING_CHAR], list_separator=langconf.LIST_INDEX_SEP)
-
             # The corrected list
             index = 0
             for val in value_list:
-                _debug(f"{val}", line=line_num, index=index)           
-                converted_list.append(_get_converted(_strip(val), line_num=line_num))
+                _debug(f"{val}", line=line_num, index=index)
+                converted_list.append(_get_converted(_strip(val), line_num=line_num, lang=lang))
                 index += 1
-            
+
             return converted_list
 
     # Only check in case of not being a list
-    if not is_list:
-        _debug(f"{value}", line=line_num)
-        # Checking variable type
-        if _validate(langconf.STRING_REGEX, text=value): # Checking if it's string
-            converted = value.replace(langconf.STRING_CHAR, "")
-        elif _validate(langconf.INTEGER_REGEX, text=value): # If it's a valid integer
-            converted = int(value)
-        elif _validate(langconf.FLOAT_REGEX, text=value): # Checking if it's float
-            # Convert to universal "." as decimal separator
-            converted = float(_replace(text=value, chars=langconf.NON_STANDARD_FLOAT_SEPS, replace_to=langconf.STANDARD_FLOAT_SEP))
-        elif value in langconf.BOOLEAN_FALSE:
-            converted = False
-        elif value in langconf.BOOLEAN_TRUE:
-            converted = True
-        else:
-            ip_addr_validators = [langconf.IP_ADDR_REGEX, langconf.IP_ADDR_WPORT_REGEX, langconf.IPV6_ADDR_REGEX, langconf.IPV6_ADDR_WPORT_REGEX]
-            is_special = False
+    _debug(f"{value}", line=line_num)
+    # Checking variable type
+    if _validate(lang.STRING_REGEX, text=value): # Checking if it's string
+        converted = value.replace(lang.STRING_CHAR, "")
+    elif _validate(lang.INTEGER_REGEX, text=value): # If it's a valid integer
+        converted = int(value)
+    elif _validate(lang.FLOAT_REGEX, text=value): # Checking if it's float
+        # Convert to universal "." as decimal separator
+        converted = float(_replace(text=value, chars=lang.NON_STANDARD_FLOAT_SEPS, replace_to=lang.STANDARD_FLOAT_SEP))
+    elif value in lang.BOOLEAN_FALSE:
+        converted = False
+    elif value in lang.BOOLEAN_TRUE:
+        converted = True
+    elif _special_type(value, lang) is not None:
+        converted = value
+    else:
+        raise SyntaxError(f"Invalid variable declaration at line {line_num}.")
+    _debug(f"{value} -> {converted}", line=line_num)
+    return converted
 
-            hex_validators = [langconf.HEX_VALUE_REGEX, langconf.HEX_VALUE_REGEX_0x, langconf.COLOR_HEX_REGEX]
-            #url_validators = [langconf.URL_REGEX]
 
-            special_validators = ip_addr_validators + hex_validators #+ url_validators
+# Get the hfc type name of a value without converting it, or None if it's invalid
+def _classify_value(value: str, lang=langconf):
+    for regex in lang.LIST_REGEXES:
+        if _validate(regex, value):
+            for val in _split_list(value, lang):
+                if _classify_value(_strip(val), lang) is None:
+                    return None
+
+            return "list"
+
+    if _validate(lang.STRING_REGEX, text=value):
+        return "string"
+    if _validate(lang.INTEGER_REGEX, text=value):
+        return "integer"
+    if _validate(lang.FLOAT_REGEX, text=value):
+        return "float"
+    if value in lang.BOOLEAN_FALSE or value in lang.BOOLEAN_TRUE:
+        return "boolean"
+
+    return _special_type(value, lang)
+
+
+# Homogeneous numeric lists of langconf, read by _scan_numeric_list instead of _get_converted
+_INTEGER_LIST_REGEX = re.compile(langconf.INTEGER_LIST_REGEX)
+_FLOAT_LIST_REGEX = re.compile(langconf.FLOAT_LIST_REGEX)
+
+
+# Read a list of integers or floats straight to a typed array, or None if it isn't one
+def _scan_numeric_list(value: str, numeric_arrays: str, lang=langconf):
+    from array import array
+
+    value = value.strip()
+    integer_regex, float_regex = (_INTEGER_LIST_REGEX, _FLOAT_LIST_REGEX) if lang is langconf else (lang.INTEGER_LIST_REGEX, lang.FLOAT_LIST_REGEX)
+
+    match = integer_regex.fullmatch(value)
+    if match:
+        items = match.group(1).split(lang.LIST_INDEX_SEP)
+        typecode, dtype, convert = "q", "int64", int
+    else:
+        match = float_regex.fullmatch(value)
+        if not match:
+            return None
+
+        items = match.group(1).split(lang.LIST_INDEX_SEP)
+        for float_sep in lang.NON_STANDARD_FLOAT_SEPS:
+            items = [item.replace(float_sep, ".") for item in items]
+        typecode, dtype, convert = "d", "float64", float
+
+    if numeric_arrays == "numpy":
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+        if numpy is not None:
+            try:
+                return numpy.fromiter(map(convert, items), dtype=dtype, count=len(items))
+            except OverflowError:
+                return None
+
+    try:
+        return array(typecode, map(convert, items))
+    except OverflowError:
+        # Integers that don't fit 64 bits are kept as python lists
+        return None
+
+
+# Check if a value is an array returned by _scan_numeric_list
+def _is_numeric_array(value) -> bool:
+    from array import array
+
+    return isinstance(value, array) or (hasattr(value, "dtype") and hasattr(value, "ndim"))
+
+
+# Let json write numeric arrays as lists. array.array and NumPy arrays both have tolist()
+def _json_default(value):
+    if _is_numeric_array(value):
+        return value.tolist()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Convert a value, reading numeric lists as typed arrays if asked to
+def _convert_value(value: str, line_num: int, numeric_arrays="", lang=langconf):
+    if numeric_arrays:
+        converted = _scan_numeric_list(value, numeric_arrays, lang)
+        if converted is not None:
+            return converted
+
+    return _get_converted(value=value, line_num=line_num, lang=lang)
 
-            for i in special_validators:
-                if _validate(i, value):
-                    is_special = True
-            
-            if is_special:
-                converted = value
-            else:
-                raise SyntaxError(f"Invalid variable declaration at line {line_num}.")
-    _debug(f"{value} -> {converted}", line=line_num) 
-    return converted
-        
 
 # Convert a value to a hfc variable
-def _convert_to_hfc(definition, list_char: list[str, str], bool_false: str, bool_true: str, float_separator: str):
+def _convert_to_hfc(definition, list_char: list[str, str], bool_false: str, bool_true: str, float_separator: str, lang=langconf):
     def_list = ""
 
     _debug(f"Converting to hfc: {definition}")
+    # Void variables are written as a bare name, so None has no value syntax
+    if definition is None:
+        raise NotHFC("None is only valid as a void variable, not as a value.")
+
     if type(definition) == str:
         _debug(f"{definition} is string.")
-        ip_addr_validators = [langconf.IP_ADDR_REGEX, langconf.IP_ADDR_WPORT_REGEX, langconf.IPV6_ADDR_REGEX, langconf.IPV6_ADDR_WPORT_REGEX]
+        ip_addr_validators = [lang.IP_ADDR_REGEX, lang.IP_ADDR_WPORT_REGEX, lang.IPV6_ADDR_REGEX, lang.IPV6_ADDR_WPORT_REGEX]
         is_special = False
 
-        hex_validators = [langconf.HEX_VALUE_REGEX, langconf.HEX_VALUE_REGEX_0x, langconf.COLOR_HEX_REGEX]
-        #url_validators = [langconf.URL_REGEX]
+        hex_validators = [lang.HEX_VALUE_REGEX, lang.HEX_VALUE_REGEX_0x, lang.COLOR_HEX_REGEX]
+        #url_validators = [lang.URL_REGEX]
 
         special_validators = ip_addr_validators + hex_validators #+ url_validators
 
@@ -262,9 +375,25 @@ def _convert_to_hfc(definition, list_char: list[str, str], bool_false: str, bool
             definition = f"{definition}"
             _debug(f"{definition} is special string.")
         else:
-            definition = f'{langconf.STRING_CHAR}{definition}{langconf.STRING_CHAR}'
+            definition = f'{lang.STRING_CHAR}{definition}{lang.STRING_CHAR}'
             _debug(f"{definition} is a normal string.")
 
+    if _is_numeric_array(definition):
+        _debug(f"{definition} is a numeric array.")
+        # Written item by item, without making a python list first
+        if getattr(definition, "ndim", 1) != 1:
+            raise NotHFC("Only one-dimensional arrays can be written to a HFC file.")
+
+        if getattr(definition, "typecode", None) == "d" or getattr(getattr(definition, "dtype", None), "kind", None) == "f":
+            items = (str(_convert_to_hfc(float(item), list_char, bool_false, bool_true, float_separator, lang)) for item in definition)
+        else:
+            items = map(str, definition)
+
+        definition = f"{list_char[0]}{lang.LIST_INDEX_SEP.join(items)}{list_char[1]}"
+
+        if not any(_validate(regex, definition) for regex in lang.LIST_REGEXES):
+            raise TypeError("list_char values are not valid, so it didn't generate a valid HFC file.")
+
     if type(definition) == list:
         _debug(f"{definition} is a list.")
         # Valid hfc list converting
@@ -285,9 +414,9 @@ def _convert_to_hfc(definition, list_char: list[str, str], bool_false: str, bool
         def_index = 0
         for i in definition:
             _debug(f"{i}", index=def_index)
-            string = langconf.LIST_INDEX_SEP if def_index > 0 else "" # Separator string
+            string = lang.LIST_INDEX_SEP if def_index > 0 else "" # Separator string
             try:
-                def_list += f"{string}{_convert_to_hfc(i, list_char, bool_false, bool_true, float_separator)}"
+                def_list += f"{string}{_convert_to_hfc(i, list_char, bool_false, bool_true, float_separator, lang)}"
             except Exception as e:
                 raise e
             
@@ -298,7 +427,7 @@ def _convert_to_hfc(definition, list_char: list[str, str], bool_false: str, bool
         # If the outcome is a valid list
         valid = False
         _debug("Checking validity of generated list.")
-        for regex in langconf.LIST_REGEXES:
+        for regex in lang.LIST_REGEXES:
             _debug(f"Checking {regex}")
             if _validate(regex, def_list):
                 valid = True
@@ -314,11 +443,11 @@ def _convert_to_hfc(definition, list_char: list[str, str], bool_false: str, bool
     if type(definition) == bool:
         _debug(f"{definition} is boolean.")
         if definition:
-            if bool_true in langconf.BOOLEAN_TRUE:
+            if bool_true in lang.BOOLEAN_TRUE:
                 definition = bool_true
         else:
-            if bool_false in langconf.BOOLEAN_FALSE:
-                definition = bool_true
+            if bool_false in lang.BOOLEAN_FALSE:
+                definition = bool_false
 
         if type(definition) != str:
             raise NotHFC("One of the booleans value are not valid, so it didn't generate a valid HFC file.")
@@ -328,9 +457,9 @@ def _convert_to_hfc(definition, list_char: list[str, str], bool_false: str, bool
     if type(definition) == float:
         _debug(f"{definition} is a float.")
         # Replace for the defined separator
-        if float_separator in langconf.ALL_FLOAT_SEP and float_separator != langconf.STANDARD_FLOAT_SEP: # Like if the standard float sep will ever change lol
+        if float_separator in lang.ALL_FLOAT_SEP and float_separator != lang.STANDARD_FLOAT_SEP: # Like if the standard float sep will ever change lol
             definition = str(definition).replace(".", float_separator)
-        elif float_separator == langconf.STANDARD_FLOAT_SEP:
+        elif float_separator == lang.STANDARD_FLOAT_SEP:
             pass
         else:
             raise NotHFC("Invalid float_separator caused a invalid HFC text.")
@@ -361,6 +490,8 @@ def _variable_exists(hfc_list: list[dict[dict]], section_name: str, variable_nam
 
 
 def _clear_empty_sections(hfc_list: list[dict[dict]]):
+    length = len(hfc_list)
+
     for section in hfc_list:
         if not section:
             hfc_list.remove(section)
@@ -369,773 +500,5138 @@ def _clear_empty_sections(hfc_list: list[dict[dict]]):
                 if section_name == "":
                     hfc_list.remove(section)
 
+    if len(hfc_list) != length:
+        _touch(hfc_list, "")
+
     return hfc_list
 
 
-def parseHfc(hfc_path="", hfc_text="", json_path = "", json_indent=4) -> list[dict[dict]]:
+class HfcDocument(list):
     """
-    Parse a HFC text/file to a list of dictionaries.
+    A HFC list that counts its changes.
+
+    parseHfc() and generateHFC() return it. Every function of the module that changes it bumps its
+    version, and the results of the accessor functions (getSections(), getVariables(),
+    getVariableValue(), findSection() and findVariable()) are memoized until the next change.
+    Variables changed directly in its sections are noticed too, since each HfcSection counts its
+    changes.
 
     Parameters
     ----------
-    hfc_path : str
-        The path to the HFC file.
-    hfc_text : str
-        The HFC text to parse.
-    json_path : str
-        The path to save the parsed HFC as a JSON file. If empty, it won't save.
-    json_indent : int
-        The indentation of the JSON file. If json_path is empty, it will be ignored.
+    hfc_list : list[dict[dict]]
+        The initial sections.
+    memo_size : int
+        How many accessor results are kept. The least recently used are dropped first.
+    """
+    def __init__(self, hfc_list=(), memo_size=256):
+        from collections import OrderedDict
+
+        super().__init__(hfc_list)
+        self.version = 0
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._memo_version = 0
+        self._section_versions = {} # Section name -> version of its content
+        self._section_index = None # Section name (None for all of them) -> its variables, at _memo_version
+        self._render_cache = {} # id of a section dict -> (section dict, variables, versions, options, text)
+
+    def touch(self, *section_names):
+        """
+        Bump the version. Call it after replacing or renaming sections, or changing variables of
+        sections that aren't HfcSection, without the module functions.
+
+        Parameters
+        ----------
+        *section_names : str
+            The names of the changed sections. If none is given, every section is considered changed.
+        """
+        self.version += 1
+
+        if not section_names:
+            self._section_versions.clear()
+            self._render_cache.clear()
+
+        for section_name in section_names:
+            self._section_versions[section_name] = self._section_versions.get(section_name, 0) + 1
+
+    def _sectionVersion(self, section_name: str) -> int:
+        return self._section_versions.get(section_name, 0)
+
+    # Bump the version after the list changed, and the versions of the sections added or removed
+    def _listChanged(self, sections=()):
+        section_names = [name for section in sections if isinstance(section, dict) for name in section]
+        if section_names:
+            self.touch(*section_names)
+        else:
+            self.version += 1
+
+    def append(self, section):
+        super().append(section)
+        self._listChanged([section])
+
+    def extend(self, sections):
+        sections = list(sections)
+        super().extend(sections)
+        self._listChanged(sections)
+
+    def insert(self, index, section):
+        super().insert(index, section)
+        self._listChanged([section])
+
+    def remove(self, section):
+        super().remove(section)
+        self._listChanged([section])
+
+    def pop(self, index=-1):
+        section = super().pop(index)
+        self._listChanged([section])
+        return section
+
+    def clear(self):
+        sections = list(self)
+        super().clear()
+        self._listChanged(sections)
+
+    def __setitem__(self, index, value):
+        old = self[index] if isinstance(index, slice) else [self[index]]
+        if isinstance(index, slice):
+            value = list(value)
+        super().__setitem__(index, value)
+        self._listChanged(old + (value if isinstance(index, slice) else [value]))
+
+    def __delitem__(self, index):
+        old = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        self._listChanged(old)
+
+    def __iadd__(self, sections):
+        self.extend(sections)
+        return self
+
+    def __imul__(self, count):
+        super().__imul__(count)
+        self._listChanged(self)
+        return self
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._listChanged()
+
+    def reverse(self):
+        super().reverse()
+        self._listChanged()
+
+    def __reduce_ex__(self, protocol):
+        # The memo and the render cache aren't kept, they are rebuilt when used
+        state = {"version": self.version, "_section_versions": dict(self._section_versions)}
+        return type(self), (list(self), self.memo_size), state
+
+    # Get the variables of the sections with a name, or of every section if section_name is None. None
+    # if any of them isn't a HfcSection, since its changes can't be noticed
+    def _readSections(self, section_name):
+        if self._section_index is None:
+            index = {None: []}
+            for section in self:
+                for name, variables in section.items():
+                    index.setdefault(name, []).append(variables)
+                    index[None].append(variables)
+
+            self._section_index = {name: (sections if all(isinstance(variables, HfcSection) for variables in sections) else None) for name, sections in index.items()}
+
+        return self._section_index.get(section_name, [])
+
+    def _memoized(self, function, key, args, kwargs, reads, section_name):
+        if self._memo_version != self.version:
+            self._memo.clear()
+            self._memo_version = self.version
+            self._section_index = None
+
+        # The result is valid while the change counts of the sections it read stay the same
+        sections = self._readSections(section_name if reads == "section" else None) if reads != "names" else []
+        if sections is None:
+            return function(*args, **kwargs)
+        changes = tuple(variables._changes for variables in sections)
+
+        cached = self._memo.get(key)
+        if cached is not None and cached[1] == changes:
+            self._memo.move_to_end(key)
+            return cached[0]
+
+        result = function(*args, **kwargs)
+        self._memo[key] = (result, changes)
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+        return result
+
+
+# Bump the version of a document after some of its sections were changed
+def _touch(hfc_list: list[dict[dict]], *section_names):
+    if isinstance(hfc_list, HfcDocument):
+        hfc_list.touch(*section_names)
+
+
+# Memoize an accessor function per version of HfcDocument arguments. reads tells which sections the
+# result depends on: "section" (those named by section_name), "all" or "names" (only their names)
+def _memoized(reads: str):
+    import functools
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not kwargs:
+                hfc_list = args[-1] if args else None
+                key = (function.__name__, args[:-1])
+            elif "hfc_list" in kwargs:
+                hfc_list = kwargs["hfc_list"]
+                key = (function.__name__, args, tuple(sorted((name, value) for name, value in kwargs.items() if name != "hfc_list")))
+            else:
+                hfc_list = args[-1] if args else None
+                key = (function.__name__, args[:-1], tuple(sorted(kwargs.items())))
 
-    Returns
-    -------
-    list[dict[dict]]
-        The parsed HFC as a list of dictionaries, where each dictionary is a section.
+            if not isinstance(hfc_list, HfcDocument):
+                return function(*args, **kwargs)
+
+            try:
+                hash(key)
+            except TypeError:
+                return function(*args, **kwargs)
+
+            section_name = kwargs.get("section_name", args[0] if args else None)
+            result = hfc_list._memoized(function, key, args, kwargs, reads, section_name)
+
+            # Lists built by getSections() and findVariable() are copied, so callers can't change the
+            # memoized one. Values read from the document are returned as they are
+            return list(result) if reads != "section" and type(result) == list else result
+
+        return wrapper
+
+    return decorator
+
+
+# Remove comments from a single "=" separated declaration piece
+def _remove_comments(declaration: str, lang=langconf) -> str:
+    dec_correct = [declaration]
+    for commentchar in lang.COMMENT_CHARS:
+        dec_correct = dec_correct[0].split(commentchar)
+        copy_dec_correct = dec_correct.copy()
+
+        index = 0
+        for part in dec_correct:
+            # Looks for non-string comments
+            _debug(part)
+            if index > 0:
+                if not part.endswith(lang.STRING_CHAR):
+                    copy_dec_correct[index] = ""
+                else:
+                    copy_dec_correct[index] = commentchar+part
+
+            index += 1
+
+    return "".join(copy_dec_correct.copy()) # The final declaration without comments
+
+
+# Split a line into its declaration parts, without comments
+def _split_declaration(line: str, lang=langconf) -> list[str]:
+    variable = []
+
+    # Let's remove comments from variable declarations
+    for declaration in line.split(lang.VARIABLE_SEPARATOR):
+        variable.append(_strip(_remove_comments(declaration, lang))) # Append to the variable list
+
+    return variable
+
+
+# Iterate over the declarations of hfc lines
+def _iter_hfc(hfc_lines, includes=False, lang=langconf):
+    """
+    Iterate over the sections and variables of HFC lines without converting values.
+
+    Parameters
+    ----------
+    hfc_lines : iterable[str]
+        The lines of the HFC text.
+    includes : bool
+        If True, include directives are yielded instead of being read as variables.
+    lang : langconf or Dialect
+        The syntax settings.
+
+    Yields
+    ------
+    tuple[int, str, str, str]
+        (line_num, section_name, variable_name, raw_value). variable_name is None on section lines
+        and raw_value is None for void variables. Include directives have variable_name None and
+        the included path as raw_value.
 
     Raises
     ------
-    NotHFC
-        If the input HFC is invalid.
     SyntaxError
-        If the input HFC has invalid syntax.
+        If a section name is invalid or a variable is declared outside a section.
     """
-    parsed = []
-    hfc = ""
-
-    # Open the path containing the file
-    if hfc_path != "":
-        hfc = open(hfc_path, "r").readlines()
-        hfc = [_strip(line) for line in hfc] # Let's remove "\n" 
-    elif hfc_text != "":
-        hfc = hfc_text.split("\n")
-
-    if hfc == "":
-        raise NotHFC("Nothing to do.")
-    
-    _debug(f"Parsing hfc...")
-    
-    # Iterate over it
     sections = 0
-    list_index = -1
     section_name = ""
     line_num = 0
 
-    for line in hfc:
-        line_num += 1 # The current line  
+    for line in hfc_lines:
+        line_num += 1 # The current line
 
-        # Ignore any line starting with a comment
-        for commentchar in langconf.COMMENT_CHARS:
-            if line.startswith(commentchar):
-                _debug(f"Ignoring comment", line=line_num)
+        # Include directive
+        if includes:
+            include = _validate(lang.INCLUDE_REGEX, line)
+            if include:
+                _debug(f"Including {include.group(1)}", line=line_num)
+                yield line_num, section_name, None, include.group(1)
                 continue
 
         # Section
-        if _validate(regex=langconf.SECTION_REGEX, text=line):
+        if _validate(regex=lang.SECTION_REGEX, text=line):
             sections += 1
-            list_index += 1
 
             _debug(f"{line} is a section.", line=line_num)
 
             # Separated section name
-            section_name = _strip(_replace(line, chars=[langconf.SECTION_SEPARATOR], replace_to=""))
-            
+            section_name = _strip(_replace(line, chars=[lang.SECTION_SEPARATOR], replace_to=""))
+
             # Check if it's a invalid section name
-            for regex in langconf.INVALID_NAME_REGEXES:
+            for regex in lang.INVALID_NAME_REGEXES:
                 if _validate(regex, section_name):
                     raise SyntaxError(f"Invalid section name at line {line_num}")
-            
-            parsed.append({f"{section_name}": {}})
-
-        # Variable
-        variable_raw = line.split(langconf.VARIABLE_SEPARATOR)
-        variable = []
-
-        
-        # Let's remove comments from variable declarations
-        for declaration in variable_raw:
-            dec_correct = [declaration]
-            for commentchar in langconf.COMMENT_CHARS:
-                dec_correct = dec_correct[0].split(commentchar)
-                copy_dec_correct = dec_correct.copy()
-                
-                index = 0
-                for part in dec_correct:
-                    # Looks for non-string comments
-                    print(part)
-                    if index > 0:
-                        if not part.endswith(langconf.STRING_CHAR):
-                            copy_dec_correct[index] = ""
-                        else:
-                            copy_dec_correct[index] = commentchar+part
 
-                    index += 1
+            yield line_num, section_name, None, None
+            continue
 
-            dec_correct = "".join(copy_dec_correct.copy()) # The final declaration without comments
-            
-            variable.append(_strip(dec_correct)) # Append to the variable list
+        # Variable
+        variable = _split_declaration(line, lang)
 
-        _debug(f"{variable_raw} -> {variable}", line=line_num)
+        _debug(f"{line} -> {variable}", line=line_num)
         if len(variable) >= 1:
             if variable[0] != "":
-                for regex in langconf.INVALID_NAME_REGEXES:
+                for regex in lang.INVALID_NAME_REGEXES:
                     if _validate(regex, variable[0]):
                         raise SyntaxError(f"Invalid variable name at line {line_num}")
 
                 # Raise SyntaxError if a variable is declarated outside a section
                 if sections <= 0:
                     raise SyntaxError(f"Invalid variable declaration outside a section at line {line_num}.")
+
+                # If variable has no defined value, define it as None
+                if len(variable) <= 1:
+                    yield line_num, section_name, variable[0], None
                 else:
-                    value = ""
+                    yield line_num, section_name, variable[0], variable[1]
 
-                    # If variable has no defined value, define it as None
-                    if len(variable) <= 1:
-                        parsed[list_index][section_name][variable[0]] = None
-                    else:
-                        value = _get_converted(value=variable[1], line_num=line_num)
-                        parsed[list_index][section_name][variable[0]] = value
+        _debug(f"Sections: {sections}, Section name: {section_name}")
 
-        _debug(f"Sections: {sections}, List index: {list_index}, Section name: {section_name}")
 
+# Read the lines of a hfc file or string
+def _read_hfc_lines(hfc_path="", hfc_text="") -> list[str]:
+    hfc = ""
 
-    if json_path != "":
-        # Save as JSON
-        import json
+    # Open the path containing the file
+    if hfc_path != "":
+        with open(hfc_path, "r") as hfc_file:
+            hfc = [_strip(line) for line in hfc_file] # Let's remove "\n"
+    elif hfc_text != "":
+        hfc = hfc_text.split("\n")
 
-        json_p = open(json_path, "w+")
-        json.dump(parsed, fp=json_p, indent=json_indent)
-        json_p.close()
+    if hfc == "":
+        raise NotHFC("Nothing to do.")
 
-    return parsed
+    return hfc
 
 
-def parseList(hfc_list: list[dict[dict]], write_path="", newline_after_section=True, spacing=True, list_char=['[', ']'], bool_false="false", bool_true="true", float_separator=".") -> str:
-    """
-    Parse a list of HFC dictionaries to a HFC string.
+# A value that wasn't converted yet
+class _RawValue:
+    __slots__ = ("value", "line_num", "numeric_arrays", "lang")
 
-    Parameters
-    ----------
-    hfc_list : list[dict[dict]]
-        A list of dictionaries, where each dictionary is a section.
-    write_path : str
-        The path to write the HFC string to. If empty, it won't write.
-    newline_after_section : bool
-        If True, it will add a newline after each section.
-    spacing : bool
-        If True, it will add a space after the section separator and before the variable name.
-    list_char : list[str, str]
-        The characters to use for lists. The first element is the start character, the second is the end character.
-    bool_false : str
-        The string to use for False boolean values.
-    float_separator : str
-        The separator to use for floats. If not specified, it will use the default separator for the language (e.g. "." for English).
+    def __init__(self, value: str, line_num: int, numeric_arrays="", lang=langconf):
+        self.value = value
+        self.line_num = line_num
+        self.numeric_arrays = numeric_arrays
+        self.lang = lang
 
-    Returns
-    -------
-    str
-        The HFC string.
+
+class HfcSection(dict):
     """
-    
-    _debug(f"Parsing hfc list...")
+    Variables of a section of a parsed HFC list, that count their changes.
 
-    hfc = ""
-    space = ""
-    newline = ""
+    Assigning, deleting, popping and updating variables bumps the count, so parseList() renders the
+    section again instead of using the text it cached for a HfcDocument.
+    """
+    _changes = 0 # A class default, so unpickling (which sets items first) doesn't need __init__
 
-    # if spacing is enabled, space is " "
-    if spacing:
-        space = " "
-    
-    # New line after section
-    if newline_after_section:
-        newline = "\n"
-    
-    hfc_list = _clear_empty_sections(hfc_list)
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._changes += 1
 
-    for index in hfc_list:
-        _debug(f"Section: {index}")
-        # Iterate on section dict
-        for key, value in index.items():
-            hfc += f"{newline}{langconf.SECTION_SEPARATOR}{space}{key}{space}{langconf.SECTION_SEPARATOR}\n{newline}"
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._changes += 1
 
-            for variable, definition in value.items():
-                _debug(f"Variable: {variable} = {definition}")
-                try:
-                    conv_definition = _convert_to_hfc(definition, list_char, bool_false, bool_true, float_separator)
-                except Exception as e:
-                    raise e
+    def pop(self, key, *default):
+        self._changes += 1
+        return dict.pop(self, key, *default)
 
-                hfc += f"{variable}{space}{langconf.VARIABLE_SEPARATOR}{space}{conv_definition}\n"
+    def popitem(self):
+        self._changes += 1
+        return dict.popitem(self)
 
-    # If write_on is not empty, write the file
-    if write_path != "":
-        open(f"{write_path}", "w+").write(hfc)
+    def setdefault(self, key, default=None):
+        self._changes += 1
+        return dict.setdefault(self, key, default)
 
-    return hfc
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._changes += 1
 
+    def clear(self):
+        dict.clear(self)
+        self._changes += 1
 
-# Add comments to a hfc file or string
-def addComments(comments: list[list[int, str]], comment_char="->", input_path="", hfc="", output_path=""):
-    """
-    Add comments to a HFC file or string.
+    def __ior__(self, other):
+        self.update(other)
+        return self
 
-    Parameters
-    ----------
-    comments : list[list[int, str]]
-        A list of comments, where each comment is a list of two elements: the line number and the comment string.
-    comment_char : str
-        The character to use for comments.
-    input_path : str
-        The path to the HFC file to read from. If empty, it won't read from file.
-    hfc : str
-        The HFC string to write to. If empty, it won't write to a string.
-    output_path : str
-        The path to write the output to. If empty, it won't write to a file.
 
-    Returns
-    -------
-    str
-        The HFC string with comments.
+# Types of values that can't change in place, so the text of their sections can be cached
+_IMMUTABLE_TYPES = frozenset([str, int, float, bool, type(None), _RawValue])
+
+
+class LazySection(HfcSection):
     """
-    hfc_str = ""
-    
-    if input_path != "":
-        hfc_str = open(input_path, "r").readlines()
-        # Remove \n on each index
-        for index in range(len(hfc_str)):
-            hfc_str[index] = hfc_str[index].strip("\n")
-    
-    if hfc != "":
-        hfc_str = hfc.split("\n")
+    Variables of a section parsed with parseHfc(lazy=True).
 
-    # If both input_path and hfc are empty, raise error
-    if input_path == "" and hfc == "":
-        raise ValueError("No input file or HFC string provided")
+    Values are stored as raw text and converted the first time they are read. The converted value
+    replaces the raw one, so it is converted only once. Invalid values raise SyntaxError when read.
+    """
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
 
-    # Add comments to the HFC string
-    line = 0
+        if type(value) == _RawValue:
+            value = _convert_value(value.value, value.line_num, value.numeric_arrays, value.lang)
+            dict.__setitem__(self, key, value)
 
-    for ln in hfc_str:
-        # Look for current line on comments list
-        for comment in comments:
-            if comment[0] == line+1:
-                hfc_str[line] = f"{ln}{comment_char} {comment[1]}"
-                break
+        return value
 
-        line += 1
-    
-    # Parse to check validity
-    try:
-        parseHfc("\n".join(hfc_str))
-    except Exception as e:
-        warnings.warn(f"Generated invalid .hfc string: {e}")
+    # Overridden so dict(), update() and ** read values through __getitem__
+    def __iter__(self):
+        return dict.__iter__(self)
 
-    hfc_str = "\n".join(hfc_str)
-    if output_path != "":
-        open(output_path, "w+").write(hfc_str)
+    def get(self, key, default=None):
+        return self[key] if key in self else default
 
-    return hfc_str
+    def items(self):
+        return [(key, self[key]) for key in self]
 
+    def values(self):
+        return [self[key] for key in self]
 
-def getComments(hfc_path="", hfc_text="") -> list[list[int, str]]:
-    """
-    Get comments from a HFC file or string.
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
 
-    Parameters
-    ----------
-    hfc_path : str
-        The path to the HFC file to read from. If empty, it won't read from file.
-    hfc_text : str
-        The HFC string to read from. If empty, it won't read from file.
+        value = self[key]
+        dict.__delitem__(self, key)
+        self._changes += 1
 
-    Returns
-    -------
-    list[list[int, str]]
-        A list of comments, where each comment is a list of two elements: the line number and the comment string.
-    """
-    comments = []
+        return value
 
-    if hfc_path != "":
-        hfc_str = open(hfc_path, "r").readlines()
-        # Remove \n on each index
-        for index in range(len(hfc_str)):
-            hfc_str[index] = hfc_str[index].strip("\n")
-    elif hfc_text != "":
-        hfc_str = hfc_text.split("\n")
-    else:
-        raise ValueError("No input file or HFC string provided")
+    def copy(self):
+        return LazySection(dict.items(self))
 
-    # Look for comments
-    for comment_char in langconf.COMMENT_CHARS:
-        line = 0
-        for ln in hfc_str:
-            split_ln = ln.split(comment_char)
-            split_ln[-1] = _strip(split_ln[-1])
+    def __eq__(self, other):
+        return dict(self.items()) == other
 
-            if len(split_ln) > 1:
-                comments.append([line+1, split_ln[1]])
-            elif len(split_ln) == 1:
-                if ln.startswith(comment_char):
-                    comments.append([line+1, ln[len(comment_char):]])
+    def __ne__(self, other):
+        return not self == other
 
-            line += 1
+    def __repr__(self):
+        return repr(dict(self.items()))
 
-    return comments
+    def resolve(self, fail_fast=True) -> list[list[int, str]]:
+        """
+        Convert every value that wasn't read yet.
 
+        Parameters
+        ----------
+        fail_fast : bool
+            If True, raise at the first invalid value.
 
-# Add a section to a hfc list
-def addSection(section_name: str, hfc_list: list[dict[dict]]):
-    """
-    Add a section to a HFC list.
+        Returns
+        -------
+        list[list[int, str]]
+            The errors, where each error is a list with the line number and the message.
+        """
+        errors = []
 
-    Parameters
-    ----------
-    section_name : str
-        The name of the new section.
-    hfc_list : list[dict[dict]]
-        The HFC list to be modified.
+        for key in self:
+            try:
+                self[key]
+            except (SyntaxError, ValueError) as e:
+                if fail_fast:
+                    raise
+                errors.append([dict.__getitem__(self, key).line_num, str(e)])
 
-    Returns
-    -------
-    list[dict[dict]]
-        The modified HFC list.
-    """
-    
-    list_add = hfc_list
-    list_add.append({section_name: {}})
-    
-    return list_add
+        return errors
 
 
-# Remove a section from a hfc text or list
-def removeSection(section_name: str, hfc_list: list[dict[dict]]):
+def resolveHfc(hfc_list: list[dict[dict]], fail_fast=True) -> list[list[int, str]]:
     """
-    Remove a section from a HFC list.
+    Convert every value of a HFC list parsed with parseHfc(lazy=True).
 
     Parameters
     ----------
-    section_name : str
-        The name of the section to be removed.
     hfc_list : list[dict[dict]]
-        The HFC list to be modified.
+        The HFC list.
+    fail_fast : bool
+        If True, raise at the first invalid value instead of collecting the errors.
 
     Returns
     -------
-    list[dict[dict]]
-        The modified HFC list.
+    list[list[int, str]]
+        The errors, where each error is a list with the line number and the message. Empty if every
+        value is valid.
 
     Raises
     ------
-    ValueError
-        If the section is not found in the HFC list.
+    SyntaxError
+        If fail_fast is True and a value is invalid.
     """
-    
-    list_remove = hfc_list
+    errors = []
 
-    if not _section_exists(list_remove, section_name):
-        raise ValueError(f"Section {section_name} not found in HFC list")
-    
-    list_remove.remove({section_name: {}})
+    for section in hfc_list:
+        for variables in section.values():
+            if isinstance(variables, LazySection):
+                errors += variables.resolve(fail_fast)
 
-    return list_remove
+    return errors
 
 
-# Edit a section in a hfc list
-def editSection(section_name: str, new_section_name: str, hfc_list: list[dict[dict]]):
-    """
-    Edit a section name in a HFC list.
+# Cache of included files: (absolute path, syntax, lazy, numeric_arrays) -> [file stamp, parsed list, included keys]
+_include_cache = {}
+# Reverse include graph: (absolute path, syntax, lazy, numeric_arrays) -> keys of the files that include it
+_include_dependents = {}
 
-    Parameters
-    ----------
-    section_name : str
-        The name of the section to be edited.
-    new_section_name : str
-        The new name for the section.
-    hfc_list : list[dict[dict]]
-        The HFC list to be modified.
 
-    Returns
-    -------
-    list[dict[dict]]
-        The modified HFC list.
+def _file_stamp(path: str) -> tuple:
+    import os
 
-    Raises
-    ------
-    ValueError
-        If the section is not found in the HFC list.
-    """
-    
-    list_edit = hfc_list
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
 
-    # Look for section
-    index = 0
-    if not _section_exists(list_edit, section_name):
-        raise ValueError(f"Section {section_name} not found in HFC list")
 
-    for section in hfc_list:
-        if section_name in section.keys():
-            # Edit section name
-            list_edit[index][new_section_name] = list_edit[index].pop(section_name)
-            break
+# Get the stamp of a file, or None if it doesn't exist
+def _file_stamp_or_none(path: str):
+    try:
+        return _file_stamp(path)
+    except FileNotFoundError:
+        return None
 
-        index += 1
 
-    
-    return list_edit
+# Drop a cached file and everything that includes it
+def _invalidate_include(key: tuple):
+    _include_cache.pop(key, None)
 
+    for dependent in _include_dependents.pop(key, set()):
+        _invalidate_include(dependent)
 
-# Get all sections from a hfc list
-def getSections(hfc_list: list[dict[dict]]) -> list[str]:
-    """
-    Get all sections from a HFC list.
 
-    Parameters
-    ----------
-    hfc_list : list[dict[dict]]
-        The HFC list to be modified.
+# Check if a cached file and its includes didn't change since they were parsed
+def _include_valid(key: tuple) -> bool:
+    cached = _include_cache.get(key)
 
-    Returns
-    -------
-    list[str]
-        A list of all sections in the HFC list.
-    """
-    
-    sections = []
-    for i in hfc_list:
-        sections.append(list(i.keys())[0])
+    try:
+        valid = cached is not None and cached[0] == _file_stamp(key[0])
+    except FileNotFoundError:
+        valid = False
 
-    return sections
+    if valid:
+        valid = all(_include_valid(include) for include in cached[2])
 
+    if not valid:
+        _invalidate_include(key)
 
-# Get all variables from a section
-def getVariables(section_name: str, hfc_list: list[dict[dict]]) -> dict:
-    """
-    Get all variables from a specified section in a HFC list.
+    return valid
 
-    Parameters
-    ----------
-    section_name : str
-        The name of the section to get variables from.
-    hfc_list : list[dict[dict]]
-        The HFC list to be modified.
 
-    Returns
-    -------
-    dict
-        A dictionary with all variables from the specified section.
+# Parse an included file once per process, until it or one of its includes changes
+def _parse_include(path: str, include_stack: list, lazy=False, numeric_arrays="", lang=langconf) -> list[dict[dict]]:
+    import os
 
-    Raises
-    ------
-    ValueError
-        If the section is not found in the HFC list.
+    path = os.path.abspath(path)
+    key = (path, lang, lazy, numeric_arrays)
+
+    if path in include_stack:
+        cycle = include_stack[include_stack.index(path):] + [path]
+        raise IncludeCycle(f"Include cycle: {' -> '.join(cycle)}")
+
+    if not _include_valid(key):
+        stamp = _file_stamp(path)
+        parsed, includes = _parse_lines(_read_hfc_lines(hfc_path=path), include_dir=os.path.dirname(path), include_stack=include_stack + [path], lazy=lazy, numeric_arrays=numeric_arrays, lang=lang)
+        includes = [(include, lang, lazy, numeric_arrays) for include in includes]
+
+        for include in includes:
+            _include_dependents.setdefault(include, set()).add(key)
+
+        _include_cache[key] = [stamp, parsed, includes]
+
+    return _include_cache[key][1]
+
+
+def clearIncludeCache():
     """
-    
-    list_get = hfc_list
+    Forget every included file parsed so far.
+    """
+    _include_cache.clear()
+    _include_dependents.clear()
 
-    # Look for section
-    if not _section_exists(list_get, section_name):
-        raise ValueError(f"Section {section_name} not found in HFC list")
 
-    for section in list_get:
-        if section_name in section.keys():
-            # Get variables
-            return section[section_name]
-    
-    return []
+# Parse hfc lines, resolving includes if include_dir is given
+def _parse_lines(hfc_lines, validator=None, include_dir=None, include_stack=None, lazy=False, numeric_arrays="", lang=langconf):
+    import copy
+    import os
 
-# Get the value of a specific variable (full hfc list)
-def getVariableValue(section_name: str, variable_name: str, hfc_list: list[dict[dict]]):
+    parsed = []
+    includes = []
+    variables = None
+
+    for line_num, section_name, variable_name, value in _iter_hfc(hfc_lines, includes=include_dir is not None, lang=lang):
+        if variable_name is None:
+            if value is not None:
+                # Include directive, the included sections are composed in this position
+                include_path = os.path.abspath(os.path.join(include_dir, value))
+                includes.append(include_path)
+
+                for section in _parse_include(include_path, include_stack or [], lazy, numeric_arrays, lang):
+                    for included_name, included_variables in section.items():
+                        # Copied deeply, so changing a list value doesn't change the cached file. Raw
+                        # values are never changed, so lazy sections share them
+                        if lazy:
+                            copied = LazySection({name: value if type(value) == _RawValue else copy.deepcopy(value) for name, value in dict.items(included_variables)})
+                        else:
+                            copied = HfcSection(copy.deepcopy(dict(included_variables)))
+                        parsed.append({included_name: copied})
+
+                        if validator is not None:
+                            validator.section(included_name, line_num)
+                            for included_variable, included_value in included_variables.items():
+                                validator.variable(included_name, included_variable, included_value, line_num)
+                continue
+
+            variables = LazySection() if lazy else HfcSection()
+            parsed.append({f"{section_name}": variables})
+
+            if validator is not None:
+                validator.section(section_name, line_num)
+            continue
+
+        if value is not None:
+            if lazy:
+                value = _RawValue(value, line_num, numeric_arrays, lang)
+            else:
+                value = _convert_value(value, line_num, numeric_arrays, lang)
+
+        if validator is not None:
+            validator.variable(section_name, variable_name, value, line_num)
+
+        variables[variable_name] = value
+
+    return parsed, includes
+
+
+# Lines of a bytes-like buffer, surrounding spaces excluded
+_BYTE_LINE_REGEX = re.compile(rb"[ \t\r\f\v]*([^\n]*?)[ \t\r\f\v]*(?:\n|\Z)")
+
+
+# Iterate over the lines of a bytes-like object or binary file, decoding only what the parser reads
+def _iter_byte_lines(hfc_bytes, encoding="utf-8", lang=langconf):
+    import codecs
+
+    if hasattr(hfc_bytes, "read"):
+        hfc_bytes = hfc_bytes.read()
+
+    # bytes and bytearray are searched directly, anything else through a flat view
+    data = hfc_bytes if isinstance(hfc_bytes, (bytes, bytearray)) else memoryview(hfc_bytes).cast("B")
+    start = 0
+
+    if len(data) == 0:
+        raise NotHFC("Nothing to do.")
+
+    if codecs.lookup(encoding).name in ["utf-8", "utf-8-sig"]:
+        encoding = "utf-8"
+        if data[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+            start = len(codecs.BOM_UTF8)
+
+    comment_chars = [char.encode(encoding) for char in lang.COMMENT_CHARS]
+    section_separator = lang.SECTION_SEPARATOR.encode(encoding)
+    variable_separator = re.compile(re.escape(lang.VARIABLE_SEPARATOR.encode(encoding)))
+
+    for line in _BYTE_LINE_REGEX.finditer(data, start):
+        line_start, line_end = line.span(1)
+
+        # Blank and comment lines are never decoded
+        if line_start == line_end or any(data[line_start:line_start + len(char)] == char for char in comment_chars):
+            yield ""
+            continue
+
+        if data[line_start:line_start + len(section_separator)] == section_separator:
+            yield str(data[line_start:line_end], encoding)
+            continue
+
+        # Only the name and the value are read by the parser
+        name_end = variable_separator.search(data, line_start, line_end)
+        if name_end is None:
+            yield str(data[line_start:line_end], encoding)
+            continue
+
+        value_end = variable_separator.search(data, name_end.end(), line_end)
+        value_end = value_end.start() if value_end is not None else line_end
+
+        name = str(data[line_start:name_end.start()], encoding)
+        value = str(data[name_end.end():value_end], encoding)
+        yield f"{name}{lang.VARIABLE_SEPARATOR}{value}"
+
+
+def parseHfc(hfc_path="", hfc_text="", json_path = "", json_indent=4, schema=None, fail_fast=False, resolve_includes=True, hfc_bytes=None, encoding="utf-8", lazy=False, numeric_arrays="", dialect=None, fsync=None) -> list[dict[dict]]:
     """
-    Get the value of a specific variable in a HFC list.
+    Parse a HFC text/file to a list of dictionaries.
 
     Parameters
     ----------
-    section_name : str
-        The name of the section where the variable is located.
-    variable_name : str
-        The name of the variable to get the value of.
-    hfc_list : list[dict[dict]]
-        The HFC list to be modified.
+    hfc_path : str
+        The path to the HFC file.
+    hfc_text : str
+        The HFC text to parse.
+    json_path : str
+        The path to save the parsed HFC as a JSON file. If empty, it won't save.
+    json_indent : int
+        The indentation of the JSON file. If json_path is empty, it will be ignored.
+    schema : Schema
+        A schema to validate each value against while it is converted. If None, nothing is validated.
+    fail_fast : bool
+        If True, raise at the first schema violation instead of collecting all of them.
+    resolve_includes : bool
+        If True, include directives are replaced by the sections of the included file. Included
+        files are parsed once per process and reparsed only when they change.
+    hfc_bytes : bytes, bytearray, memoryview or binary file
+        The HFC data to parse, used instead of hfc_path and hfc_text. Blank and comment lines are
+        skipped without being decoded.
+    encoding : str
+        The encoding of hfc_bytes. It must be ASCII compatible. A UTF-8 BOM is skipped.
+    lazy : bool
+        If True, values are converted the first time they are read instead of while parsing (see
+        LazySection). Invalid values raise SyntaxError when read, or use resolveHfc() to check all
+        of them. Can't be used with a schema.
+    numeric_arrays : str
+        "array" reads lists of only integers or only floats (integers allowed) as array.array, "numpy"
+        as a NumPy array (or array.array if NumPy isn't installed). If empty, they are python lists.
+    dialect : Dialect
+        The syntax to parse with (see compileDialect). If None, the langconf class is used.
+    fsync : str
+        The fsync policy of the JSON file (see FSYNC_POLICIES). It is always replaced atomically.
 
     Returns
     -------
-    any
-        The value of the specified variable.
+    HfcDocument
+        The parsed HFC as a list of dictionaries, where each dictionary is a section.
 
     Raises
     ------
+    NotHFC
+        If the input HFC is invalid.
+    SyntaxError
+        If the input HFC has invalid syntax.
+    SchemaError
+        If a schema is given and the parsed values violate it.
+    IncludeCycle
+        If a file includes itself, directly or not.
     ValueError
-        If the section is not found in the HFC list or if the variable is not found in the section.
+        If lazy is used with a schema.
     """
-    
-    list_get = hfc_list
+    import os
 
-    # Look for section
-    if not _section_exists(list_get, section_name):
-        raise ValueError(f"Section {section_name} not found in HFC list")
+    if lazy and schema is not None:
+        raise ValueError("A schema can't be validated with lazy conversion")
 
-    for section in list_get:
-        if section_name in section.keys():
-            # Get variable value
-            if _variable_exists(list_get, section_name, variable_name):
-                return section[section_name][variable_name]
-            else:
-                raise ValueError(f"Variable {variable_name} not found in section {section_name}")
+    lang = dialect if dialect is not None else langconf
 
+    if hfc_bytes is not None:
+        hfc = _iter_byte_lines(hfc_bytes, encoding, lang)
+    else:
+        hfc = _read_hfc_lines(hfc_path, hfc_text)
 
-# Get variable value from a dictionary
-def getVariableValueFromDict(variable_name: str, dictionary: dict):
-    try:
-        return dictionary[variable_name]
-    except KeyError:
-        raise ValueError(f"Variable {variable_name} not found in dictionary.")
+    validator = schema.compile().start(fail_fast) if schema is not None else None
+    include_dir = None
+    include_stack = []
 
+    if resolve_includes:
+        # Paths are relative to the file, or to the working directory for strings
+        include_dir = os.path.dirname(os.path.abspath(hfc_path)) if hfc_path != "" else os.getcwd()
+        include_stack = [os.path.abspath(hfc_path)] if hfc_path != "" else []
 
-# Add a variable to a hfc list
-def addVariable(section_name: str, variable_name: str, variable_value, hfc_list: list[dict[dict]]):
-    """
-    Add a variable to a specified section in a HFC list.
+    _debug(f"Parsing hfc...")
 
-    Parameters
-    ----------
-    section_name : str
-        The name of the section where the variable will be added.
-    variable_name : str
-        The name of the variable to be added.
-    variable_value : any
-        The value of the variable to be added.
-    hfc_list : list[dict[dict]]
-        The HFC list to be modified.
+    parsed = HfcDocument(_parse_lines(hfc, validator, include_dir, include_stack, lazy, numeric_arrays, lang)[0])
 
-    Returns
-    -------
-    list[dict[dict]]
+    if validator is not None:
+        validator.finish()
+
+    if json_path != "":
+        # Save as JSON
+        import json
+
+        json_text = json.dumps(parsed, indent=json_indent, default=_json_default)
+        _write_atomic(json_path, json_text, fsync)
+
+    return parsed
+
+
+# Get what the cached text of a section depends on, or None if its changes can't be tracked
+def _render_version(hfc_list, index: dict):
+    version = []
+    for key, variables in index.items():
+        # Plain dicts and mutable values (like lists) can change without bumping a count
+        if not isinstance(variables, HfcSection) or not _IMMUTABLE_TYPES.issuperset(map(type, dict.values(variables))):
+            return None
+        version.append((key, hfc_list._sectionVersion(key), id(variables), variables._changes))
+
+    return tuple(version)
+
+
+def parseList(hfc_list: list[dict[dict]], write_path="", newline_after_section=True, spacing=True, list_char=['[', ']'], bool_false="false", bool_true="true", float_separator=".", fsync=None, dialect=None) -> str:
+    """
+    Parse a list of HFC dictionaries to a HFC string.
+
+    Parameters
+    ----------
+    hfc_list : list[dict[dict]]
+        A list of dictionaries, where each dictionary is a section.
+    write_path : str
+        The path to write the HFC string to. If empty, it won't write.
+    newline_after_section : bool
+        If True, it will add a newline after each section.
+    spacing : bool
+        If True, it will add a space after the section separator and before the variable name.
+    list_char : list[str, str]
+        The characters to use for lists. The first element is the start character, the second is the end character.
+    bool_false : str
+        The string to use for False boolean values.
+    float_separator : str
+        The separator to use for floats. If not specified, it will use the default separator for the language (e.g. "." for English).
+    fsync : str
+        The fsync policy of write_path (see FSYNC_POLICIES). The file is always replaced atomically.
+    dialect : Dialect
+        The syntax to write with (see compileDialect). If None, the langconf class is used.
+
+    Returns
+    -------
+    str
+        The HFC string.
+    """
+    
+    _debug(f"Parsing hfc list...")
+    lang = dialect if dialect is not None else langconf
+
+    space = ""
+    newline = ""
+
+    # if spacing is enabled, space is " "
+    if spacing:
+        space = " "
+    
+    # New line after section
+    if newline_after_section:
+        newline = "\n"
+    
+    hfc_list = _clear_empty_sections(hfc_list)
+
+    # Documents keep the text of each section until the section or the options change
+    options = (newline_after_section, spacing, tuple(list_char), bool_false, bool_true, float_separator, lang)
+    render_cache = None
+    if isinstance(hfc_list, HfcDocument):
+        render_cache = hfc_list._render_cache
+        hfc_list._render_cache = {}
+
+    fragments = []
+    for index in hfc_list:
+        version = _render_version(hfc_list, index) if render_cache is not None else None
+        if version is not None:
+            cached = render_cache.get(id(index))
+
+            if cached is not None and cached[0] is index and cached[2] == version and cached[3] == options:
+                fragments.append(cached[4])
+                hfc_list._render_cache[id(index)] = cached
+                continue
+
+        _debug(f"Section: {index}")
+        section_hfc = ""
+        # Iterate on section dict
+        for key, value in index.items():
+            section_hfc += f"{newline}{lang.SECTION_SEPARATOR}{space}{key}{space}{lang.SECTION_SEPARATOR}\n{newline}"
+
+            for variable, definition in value.items():
+                _debug(f"Variable: {variable} = {definition}")
+                if definition is None:
+                    section_hfc += f"{variable}\n" # Void variable
+                    continue
+
+                try:
+                    conv_definition = _convert_to_hfc(definition, list_char, bool_false, bool_true, float_separator, lang)
+                except Exception as e:
+                    raise e
+
+                section_hfc += f"{variable}{space}{lang.VARIABLE_SEPARATOR}{space}{conv_definition}\n"
+
+        if version is not None:
+            # The variables are kept too, so their ids aren't reused while they are cached
+            hfc_list._render_cache[id(index)] = (index, tuple(index.values()), version, options, section_hfc)
+        fragments.append(section_hfc)
+
+    hfc = "".join(fragments)
+
+    # If write_on is not empty, write the file
+    if write_path != "":
+        _write_atomic(write_path, hfc, fsync)
+
+    return hfc
+
+
+# Add comments to a hfc file or string
+def addComments(comments: list[list[int, str]], comment_char="->", input_path="", hfc="", output_path="", fsync=None):
+    """
+    Add comments to a HFC file or string.
+
+    Parameters
+    ----------
+    comments : list[list[int, str]]
+        A list of comments, where each comment is a list of two elements: the line number and the comment string.
+    comment_char : str
+        The character to use for comments.
+    input_path : str
+        The path to the HFC file to read from. If empty, it won't read from file.
+    hfc : str
+        The HFC string to write to. If empty, it won't write to a string.
+    output_path : str
+        The path to write the output to. If empty, it won't write to a file.
+    fsync : str
+        The fsync policy of output_path (see FSYNC_POLICIES). The file is always replaced atomically.
+
+    Returns
+    -------
+    str
+        The HFC string with comments.
+    """
+    hfc_str = ""
+    
+    if input_path != "":
+        hfc_str = open(input_path, "r").readlines()
+        # Remove \n on each index
+        for index in range(len(hfc_str)):
+            hfc_str[index] = hfc_str[index].strip("\n")
+    
+    if hfc != "":
+        hfc_str = hfc.split("\n")
+
+    # If both input_path and hfc are empty, raise error
+    if input_path == "" and hfc == "":
+        raise ValueError("No input file or HFC string provided")
+
+    # Add comments to the HFC string
+    line = 0
+
+    for ln in hfc_str:
+        # Look for current line on comments list
+        for comment in comments:
+            if comment[0] == line+1:
+                hfc_str[line] = f"{ln}{comment_char} {comment[1]}"
+                break
+
+        line += 1
+    
+    # Parse to check validity
+    try:
+        parseHfc("\n".join(hfc_str))
+    except Exception as e:
+        warnings.warn(f"Generated invalid .hfc string: {e}")
+
+    hfc_str = "\n".join(hfc_str)
+    if output_path != "":
+        _write_atomic(output_path, hfc_str, fsync)
+
+    return hfc_str
+
+
+def getComments(hfc_path="", hfc_text="") -> list[list[int, str]]:
+    """
+    Get comments from a HFC file or string.
+
+    Parameters
+    ----------
+    hfc_path : str
+        The path to the HFC file to read from. If empty, it won't read from file.
+    hfc_text : str
+        The HFC string to read from. If empty, it won't read from file.
+
+    Returns
+    -------
+    list[list[int, str]]
+        A list of comments, where each comment is a list of two elements: the line number and the comment string.
+    """
+    comments = []
+
+    if hfc_path != "":
+        hfc_str = open(hfc_path, "r").readlines()
+        # Remove \n on each index
+        for index in range(len(hfc_str)):
+            hfc_str[index] = hfc_str[index].strip("\n")
+    elif hfc_text != "":
+        hfc_str = hfc_text.split("\n")
+    else:
+        raise ValueError("No input file or HFC string provided")
+
+    # Look for comments
+    for comment_char in langconf.COMMENT_CHARS:
+        line = 0
+        for ln in hfc_str:
+            split_ln = ln.split(comment_char)
+            split_ln[-1] = _strip(split_ln[-1])
+
+            if len(split_ln) > 1:
+                comments.append([line+1, split_ln[1]])
+            elif len(split_ln) == 1:
+                if ln.startswith(comment_char):
+                    comments.append([line+1, ln[len(comment_char):]])
+
+            line += 1
+
+    return comments
+
+
+# Add a section to a hfc list
+def addSection(section_name: str, hfc_list: list[dict[dict]]):
+    """
+    Add a section to a HFC list.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the new section.
+    hfc_list : list[dict[dict]]
+        The HFC list to be modified.
+
+    Returns
+    -------
+    list[dict[dict]]
         The modified HFC list.
     """
     
     list_add = hfc_list
-   
-    # Look for section
-    if not _section_exists(list_add, section_name):
+    list_add.append({section_name: HfcSection()})
+    
+    _touch(hfc_list, section_name)
+    return list_add
+
+
+# Remove a section from a hfc text or list
+def removeSection(section_name: str, hfc_list: list[dict[dict]]):
+    """
+    Remove a section from a HFC list.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the section to be removed.
+    hfc_list : list[dict[dict]]
+        The HFC list to be modified.
+
+    Returns
+    -------
+    list[dict[dict]]
+        The modified HFC list.
+
+    Raises
+    ------
+    ValueError
+        If the section is not found in the HFC list.
+    """
+    
+    list_remove = hfc_list
+
+    if not _section_exists(list_remove, section_name):
         raise ValueError(f"Section {section_name} not found in HFC list")
     
-    # Look for section index on list
-    index = 0
-    for section in list_add:
-        if section_name in section.keys():
-            # Add variable
-            list_add[index][section_name][variable_name] = variable_value
-            break
+    list_remove.remove({section_name: {}})
+
+    _touch(hfc_list, section_name)
+    return list_remove
+
+
+# Edit a section in a hfc list
+def editSection(section_name: str, new_section_name: str, hfc_list: list[dict[dict]]):
+    """
+    Edit a section name in a HFC list.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the section to be edited.
+    new_section_name : str
+        The new name for the section.
+    hfc_list : list[dict[dict]]
+        The HFC list to be modified.
+
+    Returns
+    -------
+    list[dict[dict]]
+        The modified HFC list.
+
+    Raises
+    ------
+    ValueError
+        If the section is not found in the HFC list.
+    """
+    
+    list_edit = hfc_list
+
+    # Look for section
+    index = 0
+    if not _section_exists(list_edit, section_name):
+        raise ValueError(f"Section {section_name} not found in HFC list")
+
+    for section in hfc_list:
+        if section_name in section.keys():
+            # Edit section name
+            list_edit[index][new_section_name] = list_edit[index].pop(section_name)
+            break
+
+        index += 1
+
+    
+    _touch(hfc_list, section_name, new_section_name)
+    return list_edit
+
+
+# Get all sections from a hfc list
+@_memoized("names")
+def getSections(hfc_list: list[dict[dict]]) -> list[str]:
+    """
+    Get all sections from a HFC list.
+
+    Parameters
+    ----------
+    hfc_list : list[dict[dict]]
+        The HFC list to be modified.
+
+    Returns
+    -------
+    list[str]
+        A list of all sections in the HFC list.
+    """
+    
+    sections = []
+    for i in hfc_list:
+        sections.append(list(i.keys())[0])
+
+    return sections
+
+
+# Get all variables from a section
+@_memoized("section")
+def getVariables(section_name: str, hfc_list: list[dict[dict]]) -> dict:
+    """
+    Get all variables from a specified section in a HFC list.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the section to get variables from.
+    hfc_list : list[dict[dict]]
+        The HFC list to be modified.
+
+    Returns
+    -------
+    dict
+        A dictionary with all variables from the specified section.
+
+    Raises
+    ------
+    ValueError
+        If the section is not found in the HFC list.
+    """
+    
+    list_get = hfc_list
+
+    # Look for section
+    if not _section_exists(list_get, section_name):
+        raise ValueError(f"Section {section_name} not found in HFC list")
+
+    for section in list_get:
+        if section_name in section.keys():
+            # Get variables
+            return section[section_name]
+    
+    return []
+
+# Get the value of a specific variable (full hfc list)
+@_memoized("section")
+def getVariableValue(section_name: str, variable_name: str, hfc_list: list[dict[dict]]):
+    """
+    Get the value of a specific variable in a HFC list.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the section where the variable is located.
+    variable_name : str
+        The name of the variable to get the value of.
+    hfc_list : list[dict[dict]]
+        The HFC list to be modified.
+
+    Returns
+    -------
+    any
+        The value of the specified variable.
+
+    Raises
+    ------
+    ValueError
+        If the section is not found in the HFC list or if the variable is not found in the section.
+    """
+    
+    list_get = hfc_list
+
+    # Look for section
+    if not _section_exists(list_get, section_name):
+        raise ValueError(f"Section {section_name} not found in HFC list")
+
+    for section in list_get:
+        if section_name in section.keys():
+            # Get variable value
+            if _variable_exists(list_get, section_name, variable_name):
+                return section[section_name][variable_name]
+            else:
+                raise ValueError(f"Variable {variable_name} not found in section {section_name}")
+
+
+# Get variable value from a dictionary
+def getVariableValueFromDict(variable_name: str, dictionary: dict):
+    try:
+        return dictionary[variable_name]
+    except KeyError:
+        raise ValueError(f"Variable {variable_name} not found in dictionary.")
+
+
+# Add a variable to a hfc list
+def addVariable(section_name: str, variable_name: str, variable_value, hfc_list: list[dict[dict]]):
+    """
+    Add a variable to a specified section in a HFC list.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the section where the variable will be added.
+    variable_name : str
+        The name of the variable to be added.
+    variable_value : any
+        The value of the variable to be added.
+    hfc_list : list[dict[dict]]
+        The HFC list to be modified.
+
+    Returns
+    -------
+    list[dict[dict]]
+        The modified HFC list.
+    """
+    
+    list_add = hfc_list
+   
+    # Look for section
+    if not _section_exists(list_add, section_name):
+        raise ValueError(f"Section {section_name} not found in HFC list")
+    
+    # Look for section index on list
+    index = 0
+    for section in list_add:
+        if section_name in section.keys():
+            # Add variable
+            list_add[index][section_name][variable_name] = variable_value
+            break
+
+        index += 1
+    
+    _touch(hfc_list, section_name)
+    return list_add
+
+
+# Remove a variable from a hfc list
+def removeVariable(section_name: str, variable_name: str, hfc_list: list[dict[dict]]):
+    """
+    Remove a variable from a specified section in a HFC list.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the section where the variable will be removed.
+    variable_name : str
+        The name of the variable to be removed.
+    hfc_list : list[dict[dict]]
+        The HFC list to be modified.
+
+    Returns
+    -------
+    list[dict[dict]]
+        The modified HFC list.
+
+    Raises
+    ------
+    ValueError
+        If the section is not found in the HFC list or if the variable is not found in the section.
+    """
+    
+    list_remove = hfc_list
+
+    if not _section_exists(list_remove, section_name):
+        raise ValueError(f"Section {section_name} not found in HFC list")
+    
+    # Look for section index on list
+    index = 0
+    for section in list_remove:
+        if section_name in section.keys():
+            # Remove variable
+            if _variable_exists(list_remove, section_name, variable_name):
+                list_remove[index][section_name].pop(variable_name)
+            else:
+                raise ValueError(f"Variable {variable_name} not found in section {section_name}")
+            break
+
+        index += 1
+
+    # Look for section
+    index = 0
+
+    _touch(hfc_list, section_name)
+    return list_remove
+
+
+# Rename a variable in a hfc list
+def renameVariable(section_name: str, old_variable_name: str, new_variable_name: str, hfc_list: list[dict[dict]]):
+    """
+    Rename a variable in a specified section in a HFC list.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the section where the variable will be renamed.
+    old_variable_name : str
+        The name of the variable to be renamed.
+    new_variable_name : str
+        The new name for the variable.
+    hfc_list : list[dict[dict]]
+        The HFC list to be modified.
+
+    Returns
+    -------
+    list[dict[dict]]
+        The modified HFC list.
+
+    Raises
+    ------
+    ValueError
+        If the section is not found in the HFC list or if the variable is not found in the section.
+    """
+    
+    list_rename = hfc_list
+
+    # Look for section
+    if not _section_exists(list_rename, section_name):
+        raise ValueError(f"Section {section_name} not found in HFC list")
+
+    index = 0
+    for section in hfc_list:
+        if section_name in section.keys():
+            # Rename variable in section
+            if not _variable_exists(list_rename, section_name, old_variable_name):
+                raise ValueError(f"Variable {old_variable_name} not found in section {section_name}")
+            
+            list_rename[index][section_name][new_variable_name] = list_rename[index][section_name].pop(old_variable_name)
+            break
+
+        index += 1
+
+    _touch(hfc_list, section_name)
+    return list_rename
+
+
+# Edit a variable in a hfc list
+def editVariable(section_name: str, variable_name: str, new_variable_value, hfc_list: list[dict[dict]]):
+    """
+    Edit a variable's value in a specified section of a HFC list.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the section where the variable will be edited.
+    variable_name : str
+        The name of the variable to be edited.
+    new_variable_value : any
+        The new value for the variable.
+    hfc_list : list[dict[dict]]
+        The HFC list to be modified.
+
+    Returns
+    -------
+    list[dict[dict]]
+        The modified HFC list.
+
+    Raises
+    ------
+    ValueError
+        If the section is not found in the HFC list or if the variable is not found in the section.
+    """
+    list_edit = hfc_list
+
+    # Look for section
+    if not _section_exists(list_edit, section_name):
+        raise ValueError(f"Section {section_name} not found in HFC list")
+    
+    index = 0
+    for section in hfc_list:
+        if section_name in section.keys():
+            # Edit variable in section
+            if not _variable_exists(list_edit, section_name, variable_name):
+                raise ValueError(f"Variable {variable_name} not found in section {section_name}")
+
+            list_edit[index][section_name][variable_name] = new_variable_value
+            break
+
+        index += 1
+
+    _touch(hfc_list, section_name)
+    return list_edit
+
+
+# Looks for section in hfc list
+@_memoized("section")
+def findSection(section_name: str, hfc_list: list[dict[dict]]):
+    """
+    Look for a section in a HFC list.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the section to be found.
+    hfc_list : list[dict[dict]]
+        The HFC list to be searched.
+
+    Returns
+    -------
+    bool
+        False if is not found
+    dict
+        The section and its variables if is found
+    """
+    if not _section_exists(hfc_list, section_name):
+        return False
+
+    for i in hfc_list:
+        if section_name in i.keys():
+            return i[section_name]
+        
+
+# Find all occurrences of a variable in a hfc list
+@_memoized("all")
+def findVariable(variable_name: str, hfc_list: list[dict[dict]]):
+    """
+    Find all occurrences of a variable in a HFC list.
+
+    Parameters
+    ----------
+    variable_name : str
+        The name of the variable to be found.
+    hfc_list : list[dict[dict]]
+        The HFC list to be searched.
+
+    Returns
+    -------
+    list
+        A list of all occurrences of the variable in the HFC list.
+    """
+    variables = []
+    for i in hfc_list:
+        for key, value in i.items():
+            if variable_name in value.keys():
+                variables.append({f"{key}": {variable_name: value[variable_name]}})
+
+    return variables
+
+
+# Generate a ready-to-use hfc list
+def generateHFC():
+    """
+    Generate an empty HFC list.
+
+    Returns
+    -------
+    list[dict[dict]]
+        An empty HFC list.
+    """
+    return HfcDocument([{"": HfcSection()}])
+
+
+class SchemaError(Exception):
+    def __init__(self, violations: list[list[int, str]]):
+        self.violations = violations
+
+        message = f"{len(violations)} schema violation(s)"
+        if violations:
+            message += f", first at line {violations[0][0]}: {violations[0][1]}"
+
+        super().__init__(message)
+
+
+# Names of the hfc types accepted by Schema.addVariable
+_SCHEMA_TYPES = {
+    "string": str,
+    "integer": int,
+    "float": float,
+    "boolean": bool,
+    "list": list,
+    "void": type(None),
+}
+
+_SCHEMA_SPECIAL_TYPES = {
+    "ip_address": [langconf.IP_ADDR_REGEX, langconf.IP_ADDR_WPORT_REGEX],
+    "ip6_address": [langconf.IPV6_ADDR_REGEX, langconf.IPV6_ADDR_WPORT_REGEX],
+    "hexadecimal": [langconf.HEX_VALUE_REGEX, langconf.HEX_VALUE_REGEX_0x],
+    "hex_color": [langconf.COLOR_HEX_REGEX],
+}
+
+
+# Build the type check of a schema variable
+def _compile_type_check(name: str, expected):
+    if expected in _SCHEMA_SPECIAL_TYPES:
+        regexes = [re.compile(regex) for regex in _SCHEMA_SPECIAL_TYPES[expected]]
+
+        def check(value):
+            if type(value) != str or not any(regex.fullmatch(value.strip()) for regex in regexes):
+                return f"{name} must be {expected}"
+        return check
+
+    expected_type = _SCHEMA_TYPES.get(expected, expected)
+    if not isinstance(expected_type, type):
+        raise ValueError(f"Unknown schema type {expected} for {name}")
+
+    if expected_type == list:
+        # Numeric arrays are valid lists
+        def check(value):
+            if type(value) != list and not _is_numeric_array(value):
+                return f"{name} must be list, not {type(value).__name__}"
+        return check
+
+    if expected_type == float:
+        # Integers are valid floats
+        def check(value):
+            if type(value) != float and type(value) != int:
+                return f"{name} must be float, not {type(value).__name__}"
+        return check
+
+    def check(value):
+        if type(value) != expected_type:
+            return f"{name} must be {expected_type.__name__}, not {type(value).__name__}"
+    return check
+
+
+# Build a single validator function from the constraints of a variable
+def _compile_validator(name: str, spec: dict):
+    checks = []
+
+    if spec["type"] is not None:
+        checks.append(_compile_type_check(name, spec["type"]))
+
+    if spec["min"] is not None or spec["max"] is not None:
+        minimum = spec["min"]
+        maximum = spec["max"]
+
+        def check_range(value):
+            if type(value) != int and type(value) != float:
+                return f"{name} must be a number"
+            if minimum is not None and value < minimum:
+                return f"{name} must be >= {minimum}, got {value}"
+            if maximum is not None and value > maximum:
+                return f"{name} must be <= {maximum}, got {value}"
+        checks.append(check_range)
+
+    if spec["choices"] is not None:
+        choices = list(spec["choices"])
+
+        def check_choices(value):
+            if value not in choices:
+                return f"{name} must be one of {choices}, got {value!r}"
+        checks.append(check_choices)
+
+    if spec["regex"] is not None:
+        regex = re.compile(spec["regex"])
+
+        def check_regex(value):
+            if type(value) != str or not regex.fullmatch(value):
+                return f"{name} must match {regex.pattern}"
+        checks.append(check_regex)
+
+    # Specialize on the number of checks so simple variables cost one call
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(value):
+        for check in checks:
+            message = check(value)
+            if message:
+                return message
+    return validate
+
+
+class Schema:
+    """
+    Declares the sections and variables a HFC document must have.
+
+    Parameters
+    ----------
+    strict : bool
+        If True, sections and variables that are not declared are violations.
+    """
+    def __init__(self, strict=False):
+        self.strict = strict
+        self.sections = {}
+        self._compiled = None
+
+    def addSection(self, section_name: str, required=True):
+        """
+        Declare a section.
+
+        Parameters
+        ----------
+        section_name : str
+            The name of the section.
+        required : bool
+            If True, a document without this section is a violation.
+
+        Returns
+        -------
+        Schema
+            The schema itself, so declarations can be chained.
+        """
+        self.sections[section_name] = {"required": required, "variables": {}}
+        self._compiled = None
+
+        return self
+
+    def addVariable(self, section_name: str, variable_name: str, type=None, required=True, min=None, max=None, choices=None, regex=None, default=None):
+        """
+        Declare a variable of a section. The section is declared if it doesn't exist.
+
+        Parameters
+        ----------
+        section_name : str
+            The name of the section where the variable is.
+        variable_name : str
+            The name of the variable.
+        type : type or str
+            A python type (str, int, float, bool, list, type(None)) or a hfc type name
+            ("string", "integer", "float", "boolean", "list", "void", "ip_address", "ip6_address",
+            "hexadecimal", "hex_color"). If None, any type is accepted.
+        required : bool
+            If True, a section without this variable is a violation.
+        min : int or float
+            Minimum numeric value.
+        max : int or float
+            Maximum numeric value.
+        choices : list
+            The only accepted values.
+        regex : str
+            A regex that string values must fully match.
+        default : any
+            The value used when an optional variable is missing.
+
+        Returns
+        -------
+        Schema
+            The schema itself, so declarations can be chained.
+        """
+        if section_name not in self.sections:
+            self.addSection(section_name)
+
+        self.sections[section_name]["variables"][variable_name] = {
+            "type": type,
+            "required": required,
+            "min": min,
+            "max": max,
+            "choices": choices,
+            "regex": regex,
+            "default": default,
+        }
+        self._compiled = None
+
+        return self
+
+    def compile(self):
+        """
+        Compile the declarations into validator functions. The result is cached until the schema changes.
+
+        Returns
+        -------
+        _CompiledSchema
+            The compiled schema.
+        """
+        if self._compiled is None:
+            self._compiled = _CompiledSchema(self)
+
+        return self._compiled
+
+
+class _CompiledSchema:
+    def __init__(self, schema: Schema):
+        self.strict = schema.strict
+        self.validators = {}
+        self.required_sections = []
+        self.required_variables = {}
+
+        for section_name, section in schema.sections.items():
+            if section["required"]:
+                self.required_sections.append(section_name)
+
+            self.required_variables[section_name] = [name for name, spec in section["variables"].items() if spec["required"]]
+            self.validators[section_name] = {
+                name: _compile_validator(f"{section_name}.{name}", spec) for name, spec in section["variables"].items()
+            }
+
+    def start(self, fail_fast=False):
+        return _SchemaRun(self, fail_fast)
+
+
+# State of a single validation pass
+class _SchemaRun:
+    def __init__(self, compiled: _CompiledSchema, fail_fast: bool):
+        self.compiled = compiled
+        self.fail_fast = fail_fast
+        self.violations = []
+        self.seen = {}
+
+    def _violation(self, line_num: int, message: str):
+        self.violations.append([line_num, message])
+
+        if self.fail_fast:
+            raise SchemaError(self.violations)
+
+    def section(self, section_name: str, line_num: int):
+        self.seen.setdefault(section_name, set())
+
+        if self.compiled.strict and section_name not in self.compiled.validators:
+            self._violation(line_num, f"Undeclared section {section_name}")
+
+    def variable(self, section_name: str, variable_name: str, value, line_num: int):
+        self.seen[section_name].add(variable_name)
+        validators = self.compiled.validators.get(section_name)
+
+        if validators is None:
+            return
+
+        if variable_name not in validators:
+            if self.compiled.strict:
+                self._violation(line_num, f"Undeclared variable {section_name}.{variable_name}")
+            return
+
+        validator = validators[variable_name]
+        if validator is not None:
+            message = validator(value)
+            if message:
+                self._violation(line_num, message)
+
+    def finish(self) -> list[list[int, str]]:
+        # Required declarations are checked against what was seen, not the parsed structure
+        for section_name in self.compiled.required_sections:
+            if section_name not in self.seen:
+                self._violation(0, f"Missing section {section_name}")
+
+        for section_name, variables in self.seen.items():
+            for variable_name in self.compiled.required_variables.get(section_name, []):
+                if variable_name not in variables:
+                    self._violation(0, f"Missing variable {section_name}.{variable_name}")
+
+        if self.violations:
+            raise SchemaError(self.violations)
+
+        return self.violations
+
+
+# Validate an already parsed hfc list against a schema
+def validateHfc(hfc_list: list[dict[dict]], schema: Schema, fail_fast=False) -> list[list[int, str]]:
+    """
+    Validate a parsed HFC list against a schema.
+
+    Parameters
+    ----------
+    hfc_list : list[dict[dict]]
+        The HFC list to be validated.
+    schema : Schema
+        The schema to validate against.
+    fail_fast : bool
+        If True, stop at the first violation.
+
+    Returns
+    -------
+    list[list[int, str]]
+        A list of violations, where each violation is a list of two elements: the line number (always 0,
+        since a parsed list has no lines) and the message. Empty if the list is valid.
+    """
+    validator = schema.compile().start(fail_fast)
+
+    try:
+        for section in hfc_list:
+            for section_name, variables in section.items():
+                if section_name == "":
+                    continue
+
+                validator.section(section_name, 0)
+                for variable_name, value in variables.items():
+                    validator.variable(section_name, variable_name, value, 0)
+
+        validator.finish()
+    except SchemaError as e:
+        return e.violations
+
+    return []
+
+
+class _FrozenConfig:
+    __slots__ = ()
+
+    def __init__(self, values: dict):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is frozen")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is frozen")
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    def asDict(self) -> dict:
+        """
+        Get the values of the object as a dictionary keyed by attribute name.
+
+        Returns
+        -------
+        dict
+            The attribute names and their values.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Generated classes, keyed by class name and attribute names
+_config_classes = {}
+
+
+# Turn a hfc name into a valid python identifier
+def _attribute_name(name: str) -> str:
+    import keyword
+
+    attribute = re.sub(r"\W", "_", _strip(name))
+
+    if attribute == "" or attribute[0].isdigit():
+        attribute = f"_{attribute}"
+    if keyword.iskeyword(attribute):
+        attribute = f"{attribute}_"
+
+    return attribute
+
+
+# Get (or generate) a frozen __slots__ class with the given attributes
+def _config_class(class_name: str, attributes: tuple):
+    key = (class_name, attributes)
+
+    if key not in _config_classes:
+        _config_classes[key] = type(class_name, (_FrozenConfig,), {"__slots__": attributes})
+
+    return _config_classes[key]
+
+
+# Map hfc names to unique attribute names
+def _attribute_names(names) -> dict:
+    attributes = {}
+
+    for name in names:
+        attribute = _attribute_name(name)
+        if attribute in attributes.values():
+            raise ValueError(f"{name} conflicts with another name as attribute {attribute}")
+
+        attributes[name] = attribute
+
+    return attributes
+
+
+def buildConfig(hfc_list: list[dict[dict]], schema=None):
+    """
+    Build frozen, typed config objects from a HFC list.
+
+    Each section becomes an instance of a generated __slots__ class and is an attribute of the returned
+    object. Names that aren't valid identifiers have invalid characters replaced by "_".
+
+    Parameters
+    ----------
+    hfc_list : list[dict[dict]]
+        The HFC list to build from.
+    schema : Schema
+        The schema the HFC list is validated against. Missing optional variables get their default
+        value. If None, every variable is accepted as it is.
+
+    Returns
+    -------
+    HfcConfig
+        A frozen object with one attribute per section.
+
+    Raises
+    ------
+    SchemaError
+        If the HFC list violates the schema.
+    ValueError
+        If two names map to the same attribute.
+    """
+    if schema is not None:
+        violations = validateHfc(hfc_list, schema)
+        if violations:
+            raise SchemaError(violations)
+
+    sections = {}
+    for section in hfc_list:
+        for section_name, variables in section.items():
+            if section_name != "":
+                sections.setdefault(section_name, {}).update(variables)
+
+    if schema is not None:
+        for section_name, declaration in schema.sections.items():
+            variables = sections.setdefault(section_name, {})
+
+            for variable_name, spec in declaration["variables"].items():
+                variables.setdefault(variable_name, spec["default"])
+
+    section_attributes = _attribute_names(sections.keys())
+    config = {}
+
+    for section_name, variables in sections.items():
+        attributes = _attribute_names(variables.keys())
+        class_name = f"{_attribute_name(section_name).strip('_').title().replace('_', '')}Section"
+        section_class = _config_class(class_name, tuple(attributes.values()))
+
+        config[section_attributes[section_name]] = section_class(
+            {attributes[name]: value for name, value in variables.items()}
+        )
+
+    return _config_class("HfcConfig", tuple(section_attributes.values()))(config)
+
+
+class CompactHfc:
+    """
+    Compact, read-only storage of a HFC document.
+
+    Names are interned once, sections and variables are stored in array-backed tables and values are
+    stored in typed columns (64-bit integers, doubles and a single UTF-8 string pool), instead of one
+    dict per section and one python object per value. Values are converted back to python objects
+    when they are read.
+
+    Use parseCompact() or CompactHfc.fromList() to build one.
+    """
+    # Value tags
+    NONE = 0
+    FALSE = 1
+    TRUE = 2
+    INTEGER = 3
+    FLOAT = 4
+    STRING = 5
+    LIST = 6  # JSON encoded at the string pool
+    BIG_INTEGER = 7  # Integers that don't fit 64 bits, stored at the string pool
+
+    def __init__(self):
+        from array import array
+
+        self._names = []  # Interned section and variable names
+        self._name_ids = {}
+        self._section_names = array("I")
+        self._section_starts = array("I", [0])  # Variables of section i are [starts[i], starts[i+1])
+        self._section_ids = {}  # First section with each name, like the accessor functions
+        self._var_names = array("I")
+        self._var_tags = array("B")
+        self._var_values = array("q")  # Integer value, or index at the float/string column
+        self._var_sorted = array("I")  # Variable positions of each section sorted by name id
+        self._floats = array("d")
+        self._string_offsets = array("Q", [0])
+        self._string_data = bytearray()
+        self._string_ids = {}  # Only used while building
+
+    # Intern a section or variable name
+    def _name_id(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self._names)
+            self._names.append(name)
+
+        return name_id
+
+    # Store a string at the string pool
+    def _string_id(self, text: str) -> int:
+        string_id = self._string_ids.get(text)
+
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self._string_offsets) - 1
+            self._string_data += text.encode("utf-8")
+            self._string_offsets.append(len(self._string_data))
+
+        return string_id
+
+    def _string(self, string_id: int) -> str:
+        return str(self._string_data[self._string_offsets[string_id]:self._string_offsets[string_id + 1]], "utf-8")
+
+    # Finish the variables of the current section and start a new one
+    def _addSection(self, section_name: str):
+        self._sortSection()
+
+        self._section_ids.setdefault(section_name, len(self._section_names))
+        self._section_names.append(self._name_id(section_name))
+        self._section_starts.append(len(self._var_names))
+
+    def _addVariable(self, variable_name: str, value):
+        import json
+
+        if type(value) == bool:
+            tag, stored = (self.TRUE if value else self.FALSE), 0
+        elif type(value) == int:
+            if -2**63 <= value < 2**63:
+                tag, stored = self.INTEGER, value
+            else:
+                tag, stored = self.BIG_INTEGER, self._string_id(str(value))
+        elif type(value) == float:
+            tag, stored = self.FLOAT, len(self._floats)
+            self._floats.append(value)
+        elif type(value) == str:
+            tag, stored = self.STRING, self._string_id(value)
+        elif value is None:
+            tag, stored = self.NONE, 0
+        else:
+            tag, stored = self.LIST, self._string_id(json.dumps(value, default=_json_default))
+
+        self._var_names.append(self._name_id(variable_name))
+        self._var_tags.append(tag)
+        self._var_values.append(stored)
+        self._section_starts[-1] = len(self._var_names)
+
+    # Sort the variables of the last section so lookups can bisect them
+    def _sortSection(self):
+        start = self._section_starts[-2] if len(self._section_starts) > 1 else 0
+        end = len(self._var_names)
+
+        positions = sorted(range(start, end), key=self._var_names.__getitem__)
+        self._var_sorted.extend(positions)
+
+    def _finish(self):
+        self._sortSection()
+        self._string_ids = {}
+
+        return self
+
+    @classmethod
+    def fromList(cls, hfc_list: list[dict[dict]]):
+        """
+        Build a compact document from a HFC list.
+
+        Parameters
+        ----------
+        hfc_list : list[dict[dict]]
+            The HFC list to store.
+
+        Returns
+        -------
+        CompactHfc
+            The compact document.
+        """
+        compact = cls()
+
+        for section in hfc_list:
+            for section_name, variables in section.items():
+                if section_name == "":
+                    continue
+
+                compact._addSection(section_name)
+                for variable_name, value in variables.items():
+                    compact._addVariable(variable_name, value)
+
+        return compact._finish()
+
+    def _value(self, position: int):
+        import json
+
+        tag = self._var_tags[position]
+        stored = self._var_values[position]
+
+        if tag == self.INTEGER:
+            return stored
+        if tag == self.STRING:
+            return self._string(stored)
+        if tag == self.FLOAT:
+            return self._floats[stored]
+        if tag == self.TRUE:
+            return True
+        if tag == self.FALSE:
+            return False
+        if tag == self.LIST:
+            return json.loads(self._string(stored))
+        if tag == self.BIG_INTEGER:
+            return int(self._string(stored))
+
+        return None
+
+    def _section_index(self, section_name: str) -> int:
+        index = self._section_ids.get(section_name)
+
+        if index is None:
+            raise ValueError(f"Section {section_name} not found in HFC list")
+
+        return index
+
+    def _variable_position(self, section_index: int, variable_name: str) -> int:
+        import bisect
+
+        name_id = self._name_ids.get(variable_name)
+        start = self._section_starts[section_index]
+        end = self._section_starts[section_index + 1]
+
+        if name_id is not None:
+            index = bisect.bisect_left(self._var_sorted, name_id, start, end, key=self._var_names.__getitem__)
+            # Keep the last declaration, like the parser does
+            while index + 1 < end and self._var_names[self._var_sorted[index + 1]] == name_id:
+                index += 1
+
+            if index < end and self._var_names[self._var_sorted[index]] == name_id:
+                return self._var_sorted[index]
+
+        return -1
+
+    def __len__(self):
+        return len(self._var_names)
+
+    def getSections(self) -> list[str]:
+        """
+        Get all sections, like getSections().
+
+        Returns
+        -------
+        list[str]
+            A list of all sections.
+        """
+        return [self._names[name_id] for name_id in self._section_names]
+
+    def getVariables(self, section_name: str) -> dict:
+        """
+        Get all variables from a section, like getVariables().
+
+        Parameters
+        ----------
+        section_name : str
+            The name of the section to get variables from.
+
+        Returns
+        -------
+        dict
+            A new dictionary with all variables from the section.
+
+        Raises
+        ------
+        ValueError
+            If the section is not found.
+        """
+        index = self._section_index(section_name)
+
+        return {
+            self._names[self._var_names[position]]: self._value(position)
+            for position in range(self._section_starts[index], self._section_starts[index + 1])
+        }
+
+    def getVariableValue(self, section_name: str, variable_name: str):
+        """
+        Get the value of a variable, like getVariableValue().
+
+        Parameters
+        ----------
+        section_name : str
+            The name of the section where the variable is located.
+        variable_name : str
+            The name of the variable to get the value of.
+
+        Returns
+        -------
+        any
+            The value of the variable.
+
+        Raises
+        ------
+        ValueError
+            If the section or the variable is not found.
+        """
+        position = self._variable_position(self._section_index(section_name), variable_name)
+
+        if position < 0:
+            raise ValueError(f"Variable {variable_name} not found in section {section_name}")
+
+        return self._value(position)
+
+    def findSection(self, section_name: str):
+        """
+        Look for a section, like findSection().
+
+        Returns
+        -------
+        bool
+            False if is not found
+        dict
+            The variables of the section if is found
+        """
+        if section_name not in self._section_ids:
+            return False
+
+        return self.getVariables(section_name)
+
+    def findVariable(self, variable_name: str) -> list:
+        """
+        Find all occurrences of a variable, like findVariable().
+
+        Returns
+        -------
+        list
+            A list of all occurrences of the variable.
+        """
+        variables = []
+
+        for index in range(len(self._section_names)):
+            position = self._variable_position(index, variable_name)
+            if position >= 0:
+                variables.append({self._names[self._section_names[index]]: {variable_name: self._value(position)}})
+
+        return variables
+
+    def toList(self) -> list[dict[dict]]:
+        """
+        Convert back to a HFC list.
+
+        Returns
+        -------
+        list[dict[dict]]
+            The HFC list.
+        """
+        hfc_list = []
+
+        for index, name_id in enumerate(self._section_names):
+            hfc_list.append({self._names[name_id]: {
+                self._names[self._var_names[position]]: self._value(position)
+                for position in range(self._section_starts[index], self._section_starts[index + 1])
+            }})
+
+        return hfc_list
+
+
+    # Header of the serialized form: magic, format version and the length of each column
+    _HEADER = "<4sI8Q"
+    _MAGIC = b"HFCC"
+
+    def toBytes(self) -> bytes:
+        """
+        Serialize to a flat buffer that CompactHfc.fromBuffer() can read without copying.
+
+        Returns
+        -------
+        bytes
+            The serialized document.
+        """
+        from array import array
+        import struct
+
+        name_data = bytearray()
+        name_offsets = array("Q", [0])
+        for name in self._names:
+            name_data += name.encode("utf-8")
+            name_offsets.append(len(name_data))
+
+        columns = [
+            name_offsets.tobytes(), bytes(name_data),
+            self._section_names.tobytes(), self._section_starts.tobytes(),
+            self._var_names.tobytes(), self._var_tags.tobytes(), self._var_values.tobytes(), self._var_sorted.tobytes(),
+            self._floats.tobytes(), self._string_offsets.tobytes(), bytes(self._string_data),
+        ]
+
+        output = bytearray(struct.pack(
+            self._HEADER, self._MAGIC, 1,
+            len(self._names), len(name_data), len(self._section_names), len(self._var_names),
+            len(self._floats), len(self._string_offsets) - 1, len(self._string_data), 0,
+        ))
+        for column in columns:
+            output += b"\0" * (-len(output) % 8) # Align every column to 8 bytes
+            output += column
+
+        return bytes(output)
+
+    @classmethod
+    def fromBuffer(cls, buffer):
+        """
+        Read a document serialized by toBytes(). Only the names are copied, every other column is a
+        view of the buffer.
+
+        Parameters
+        ----------
+        buffer : bytes-like
+            The serialized document.
+
+        Returns
+        -------
+        CompactHfc
+            The document.
+
+        Raises
+        ------
+        NotHFC
+            If the buffer doesn't contain a serialized document.
+        """
+        import struct
+
+        view = memoryview(buffer).cast("B")
+        magic, _, names, name_bytes, sections, variables, floats, strings, string_bytes, _ = struct.unpack_from(cls._HEADER, view, 0)
+
+        if magic != cls._MAGIC:
+            raise NotHFC("Buffer doesn't contain a compact HFC document.")
+
+        compact = cls()
+        compact._views = []
+        offset = struct.calcsize(cls._HEADER)
+
+        def column(length: int, fmt: str):
+            nonlocal offset
+            offset += -offset % 8
+            size = length * struct.calcsize(fmt)
+            part = view[offset:offset + size].cast(fmt)
+            offset += size
+
+            compact._views.append(part)
+            return part
+
+        name_offsets = column(names + 1, "Q")
+        name_data = column(name_bytes, "B")
+        compact._names = [str(name_data[name_offsets[i]:name_offsets[i + 1]], "utf-8") for i in range(names)]
+        compact._name_ids = {name: name_id for name_id, name in enumerate(compact._names)}
+
+        compact._section_names = column(sections, "I")
+        compact._section_starts = column(sections + 1, "I")
+        compact._var_names = column(variables, "I")
+        compact._var_tags = column(variables, "B")
+        compact._var_values = column(variables, "q")
+        compact._var_sorted = column(variables, "I")
+        compact._floats = column(floats, "d")
+        compact._string_offsets = column(strings + 1, "Q")
+        compact._string_data = column(string_bytes, "B")
+        compact._views.append(view)
+
+        compact._section_ids = {}
+        for index, name_id in enumerate(compact._section_names):
+            compact._section_ids.setdefault(compact._names[name_id], index)
+
+        return compact
+
+    def release(self):
+        """
+        Release the views of the buffer given to fromBuffer(). The document can't be read afterwards.
+        """
+        for view in getattr(self, "_views", []):
+            view.release()
+
+        self._views = []
+
+
+# Parse a HFC text/file straight to compact storage
+def parseCompact(hfc_path="", hfc_text="", dialect=None, resolve_includes=True) -> CompactHfc:
+    """
+    Parse a HFC text/file straight to compact storage, without building the list of dictionaries.
+
+    Parameters
+    ----------
+    hfc_path : str
+        The path to the HFC file.
+    hfc_text : str
+        The HFC text to parse.
+    dialect : Dialect
+        The syntax to parse with (see compileDialect). If None, the langconf class is used.
+    resolve_includes : bool
+        If True, include directives are replaced by the sections of the included file, like in
+        parseHfc().
+
+    Returns
+    -------
+    CompactHfc
+        The parsed HFC.
+
+    Raises
+    ------
+    NotHFC
+        If the input HFC is invalid.
+    SyntaxError
+        If the input HFC has invalid syntax.
+    IncludeCycle
+        If a file includes itself, directly or not.
+    """
+    import os
+
+    lang = dialect if dialect is not None else langconf
+    compact = CompactHfc()
+
+    # Paths are relative to the file, or to the working directory for strings
+    include_dir = os.path.dirname(os.path.abspath(hfc_path)) if hfc_path != "" else os.getcwd()
+    include_stack = [os.path.abspath(hfc_path)] if hfc_path != "" else []
+
+    for line_num, section_name, variable_name, value in _iter_hfc(_read_hfc_lines(hfc_path, hfc_text), includes=resolve_includes, lang=lang):
+        if variable_name is None:
+            if value is not None:
+                # Include directive, the included sections are added in this position
+                for section in _parse_include(os.path.join(include_dir, value), include_stack, lang=lang):
+                    for included_name, included_variables in section.items():
+                        compact._addSection(included_name)
+                        for included_variable, included_value in included_variables.items():
+                            compact._addVariable(included_variable, included_value)
+                continue
+
+            compact._addSection(section_name)
+        else:
+            compact._addVariable(variable_name, _get_converted(value, line_num, lang) if value is not None else None)
+
+    return compact._finish()
+
+
+class HfcSnapshot:
+    """
+    Immutable view of a HFC document at one version of a HfcStore.
+
+    Sections are exposed as read-only mappings. Don't mutate list values read from a snapshot, since
+    they are shared with the other snapshots.
+    """
+    __slots__ = ("version", "_hfc_list", "_sections")
+
+    def __init__(self, hfc_list: list[dict[dict]], version: int):
+        from types import MappingProxyType
+
+        sections = {}
+        for section in hfc_list:
+            for section_name, variables in section.items():
+                # First section with each name, like the accessor functions
+                if section_name != "" and section_name not in sections:
+                    sections[section_name] = MappingProxyType(variables)
+
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "_hfc_list", hfc_list)
+        object.__setattr__(self, "_sections", sections)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("HfcSnapshot is immutable")
+
+    def getSections(self) -> list[str]:
+        """
+        Get all sections, like getSections().
+        """
+        return getSections(self._hfc_list)
+
+    def getVariables(self, section_name: str):
+        """
+        Get a read-only mapping with all variables from a section, like getVariables().
+
+        Raises
+        ------
+        ValueError
+            If the section is not found.
+        """
+        try:
+            return self._sections[section_name]
+        except KeyError:
+            raise ValueError(f"Section {section_name} not found in HFC list")
+
+    def getVariableValue(self, section_name: str, variable_name: str):
+        """
+        Get the value of a variable, like getVariableValue().
+
+        Raises
+        ------
+        ValueError
+            If the section or the variable is not found.
+        """
+        try:
+            return self.getVariables(section_name)[variable_name]
+        except KeyError:
+            raise ValueError(f"Variable {variable_name} not found in section {section_name}")
+
+    def findSection(self, section_name: str):
+        """
+        Look for a section, like findSection(). Returns False if it is not found.
+        """
+        return self._sections.get(section_name, False)
+
+    def findVariable(self, variable_name: str) -> list:
+        """
+        Find all occurrences of a variable, like findVariable().
+        """
+        return findVariable(variable_name, self._hfc_list)
+
+    def toList(self) -> list[dict[dict]]:
+        """
+        Get a mutable copy of the document as a HFC list.
+        """
+        return [{name: dict(variables) for name, variables in section.items()} for section in self._hfc_list]
+
+
+class HfcStore:
+    """
+    Thread-safe HFC document with copy-on-write snapshots.
+
+    Readers call snapshot() and get an immutable HfcSnapshot without taking any lock. Writers copy only
+    the section they change, apply the edit and publish the new snapshot with a single assignment, so
+    readers always see a complete version.
+
+    Parameters
+    ----------
+    hfc_list : list[dict[dict]]
+        The initial document. It is copied, so later changes to it aren't seen by the store.
+    """
+    def __init__(self, hfc_list=None):
+        import threading
+
+        self._write_lock = threading.Lock()
+        self._snapshot = HfcSnapshot(self._copy(hfc_list or [], None), 0)
+
+    # Copy the outer list and the sections that will be changed. section_name None copies all of them
+    @staticmethod
+    def _copy(hfc_list: list[dict[dict]], section_name) -> list[dict[dict]]:
+        copied = []
+
+        for section in hfc_list:
+            if section_name is None or section_name in section:
+                section = {name: dict(variables) for name, variables in section.items()}
+            copied.append(section)
+
+        return copied
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def snapshot(self) -> HfcSnapshot:
+        """
+        Get the current version of the document. Never blocks.
+
+        Returns
+        -------
+        HfcSnapshot
+            The current immutable snapshot.
+        """
+        return self._snapshot
+
+    def _publish(self, section_name, function, *args) -> HfcSnapshot:
+        with self._write_lock:
+            hfc_list = self._copy(self._snapshot._hfc_list, section_name)
+            hfc_list = function(*args, hfc_list) if args else function(hfc_list)
+
+            self._snapshot = HfcSnapshot(hfc_list, self._snapshot.version + 1)
+
+        return self._snapshot
+
+    def update(self, function) -> HfcSnapshot:
+        """
+        Apply a function to a full copy of the document and publish the result.
+
+        Parameters
+        ----------
+        function : callable
+            Receives a mutable HFC list and returns the modified HFC list.
+
+        Returns
+        -------
+        HfcSnapshot
+            The published snapshot.
+        """
+        return self._publish(None, function)
+
+    def replace(self, hfc_list: list[dict[dict]]) -> HfcSnapshot:
+        """
+        Publish a whole new document, like after reloading the file.
+        """
+        return self._publish(None, lambda current: self._copy(hfc_list, None))
+
+    def addSection(self, section_name: str) -> HfcSnapshot:
+        return self._publish(section_name, addSection, section_name)
+
+    def removeSection(self, section_name: str) -> HfcSnapshot:
+        # removeSection() only finds empty sections, so the store removes the section by name
+        def remove(hfc_list: list[dict[dict]]) -> list[dict[dict]]:
+            if not _section_exists(hfc_list, section_name):
+                raise ValueError(f"Section {section_name} not found in HFC list")
+
+            return [section for section in hfc_list if section_name not in section]
+
+        return self._publish(section_name, remove)
+
+    def editSection(self, section_name: str, new_section_name: str) -> HfcSnapshot:
+        return self._publish(section_name, editSection, section_name, new_section_name)
+
+    def addVariable(self, section_name: str, variable_name: str, variable_value) -> HfcSnapshot:
+        return self._publish(section_name, addVariable, section_name, variable_name, variable_value)
+
+    def removeVariable(self, section_name: str, variable_name: str) -> HfcSnapshot:
+        return self._publish(section_name, removeVariable, section_name, variable_name)
+
+    def renameVariable(self, section_name: str, old_variable_name: str, new_variable_name: str) -> HfcSnapshot:
+        return self._publish(section_name, renameVariable, section_name, old_variable_name, new_variable_name)
+
+    def editVariable(self, section_name: str, variable_name: str, new_variable_value) -> HfcSnapshot:
+        return self._publish(section_name, editVariable, section_name, variable_name, new_variable_value)
+
+
+# A shared memory segment mapped read-only, with the buf and close() of SharedMemory
+class _ReadOnlySegment:
+    def __init__(self, mapping):
+        self._mapping = mapping
+        self.buf = memoryview(mapping)
+
+    def close(self):
+        self.buf.release()
+        self._mapping.close()
+
+
+# shm_open() of the C library, looked up once
+_libc_functions = {}
+
+
+# Get shm_open() from the C library. glibc older than 2.34 keeps it in librt
+def _shm_open():
+    import ctypes
+    import ctypes.util
+
+    if "shm_open" not in _libc_functions:
+        try:
+            _libc_functions["shm_open"] = ctypes.CDLL(None, use_errno=True).shm_open
+        except AttributeError:
+            _libc_functions["shm_open"] = ctypes.CDLL(ctypes.util.find_library("rt"), use_errno=True).shm_open
+
+    return _libc_functions["shm_open"]
+
+
+# Attach read-only to a shared memory segment. SharedMemory maps segments writable and registers them
+# at the resource tracker, which would unlink the publisher's segment when a worker exits, so the
+# segment is opened with shm_open(O_RDONLY) and mapped with mmap.ACCESS_READ
+def _open_shared_memory(name: str):
+    import ctypes
+    import mmap
+    import os
+
+    fd = _shm_open()(f"/{name}".encode("utf-8"), os.O_RDONLY, 0)
+    if fd < 0:
+        error = ctypes.get_errno()
+        raise OSError(error, os.strerror(error), name)
+
+    try:
+        return _ReadOnlySegment(mmap.mmap(fd, os.fstat(fd).st_size, access=mmap.ACCESS_READ))
+    finally:
+        os.close(fd)
+
+
+class HfcPublisher:
+    """
+    Publishes a HFC document to shared memory, so worker processes can attach to it with
+    attachHfc() instead of parsing it again.
+
+    The document is stored in its compact serialized form (see CompactHfc) at a segment named
+    "<name>.<generation>". A small control segment named "<name>" holds the current generation.
+
+    Parameters
+    ----------
+    name : str
+        The name workers use to attach.
+    """
+    _CONTROL = "<Q"
+
+    def __init__(self, name: str):
+        from multiprocessing import shared_memory
+        import struct
+
+        self.name = name
+        self.generation = 0
+        self._data = None
+
+        try:
+            self._control = shared_memory.SharedMemory(name=name, create=True, size=struct.calcsize(self._CONTROL))
+        except FileExistsError:
+            # Left behind by a publisher that didn't close, along with its last document
+            self._control = shared_memory.SharedMemory(name=name)
+            self.generation = struct.unpack_from(self._CONTROL, self._control.buf, 0)[0]
+
+            try:
+                shared_memory.SharedMemory(name=f"{name}.{self.generation}").unlink()
+            except FileNotFoundError:
+                pass
+
+    def publish(self, hfc_path="", hfc_text="", hfc_list=None) -> int:
+        """
+        Parse and publish a new version of the document. Workers see it after they reattach.
+
+        Parameters
+        ----------
+        hfc_path : str
+            The path to the HFC file.
+        hfc_text : str
+            The HFC text to parse.
+        hfc_list : list[dict[dict]]
+            An already parsed HFC list, used instead of hfc_path and hfc_text.
+
+        Returns
+        -------
+        int
+            The new generation.
+        """
+        from multiprocessing import shared_memory
+        import struct
+
+        if hfc_list is not None:
+            compact = CompactHfc.fromList(hfc_list)
+        else:
+            compact = parseCompact(hfc_path, hfc_text)
+
+        data = compact.toBytes()
+        generation = self.generation + 1
+        segment = shared_memory.SharedMemory(name=f"{self.name}.{generation}", create=True, size=len(data))
+        segment.buf[:len(data)] = data
+
+        # The generation is written after the data, so workers never see a partial document
+        struct.pack_into(self._CONTROL, self._control.buf, 0, generation)
+        self._unlinkData()
+        self._data = segment
+        self.generation = generation
+
+        return generation
+
+    def _unlinkData(self):
+        # Attached workers keep their mapping, the name just goes away
+        if self._data is not None:
+            self._data.close()
+            self._data.unlink()
+            self._data = None
+
+    def close(self):
+        """
+        Unlink the published document and the control segment.
+        """
+        self._unlinkData()
+        self._control.close()
+        self._control.unlink()
+
+
+class SharedHfc(CompactHfc):
+    """
+    A CompactHfc read straight from shared memory, returned by attachHfc(). Nothing but the names is
+    copied into the worker.
+    """
+    def stale(self) -> bool:
+        """
+        Check if a newer generation was published.
+
+        Returns
+        -------
+        bool
+            True if reattach() would return a newer document.
+        """
+        import struct
+
+        return struct.unpack_from(HfcPublisher._CONTROL, self._control.buf, 0)[0] != self.generation
+
+    def reattach(self):
+        """
+        Attach to the current generation and close this one.
+
+        Returns
+        -------
+        SharedHfc
+            The current document.
+        """
+        attached = attachHfc(self.name)
+        self.close()
+
+        return attached
+
+    def close(self):
+        """
+        Detach from shared memory. The document can't be read afterwards.
+        """
+        self.release()
+        self._segment.close()
+        self._control.close()
+
+
+def attachHfc(name: str, retries=10) -> SharedHfc:
+    """
+    Attach read-only to a document published by HfcPublisher. POSIX only.
+
+    Parameters
+    ----------
+    name : str
+        The name given to HfcPublisher.
+    retries : int
+        How many times to retry if the publisher replaces the document while attaching.
+
+    Returns
+    -------
+    SharedHfc
+        The published document. Check stale() to know when to reattach.
+
+    Raises
+    ------
+    FileNotFoundError
+        If nothing is published with this name.
+    """
+    import struct
+
+    control = _open_shared_memory(name)
+
+    for attempt in range(retries + 1):
+        generation = struct.unpack_from(HfcPublisher._CONTROL, control.buf, 0)[0]
+
+        try:
+            segment = _open_shared_memory(f"{name}.{generation}")
+        except FileNotFoundError:
+            # Replaced (or not published yet) between reading the generation and opening it
+            if attempt == retries:
+                control.close()
+                raise
+            continue
+
+        attached = SharedHfc.fromBuffer(segment.buf)
+        attached.name = name
+        attached.generation = generation
+        attached._segment = segment
+        attached._control = control
+
+        return attached
+
+
+# Map each section to its variables. Repeated sections are merged, later ones win
+def _index_sections(hfc_list: list[dict[dict]]) -> dict:
+    sections = {}
+
+    for section in hfc_list:
+        for section_name, variables in section.items():
+            if section_name != "":
+                sections.setdefault(section_name, {}).update(variables)
+
+    return sections
+
+
+class HfcLayers:
+    """
+    Merges several HFC documents into one precomputed view.
+
+    Layers are merged by section and variable. Later layers take precedence: a variable defined in
+    more than one layer gets the value of the last layer that defines it, and sections keep the order
+    of their first appearance. The merged document is kept up to date, so reading it costs the same
+    as reading a single document.
+
+    Parameters
+    ----------
+    layers : list[list[dict[dict]]]
+        The HFC lists, from lowest to highest precedence (e.g. base, region, host).
+    """
+    def __init__(self, layers: list):
+        self._layers = [self._index(layer) for layer in layers]
+        self._sources = {} # (section, variable) -> index of the layer the value comes from
+        self._merged_sections = {}
+        self.merged = [] # The merged HFC list
+
+        # Dictionaries keep the declaration order of the layers, which a set wouldn't
+        keys = {}
+        sections = []
+        for layer in self._layers:
+            for section_name, variables in layer.items():
+                sections.append(section_name)
+                keys.update(dict.fromkeys((section_name, variable_name) for variable_name in variables))
+
+        self._recompute(sections, keys)
+
+    @staticmethod
+    def _index(hfc_list: list[dict[dict]]) -> dict:
+        return _index_sections(hfc_list)
+
+    def _recompute(self, sections, keys):
+        # Sections first, so new sections are in place before their variables
+        for section_name in sections:
+            exists = any(section_name in layer for layer in self._layers)
+
+            if exists and section_name not in self._merged_sections:
+                self._merged_sections[section_name] = {}
+                self.merged.append({section_name: self._merged_sections[section_name]})
+            elif not exists and section_name in self._merged_sections:
+                variables = self._merged_sections.pop(section_name)
+                self.merged.remove({section_name: variables})
+
+                for variable_name in variables:
+                    self._sources.pop((section_name, variable_name), None)
+
+        for section_name, variable_name in keys:
+            variables = self._merged_sections.get(section_name)
+            if variables is None:
+                continue
+
+            for index in range(len(self._layers) - 1, -1, -1):
+                layer_variables = self._layers[index].get(section_name)
+
+                if layer_variables is not None and variable_name in layer_variables:
+                    variables[variable_name] = layer_variables[variable_name]
+                    self._sources[(section_name, variable_name)] = index
+                    break
+            else:
+                variables.pop(variable_name, None)
+                self._sources.pop((section_name, variable_name), None)
+
+    def setLayer(self, index: int, hfc_list: list[dict[dict]]) -> int:
+        """
+        Replace a layer and recompute only the keys it affects.
+
+        Parameters
+        ----------
+        index : int
+            The index of the layer to replace.
+        hfc_list : list[dict[dict]]
+            The new HFC list of the layer.
+
+        Returns
+        -------
+        int
+            The number of recomputed variables.
+        """
+        old = self._layers[index]
+        new = self._layers[index] = self._index(hfc_list)
+
+        sections = [name for name in new if name not in old] + [name for name in old if name not in new]
+        keys = {}
+
+        for section_name in list(new) + [name for name in old if name not in new]:
+            old_variables = old.get(section_name, {})
+            new_variables = new.get(section_name, {})
+
+            for variable_name in list(new_variables) + [name for name in old_variables if name not in new_variables]:
+                # Keys overridden by a higher layer don't change
+                if self._sources.get((section_name, variable_name), -1) > index:
+                    continue
+
+                if variable_name not in old_variables or variable_name not in new_variables or not _same_value(old_variables[variable_name], new_variables[variable_name]):
+                    keys[(section_name, variable_name)] = None
+
+        self._recompute(sections, keys)
+
+        return len(keys)
+
+    def addLayer(self, hfc_list: list[dict[dict]]) -> int:
+        """
+        Add a layer with the highest precedence.
+
+        Returns
+        -------
+        int
+            The number of recomputed variables.
+        """
+        self._layers.append({})
+
+        return self.setLayer(len(self._layers) - 1, hfc_list)
+
+    def source(self, section_name: str, variable_name: str) -> int:
+        """
+        Get the index of the layer a merged value comes from.
+
+        Raises
+        ------
+        ValueError
+            If the variable is not found.
+        """
+        try:
+            return self._sources[(section_name, variable_name)]
+        except KeyError:
+            raise ValueError(f"Variable {variable_name} not found in section {section_name}")
+
+    def getSections(self) -> list[str]:
+        """
+        Get all merged sections, like getSections().
+        """
+        return list(self._merged_sections)
+
+    def getVariables(self, section_name: str) -> dict:
+        """
+        Get all merged variables of a section, like getVariables().
+
+        Raises
+        ------
+        ValueError
+            If the section is not found.
+        """
+        try:
+            return self._merged_sections[section_name]
+        except KeyError:
+            raise ValueError(f"Section {section_name} not found in HFC list")
+
+    def getVariableValue(self, section_name: str, variable_name: str):
+        """
+        Get the merged value of a variable, like getVariableValue().
+
+        Raises
+        ------
+        ValueError
+            If the section or the variable is not found.
+        """
+        try:
+            return self.getVariables(section_name)[variable_name]
+        except KeyError:
+            raise ValueError(f"Variable {variable_name} not found in section {section_name}")
+
+    def findSection(self, section_name: str):
+        """
+        Look for a merged section, like findSection(). Returns False if it is not found.
+        """
+        return self._merged_sections.get(section_name, False)
+
+    def findVariable(self, variable_name: str) -> list:
+        """
+        Find all occurrences of a variable in the merged document, like findVariable().
+        """
+        return findVariable(variable_name, self.merged)
+
+
+# Check if two parsed values are equal and have the same type
+def _same_value(old, new) -> bool:
+    if type(old) != type(new):
+        return False
+    if type(old) == list:
+        return len(old) == len(new) and all(_same_value(old_item, new_item) for old_item, new_item in zip(old, new))
+    if _is_numeric_array(old):
+        # NumPy arrays compare element by element, so they are compared as lists
+        return str(getattr(old, "dtype", "")) == str(getattr(new, "dtype", "")) and getattr(old, "typecode", "") == getattr(new, "typecode", "") and old.tolist() == new.tolist()
+
+    return old == new
+
+
+# Check if two sections have the same variables, with the same types
+def _same_section(old: dict, new: dict) -> bool:
+    from array import array
+
+    try:
+        if old != new:
+            return False
+        # == is True for 1, 1.0 and True, so the types are checked too
+        if list(old) == list(new):
+            types = list(map(type, old.values()))
+            # Lists can hold items of other types, and arrays can have other typecodes or dtypes, so
+            # they are compared one by one
+            if types == list(map(type, new.values())) and not any(value_type == list or issubclass(value_type, array) or hasattr(value_type, "dtype") for value_type in set(types)):
+                return True
+    except ValueError:
+        pass # NumPy arrays can't be compared with ==
+
+    return old.keys() == new.keys() and all(_same_value(old_value, new[variable_name]) for variable_name, old_value in old.items())
+
+
+# Digest of the variables of a section and their types, cached in the HfcSection until it changes.
+# None for sections that can change without bumping their count, like in _render_version()
+def _section_digest(variables: dict):
+    import hashlib
+
+    if not isinstance(variables, HfcSection) or not _IMMUTABLE_TYPES.issuperset(map(type, dict.values(variables))):
+        return None
+
+    cached = variables.__dict__.get("_digest")
+    if cached is None or cached[0] != variables._changes:
+        # Variable order doesn't matter, like for ==
+        items = sorted((variable_name, type(value).__name__, value) for variable_name, value in variables.items())
+        cached = variables._digest = (variables._changes, hashlib.blake2b(repr(items).encode("utf-8"), digest_size=16).digest())
+
+    return cached[1]
+
+
+# Digests of the sections that appear once in a HFC list. Merged and uncacheable sections are left out
+def _section_digests(hfc_list: list[dict[dict]]) -> dict:
+    digests = {}
+    seen = set()
+
+    for section in hfc_list:
+        for section_name, variables in section.items():
+            if section_name in seen:
+                digests.pop(section_name, None)
+                continue
+            seen.add(section_name)
+
+            digest = _section_digest(variables)
+            if digest is not None:
+                digests[section_name] = digest
+
+    return digests
+
+
+def diffHfc(a, b) -> list[dict]:
+    """
+    Compare two HFC lists or files.
+
+    Sections of HfcDocument lists are compared by a digest that is cached in each section until it
+    changes, and other sections with == first, so sections that didn't change are skipped without
+    comparing their variables one by one. Files are digested first (see digestHfc()), and they
+    aren't parsed if their digests are equal. Repeated sections are merged, like the accessor
+    functions see them.
+
+    Parameters
+    ----------
+    a : list[dict[dict]] or str
+        The old HFC list, or the path to the old HFC file.
+    b : list[dict[dict]] or str
+        The new HFC list, or the path to the new HFC file.
+
+    Returns
+    -------
+    list[dict]
+        A list of changes. Each change is a dictionary with the keys "change" ("added", "removed" or
+        "changed"), "section", "variable" (None for whole sections), "old" and "new" (None when it
+        doesn't apply). Added and removed sections have all their variables at "new" or "old".
+    """
+    if isinstance(a, str) and isinstance(b, str) and digestHfc(hfc_path=a)["document"] == digestHfc(hfc_path=b)["document"]:
+        return []
+
+    old_list = parseHfc(hfc_path=a) if isinstance(a, str) else a
+    new_list = parseHfc(hfc_path=b) if isinstance(b, str) else b
+    old_sections, old_digests = _index_sections(old_list), _section_digests(old_list)
+    new_sections, new_digests = _index_sections(new_list), _section_digests(new_list)
+    changes = []
+
+    for section_name, old_variables in old_sections.items():
+        if section_name not in new_sections:
+            changes.append({"change": "removed", "section": section_name, "variable": None, "old": old_variables, "new": None})
+            continue
+
+        new_variables = new_sections[section_name]
+        if section_name in old_digests and section_name in new_digests:
+            if old_digests[section_name] == new_digests[section_name]:
+                continue
+        elif _same_section(old_variables, new_variables):
+            continue
+
+        for variable_name, old_value in old_variables.items():
+            if variable_name not in new_variables:
+                changes.append({"change": "removed", "section": section_name, "variable": variable_name, "old": old_value, "new": None})
+            elif not _same_value(old_value, new_variables[variable_name]):
+                changes.append({"change": "changed", "section": section_name, "variable": variable_name, "old": old_value, "new": new_variables[variable_name]})
+
+        for variable_name, new_value in new_variables.items():
+            if variable_name not in old_variables:
+                changes.append({"change": "added", "section": section_name, "variable": variable_name, "old": None, "new": new_value})
+
+    for section_name, new_variables in new_sections.items():
+        if section_name not in old_sections:
+            changes.append({"change": "added", "section": section_name, "variable": None, "old": None, "new": new_variables})
+
+    return changes
+
+
+# Normalize a raw value so equivalent spellings get the same digest
+def _normalize_raw(value, lang=langconf) -> str:
+    if value is None:
+        return ""
+
+    value = value.strip()
+
+    if value in lang.BOOLEAN_TRUE:
+        return "true"
+    if value in lang.BOOLEAN_FALSE:
+        return "false"
+    if _validate(lang.FLOAT_REGEX, value):
+        return _replace(text=value, chars=lang.NON_STANDARD_FLOAT_SEPS, replace_to=lang.STANDARD_FLOAT_SEP)
+
+    return value
+
+
+# Normalize the variables of each section of a HFC file, composing the files it includes in place
+def _normalized_sections(hfc_lines, include_dir: str, include_stack: list, includes: list, lang=langconf) -> dict:
+    import os
+
+    sections = {}
+    for line_num, section_name, variable_name, value in _iter_hfc(hfc_lines, includes=True, lang=lang):
+        if variable_name is None and value is not None:
+            include_path = os.path.abspath(os.path.join(include_dir, value))
+            if include_path in include_stack:
+                cycle = include_stack[include_stack.index(include_path):] + [include_path]
+                raise IncludeCycle(f"Include cycle: {' -> '.join(cycle)}")
+
+            includes.append(include_path)
+            fragment = _normalized_sections(_read_hfc_lines(hfc_path=include_path), os.path.dirname(include_path), include_stack + [include_path], includes, lang)
+            for included_name, included_variables in fragment.items():
+                sections.setdefault(included_name, {}).update(included_variables)
+            continue
+
+        variables = sections.setdefault(section_name, {})
+
+        if variable_name is not None:
+            variables[variable_name] = _normalize_raw(value, lang)
+
+    return sections
+
+
+# Get stable digests of a HFC file or string
+def digestHfc(hfc_path="", hfc_text="", dialect=None) -> dict:
+    """
+    Get stable digests of a HFC file or string and of each of its sections, without converting values.
+
+    Values are normalized first (booleans, float separators, spacing and comments), and the order of
+    the variables doesn't matter. Included files are composed in place, as parseHfc() does, so a
+    change in a fragment changes the digests of the sections it composes.
+
+    Parameters
+    ----------
+    hfc_path : str
+        The path to the HFC file.
+    hfc_text : str
+        The HFC text. Include paths are resolved against the current directory.
+    dialect : Dialect
+        The syntax to read with (see compileDialect). If None, the langconf class is used.
+
+    Returns
+    -------
+    dict
+        {"document": digest, "sections": {section_name: digest}, "includes": [absolute_path]}, with
+        hexadecimal digests and every file included directly or indirectly.
+
+    Raises
+    ------
+    SyntaxError
+        If the input HFC has invalid syntax.
+    FileNotFoundError
+        If an included file doesn't exist.
+    IncludeCycle
+        If the included files include each other in a cycle.
+    """
+    import hashlib
+    import os
+
+    include_dir = os.path.dirname(os.path.abspath(hfc_path)) if hfc_path != "" else os.getcwd()
+    include_stack = [os.path.abspath(hfc_path)] if hfc_path != "" else []
+    includes = []
+    lang = dialect if dialect is not None else langconf
+    sections = _normalized_sections(_read_hfc_lines(hfc_path, hfc_text), include_dir, include_stack, includes, lang)
+
+    digests = {
+        section_name: hashlib.blake2b(repr(sorted(variables.items())).encode("utf-8"), digest_size=16).hexdigest()
+        for section_name, variables in sections.items()
+    }
+    document = hashlib.blake2b(repr(sorted(digests.items())).encode("utf-8"), digest_size=16).hexdigest()
+
+    return {"document": document, "sections": digests, "includes": list(dict.fromkeys(includes))}
+
+
+def buildDigestManifest(paths: list[str], manifest_path="") -> dict:
+    """
+    Get the digests of many HFC files, reusing the ones at an existing manifest for files that didn't change.
+
+    Parameters
+    ----------
+    paths : list[str]
+        The paths of the HFC files.
+    manifest_path : str
+        The path of the JSON manifest. If it exists it is read first, and it is rewritten with the
+        new digests. If empty, nothing is read or written.
+
+    Returns
+    -------
+    dict
+        {absolute_path: {"stamp": [mtime_ns, size], "document": digest, "sections": {section_name: digest},
+        "includes": {absolute_path: [mtime_ns, size]}}}. A file that can't be digested gets
+        {"error": message} instead, and isn't written to the manifest.
+    """
+    import json
+    import os
+
+    manifest = {}
+    if manifest_path != "" and os.path.exists(manifest_path):
+        with open(manifest_path, "r") as manifest_file:
+            manifest = json.load(manifest_file)
+
+    def stamp(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    digests = {}
+    for path in paths:
+        path = os.path.abspath(path)
+        entry = manifest.get(path)
+
+        # Reused only if neither the file nor any file it includes changed
+        if entry is not None and entry["stamp"] == stamp(path) and all(stamp(include) == include_stamp for include, include_stamp in entry["includes"].items()):
+            digests[path] = entry
+            continue
+
+        try:
+            file_stamp = stamp(path)
+            digest = digestHfc(hfc_path=path)
+        except (OSError, SyntaxError, NotHFC, IncludeCycle) as error:
+            digests[path] = {"error": f"{type(error).__name__}: {error}"}
+            continue
+
+        digest["includes"] = {include: stamp(include) for include in digest["includes"]}
+        digests[path] = {"stamp": file_stamp, **digest}
+
+    if manifest_path != "":
+        manifest.update({path: entry for path, entry in digests.items() if "error" not in entry})
+        _write_atomic(manifest_path, json.dumps(manifest, indent=4))
+
+    return digests
+
+
+def scanDrift(golden_path: str, paths: list[str], manifest_path="") -> list[dict]:
+    """
+    Find the HFC files that drifted from a golden file.
+
+    Digests are compared first, and only the files whose digests differ are fully parsed and diffed.
+    Included files are part of the comparison, so a changed fragment makes every file that includes
+    it drift. A file that can't be read or parsed doesn't stop the scan.
+
+    Parameters
+    ----------
+    golden_path : str
+        The path to the golden HFC file.
+    paths : list[str]
+        The paths of the HFC files to check.
+    manifest_path : str
+        The path of a digest manifest (see buildDigestManifest()), so files that didn't change since
+        the last scan aren't read again. If empty, no manifest is used.
+
+    Returns
+    -------
+    list[dict]
+        One dictionary per drifted file, with the keys "path", "sections" (names of the sections that
+        differ) and "changes" (as returned by diffHfc()). Files that can't be read or parsed get an
+        "error" key with the message, and no sections or changes.
+    """
+    golden = digestHfc(hfc_path=golden_path)
+    golden_list = None
+    drifted = []
+
+    for path, digests in buildDigestManifest(paths, manifest_path).items():
+        if "error" in digests:
+            drifted.append({"path": path, "sections": [], "changes": [], "error": digests["error"]})
+            continue
+
+        if digests["document"] == golden["document"]:
+            continue
+
+        sections = [name for name, digest in golden["sections"].items() if digests["sections"].get(name) != digest]
+        sections += [name for name in digests["sections"] if name not in golden["sections"]]
+
+        if golden_list is None:
+            golden_list = parseHfc(hfc_path=golden_path)
+
+        # The digests only normalize values, so converting them can still fail
+        try:
+            changes = diffHfc(golden_list, parseHfc(hfc_path=path))
+        except (OSError, SyntaxError, NotHFC, IncludeCycle) as error:
+            drifted.append({"path": path, "sections": sections, "changes": [], "error": f"{type(error).__name__}: {error}"})
+            continue
+
+        drifted.append({"path": path, "sections": sections, "changes": changes})
+
+    return drifted
+
+
+# Expand files, directories and globs to a sorted list of files. Directories are searched for files
+# with the extension, dotfiles included, so ".env" and ".env.<name>" files are found for ".env"
+def _expand_paths(patterns: list[str], extension: str) -> list[str]:
+    import glob
+    import os
+
+    def matches(name: str) -> bool:
+        return name.endswith(extension) or (extension == ".env" and name.startswith(".env."))
+
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for directory, _, names in os.walk(pattern):
+                paths += [os.path.join(directory, name) for name in names if matches(name)]
+        elif glob.has_magic(pattern):
+            paths += glob.glob(pattern, recursive=True)
+        else:
+            paths.append(pattern)
+
+    return sorted(set(paths))
+
+
+# Format a hfc text line by line. Sections and declarations get the standard spacing and spelling of
+# parseList(), comments and include directives are kept, and blank lines are laid out like parseList()
+def _format_text(hfc_text: str) -> str:
+    lines = [_strip(line) for line in _read_hfc_lines(hfc_text=hfc_text)]
+    events = {line_num - 1: event for line_num, *event in _iter_hfc(lines, includes=True)}
+
+    formatted = []
+    comments = [] # Comment lines, kept right above the line that follows them
+
+    for index, line in enumerate(lines):
+        if index not in events:
+            if line != "":
+                comments.append(line)
+            continue
+
+        section_name, variable_name, value = events[index]
+
+        if variable_name is None and value is None:
+            # Sections are set apart by blank lines, along with the comments above them
+            if formatted:
+                formatted.append("")
+            formatted += comments + [f"{langconf.SECTION_SEPARATOR} {section_name} {langconf.SECTION_SEPARATOR}", ""]
+        elif variable_name is None:
+            formatted += comments + [line] # Include directive
+        else:
+            formatted += comments + [_edited_line(variable_name, _convert_value(value, index + 1) if value is not None else None, line)]
+        comments = []
+
+    formatted += comments
+    while formatted and formatted[-1] == "":
+        formatted.pop()
+
+    return "\n".join(formatted) + "\n"
+
+
+# Run one command of the command-line tool over one file
+def _cli_task(task: tuple) -> dict:
+    import json
+    import os
+    import time
+
+    command, path, options = task
+    record = {"path": path, "ok": True}
+
+    def output_path(extension: str) -> str:
+        output = os.path.splitext(path)[0] + extension
+        if options["output_dir"]:
+            output = os.path.join(options["output_dir"], os.path.basename(output))
+        return output
+
+    try:
+        if command == "parse":
+            record["result"] = parseHfc(hfc_path=path)
+        elif command == "validate":
+            record["diagnostics"] = lintHfc(hfc_path=path)
+            record["ok"] = not record["diagnostics"]
+        elif command == "to-json":
+            output = output_path(".json")
+            parseHfc(hfc_path=path, json_path=output, json_indent=options["indent"], fsync=options["fsync"])
+            record["output"] = output
+        elif command == "from-json":
+            with open(path, "r") as json_file:
+                hfc_list = json.load(json_file)
+
+            output = output_path(".hfc")
+            parseList(hfc_list, write_path=output, fsync=options["fsync"])
+            record["output"] = output
+        elif command == "fmt":
+            with open(path, "r") as hfc_file:
+                original = hfc_file.read()
+
+            formatted = _format_text(original)
+            record["changed"] = formatted != original
+
+            if record["changed"] and not options["check"]:
+                _write_atomic(path, formatted, options["fsync"])
+        elif command == "convert":
+            output = os.path.join(options["output_dir"] or os.path.dirname(path), _converted_name(path, options["to"]))
+            report = convertFile(path, output, options["to"], options["input_format"], fsync=options["fsync"])
+            record.update(output=report["output"], changes=report["changes"])
+        elif command == "bench":
+            timings = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                parsed = parseHfc(hfc_path=path)
+                timings.append(time.perf_counter() - start)
+
+            record["variables"] = sum(len(variables) for section in parsed for variables in section.values())
+            record["best_seconds"] = min(timings)
+            record["mean_seconds"] = sum(timings) / len(timings)
+    except Exception as e:
+        record["ok"] = False
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    return record
+
+
+def cli(argv=None) -> int:
+    """
+    Command-line tool, run with `python -m hfclib <command> <paths>`.
+
+    Every command accepts files, directories (searched recursively) and globs, processes the files in
+    parallel worker processes and writes one JSON object per file to stdout (JSON Lines).
+
+    Parameters
+    ----------
+    argv : list[str]
+        The arguments. If None, sys.argv is used.
+
+    Returns
+    -------
+    int
+        The exit code: 0 if every file succeeded, 1 otherwise.
+    """
+    import argparse
+    import json
+    import multiprocessing
+    import os
+    import sys
+
+    parser = argparse.ArgumentParser(prog="hfclib", description="Parse, validate, convert and benchmark HFC files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    descriptions = {
+        "parse": "Parse files and print the result.",
+        "validate": "Check that files are valid.",
+        "to-json": "Convert .hfc files to .json.",
+        "from-json": "Convert .json files to .hfc.",
+        "fmt": "Rewrite files with the standard formatting, keeping comments and includes.",
+        "bench": "Measure the parsing time of files.",
+        "serve": "Keep files parsed in memory and answer lookups of them over a Unix socket (see HfcClient).",
+        "convert": "Convert files between HFC, INI, TOML and env formats, reporting the values that lost their type.",
+    }
+    for command, description in descriptions.items():
+        subparser = commands.add_parser(command, help=description, description=description)
+        subparser.add_argument("paths", nargs="*" if command == "serve" else "+", help="Files, directories or globs.")
+        subparser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+
+        if command in ["to-json", "from-json", "convert"]:
+            subparser.add_argument("-o", "--output-dir", default="", help="Directory of the converted files. Defaults to next to each input.")
+        if command == "to-json":
+            subparser.add_argument("--indent", type=int, default=4, help="Indentation of the JSON files.")
+        if command in ["to-json", "from-json", "fmt", "convert"]:
+            subparser.add_argument("--fsync", action="store_const", const="file", default=None, help="Sync each written file to disk.")
+        if command == "fmt":
+            subparser.add_argument("--check", action="store_true", help="Only report files that would change.")
+        if command == "bench":
+            subparser.add_argument("-n", "--repeat", type=int, default=5, help="Parses per file.")
+        if command == "convert":
+            subparser.add_argument("--to", required=True, choices=list(CONVERT_FORMATS), help="Format of the converted files.")
+            subparser.add_argument("--from", dest="input_format", default="hfc", choices=list(CONVERT_FORMATS), help="Format of the input files.")
+        if command == "serve":
+            subparser.add_argument("-s", "--socket", required=True, help="Path of the socket.")
+            subparser.add_argument("--check-interval", type=float, default=1.0, help="Seconds between checks of a file for changes.")
+            subparser.add_argument("--root", action="append", default=[], help="Directory whose files can be looked up without being given as paths. Can be repeated.")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        server = HfcServer(args.socket, check_interval=args.check_interval, roots=args.root)
+        try:
+            for path in _expand_paths(args.paths, ".hfc"):
+                server.load(path)
+            server.serveForever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+        return 0
+
+    options = {
+        "output_dir": getattr(args, "output_dir", ""),
+        "indent": getattr(args, "indent", 4),
+        "check": getattr(args, "check", False),
+        "repeat": getattr(args, "repeat", 5),
+        "fsync": getattr(args, "fsync", None),
+        "to": getattr(args, "to", ""),
+        "input_format": getattr(args, "input_format", "hfc"),
+    }
+
+    if options["output_dir"]:
+        os.makedirs(options["output_dir"], exist_ok=True)
+
+    extension = ".json" if args.command == "from-json" else CONVERT_FORMATS[options["input_format"]]
+    tasks = [(args.command, path, options) for path in _expand_paths(args.paths, extension)]
+    failed = False
+
+    def write(record: dict):
+        nonlocal failed
+        failed = failed or not record["ok"]
+        sys.stdout.write(json.dumps(record, default=str) + "\n")
+        sys.stdout.flush()
+
+    if args.jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            write(_cli_task(task))
+    else:
+        with multiprocessing.Pool(min(args.jobs, len(tasks))) as pool:
+            for record in pool.imap_unordered(_cli_task, tasks, chunksize=max(1, len(tasks) // (args.jobs * 8))):
+                write(record)
+
+    return 1 if failed else 0
+
+
+# Codes of the diagnostics returned by lintHfc
+LINT_CODES = {
+    "HFC001": "Invalid section name",
+    "HFC002": "Variable declared outside a section",
+    "HFC003": "Invalid variable name",
+    "HFC004": "Invalid value",
+    "HFC005": "Malformed list",
+    "HFC006": "Included file not found",
+    "HFC007": "Include cycle",
+}
+
+
+# Check the lines of a HFC file, and the files it includes if lint_includes is True
+def _lint_lines(hfc_lines, lang, include_dir: str, include_stack: list, lint_includes: bool) -> list[dict]:
+    import os
+
+    diagnostics = []
+    sections = 0
+
+    def report(line_num: int, line: str, text: str, code: str, message: str):
+        column = line.find(text) + 1 if text else 1
+        diagnostics.append({"line": line_num, "column": max(column, 1), "code": code, "message": message})
+
+    line_num = 0
+    for line in hfc_lines:
+        line_num += 1
+
+        include = _validate(lang.INCLUDE_REGEX, line)
+        if include:
+            include_path = os.path.abspath(os.path.join(include_dir, include.group(1)))
+
+            if include_path in include_stack:
+                report(line_num, line, include.group(1), "HFC007", f"Include cycle at line {line_num}: {' -> '.join(include_stack[include_stack.index(include_path):] + [include_path])}")
+            elif not os.path.isfile(include_path):
+                report(line_num, line, include.group(1), "HFC006", f"Included file not found at line {line_num}")
+            elif lint_includes:
+                for diagnostic in _lint_lines(_read_hfc_lines(hfc_path=include_path), lang, os.path.dirname(include_path), include_stack + [include_path], True):
+                    diagnostic.setdefault("path", include_path)
+                    diagnostics.append(diagnostic)
+            continue
+
+        if _validate(lang.SECTION_REGEX, line):
+            sections += 1
+            section_name = _strip(_replace(line, chars=[lang.SECTION_SEPARATOR], replace_to=""))
+
+            for regex in lang.INVALID_NAME_REGEXES:
+                if _validate(regex, section_name):
+                    report(line_num, line, "", "HFC001", f"Invalid section name at line {line_num}")
+            continue
+
+        variable = _split_declaration(line, lang)
+        if len(variable) < 1 or variable[0] == "":
+            continue
+
+        if any(_validate(regex, variable[0]) for regex in lang.INVALID_NAME_REGEXES):
+            report(line_num, line, variable[0], "HFC003", f"Invalid variable name at line {line_num}")
+            continue
+
+        if sections <= 0:
+            report(line_num, line, variable[0], "HFC002", f"Invalid variable declaration outside a section at line {line_num}.")
+
+        if len(variable) > 1:
+            try:
+                valid = _classify_value(variable[1], lang) is not None
+            except ValueError as e:
+                report(line_num, line, variable[1], "HFC005", f"{e} at line {line_num}")
+                continue
+
+            if not valid:
+                report(line_num, line, variable[1], "HFC004", f"Invalid variable declaration at line {line_num}.")
+
+    return diagnostics
+
+
+def lintHfc(hfc_path="", hfc_text="", dialect=None, lint_includes=False) -> list[dict]:
+    """
+    Check the syntax and value types of a HFC file or string, reporting every error in one pass.
+
+    Unlike parseHfc(), values are only classified, never converted, no output is built and checking
+    goes on after an error. Include directives are checked for missing files and cycles.
+
+    Parameters
+    ----------
+    hfc_path : str
+        The path to the HFC file.
+    hfc_text : str
+        The HFC text.
+    dialect : Dialect
+        The syntax to check against (see compileDialect). If None, the langconf class is used.
+    lint_includes : bool
+        If True, the included files are checked too.
+
+    Returns
+    -------
+    list[dict]
+        One dictionary per error, with the keys "line", "column" (both starting at 1), "code" (see
+        LINT_CODES) and "message". Errors of included files also have the key "path", and their lines
+        are lines of that file. Empty if it is valid.
+
+    Raises
+    ------
+    NotHFC
+        If there is nothing to check.
+    """
+    import os
+
+    lang = dialect if dialect is not None else langconf
+
+    # Paths are relative to the file, or to the working directory for strings
+    include_dir = os.path.dirname(os.path.abspath(hfc_path)) if hfc_path != "" else os.getcwd()
+    include_stack = [os.path.abspath(hfc_path)] if hfc_path != "" else []
+
+    return _lint_lines(_read_hfc_lines(hfc_path, hfc_text), lang, include_dir, include_stack, lint_includes)
+
+
+# Regexes built from other settings, rebuilt when those settings change
+_DERIVED_REGEXES = {
+    "SECTION_REGEX": lambda values: fr"^{re.escape(values['SECTION_SEPARATOR'])}.+{re.escape(values['SECTION_SEPARATOR'])}$",
+    "STRING_REGEX": lambda values: fr"^{re.escape(values['STRING_CHAR'])}.+{re.escape(values['STRING_CHAR'])}$",
+    "INCLUDE_REGEX": lambda values: fr"^{re.escape(values['INCLUDE_DIRECTIVE'])}\s+{re.escape(values['STRING_CHAR'])}(.+){re.escape(values['STRING_CHAR'])}$",
+    "LIST_REGEXES": lambda values: [
+        fr"^{re.escape(values['LIST_CHARS'][index])}.*{re.escape(values['LIST_CHARS'][index + 1])}$"
+        for index in range(0, len(values["LIST_CHARS"]) - 1, 2)
+    ],
+    "INTEGER_LIST_REGEX": lambda values: (
+        fr"^{re.escape(values['LIST_CHARS'][0])}(-?\d+(?:{re.escape(values['LIST_INDEX_SEP'])}-?\d+)*){re.escape(values['LIST_CHARS'][1])}$"
+    ),
+    "FLOAT_LIST_REGEX": lambda values: (
+        fr"^{re.escape(values['LIST_CHARS'][0])}"
+        fr"(\d+(?:[{''.join(map(re.escape, values['ALL_FLOAT_SEP']))}]\d+)?(?:{re.escape(values['LIST_INDEX_SEP'])}\d+(?:[{''.join(map(re.escape, values['ALL_FLOAT_SEP']))}]\d+)?)*)"
+        fr"{re.escape(values['LIST_CHARS'][1])}$"
+    ),
+}
+_DERIVED_FROM = {
+    "SECTION_REGEX": ("SECTION_SEPARATOR",),
+    "STRING_REGEX": ("STRING_CHAR",),
+    "INCLUDE_REGEX": ("INCLUDE_DIRECTIVE", "STRING_CHAR"),
+    "LIST_REGEXES": ("LIST_CHARS",),
+    "INTEGER_LIST_REGEX": ("LIST_CHARS", "LIST_INDEX_SEP"),
+    "FLOAT_LIST_REGEX": ("LIST_CHARS", "LIST_INDEX_SEP", "ALL_FLOAT_SEP"),
+}
+
+
+class Dialect:
+    """
+    HFC syntax settings compiled once, used instead of the langconf class by the dialect argument of
+    parseHfc(), parseCompact(), lintHfc(), digestHfc() and parseList().
+
+    It has the same attributes as langconf, but regexes are compiled, lists are tuples and boolean
+    words are frozensets. Dialects are frozen, so many of them can be used at once. Use
+    compileDialect() to get one.
+    """
+    def __init__(self, values: dict):
+        for name, value in values.items():
+            if name.endswith("_REGEXES"):
+                value = tuple(re.compile(regex) for regex in value)
+            elif "_REGEX" in name:
+                value = re.compile(value)
+            elif name in ["BOOLEAN_TRUE", "BOOLEAN_FALSE"]:
+                value = frozenset(value)
+            elif type(value) in [list, tuple]:
+                value = tuple(value)
+
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is frozen")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is frozen")
+
+    def __repr__(self):
+        return f"{type(self).__name__}(COMMENT_CHARS={self.COMMENT_CHARS!r}, BOOLEAN_TRUE={sorted(self.BOOLEAN_TRUE)!r}, BOOLEAN_FALSE={sorted(self.BOOLEAN_FALSE)!r})"
+
+
+# Compiled dialects, keyed by their settings
+_dialect_cache = {}
+
+
+# Get the settings of a langconf-like class or dictionary, filling the missing ones from langconf
+def _dialect_settings(settings, overrides: dict) -> dict:
+    defaults = {name: value for name, value in vars(langconf).items() if not name.startswith("_")}
+    values = dict(defaults)
+
+    if settings is not None:
+        given = settings if type(settings) == dict else {name: getattr(settings, name) for name in dir(settings) if not name.startswith("_")}
+        values.update(given)
+    values.update(overrides)
+
+    for name in values:
+        if name not in defaults:
+            raise ValueError(f"Unknown dialect setting {name}")
+
+    # Regexes that weren't changed follow the settings they are built from
+    for name, build in _DERIVED_REGEXES.items():
+        if values[name] == defaults[name] and any(values[source] != defaults[source] for source in _DERIVED_FROM[name]):
+            values[name] = build(values)
+
+    return values
+
+
+def compileDialect(settings=None, **overrides) -> Dialect:
+    """
+    Compile HFC syntax settings into a Dialect, or get the one already compiled with the same settings.
+
+    Parameters
+    ----------
+    settings : class or dict
+        A langconf-like class or a dictionary with langconf attribute names as keys. Missing settings
+        are taken from langconf. If None, only langconf and overrides are used.
+    **overrides
+        Settings that replace the ones in settings, like COMMENT_CHARS=["#"].
+
+    Returns
+    -------
+    Dialect
+        The compiled dialect. If a separator, STRING_CHAR, INCLUDE_DIRECTIVE, LIST_CHARS or
+        ALL_FLOAT_SEP changes and the regex built from it is not given, that regex is rebuilt.
+
+    Raises
+    ------
+    ValueError
+        If a setting is not a langconf attribute.
+    re.error
+        If a regex is invalid.
+    """
+    values = _dialect_settings(settings, overrides)
+    key = tuple(sorted((name, tuple(value) if type(value) in [list, tuple] else value) for name, value in values.items()))
+
+    dialect = _dialect_cache.get(key)
+    if dialect is None:
+        dialect = _dialect_cache.setdefault(key, Dialect(values))
+
+    return dialect
+
+
+# fsync policies of the write layer
+FSYNC_POLICIES = [None, "file", "directory"]
+
+
+# Flush a directory entry to disk, where the platform allows it
+def _sync_directory(directory: str):
+    import os
+
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return # Directories can't be opened on Windows
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# Write text to a temporary file next to path, returning the temporary path
+def _write_temp(path: str, text: str, sync: bool) -> str:
+    import os
+
+    directory = os.path.dirname(os.path.abspath(path))
+
+    # Created with mode 0o666 like open() does, so the kernel applies the umask to new files
+    while True:
+        temp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.urandom(6).hex()}.tmp")
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            break
+        except FileExistsError:
+            continue
+
+    try:
+        with os.fdopen(fd, "w") as temp_file:
+            temp_file.write(text)
+            temp_file.flush()
+
+            if sync:
+                os.fsync(temp_file.fileno())
+
+        # Keep the mode of the replaced file
+        try:
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return temp_path
+
+
+# Atomically replace many files with the given texts
+def _write_files(files: dict, fsync=None):
+    import os
+
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Invalid fsync policy {fsync!r}, expected one of {FSYNC_POLICIES}")
+
+    # Every file is written before any is replaced, so a failed write replaces nothing
+    temp_paths = {}
+    try:
+        for path, text in files.items():
+            temp_paths[path] = _write_temp(path, text, fsync is not None)
+    except BaseException:
+        for temp_path in temp_paths.values():
+            os.unlink(temp_path)
+        raise
+
+    directories = []
+    for path, temp_path in temp_paths.items():
+        os.replace(temp_path, path)
+        directory = os.path.dirname(os.path.abspath(path))
+
+        if fsync == "file":
+            _sync_directory(directory)
+        elif directory not in directories:
+            directories.append(directory)
+
+    if fsync == "directory":
+        for directory in directories:
+            _sync_directory(directory)
+
+
+# Atomically replace a file with text
+def _write_atomic(path: str, text: str, fsync=None):
+    _write_files({path: text}, fsync)
+
+
+def saveHfcFiles(documents: dict, fsync="directory", newline_after_section=True, spacing=True, list_char=['[', ']'], bool_false="false", bool_true="true", float_separator=".") -> list[str]:
+    """
+    Save many HFC documents at once, each one replaced atomically.
+
+    Every document is converted and written to a temporary file before any file is replaced, so
+    an invalid document or a failed write leaves all the files as they were.
+
+    Parameters
+    ----------
+    documents : dict
+        The path of each file as key and its HFC list (or an already converted HFC string) as value.
+    fsync : str
+        None to not wait for the disk, "file" to sync each file and its directory, "directory" to sync
+        each file and then each directory only once.
+    newline_after_section, spacing, list_char, bool_false, bool_true, float_separator
+        Passed to parseList().
+
+    Returns
+    -------
+    list[str]
+        The saved paths.
+
+    Raises
+    ------
+    ValueError
+        If fsync is not a valid policy.
+    """
+    files = {}
+    for path, document in documents.items():
+        if type(document) == str:
+            files[path] = document
+        else:
+            files[path] = parseList(document, newline_after_section=newline_after_section, spacing=spacing, list_char=list_char, bool_false=bool_false, bool_true=bool_true, float_separator=float_separator)
+
+    _write_files(files, fsync)
+
+    return list(files)
+
+
+class HfcConflict(Exception):
+    def __init__(self, conflicts: list[dict]):
+        self.conflicts = conflicts
+
+        message = f"{len(conflicts)} conflicting change(s)"
+        if conflicts:
+            variable = conflicts[0]["variable"]
+            message += f", first at section {conflicts[0]['section']}" + (f", variable {variable}" if variable is not None else "")
+
+        super().__init__(message)
+
+
+class HfcLock:
+    """
+    Advisory lock of a HFC file, held on a "<path>.lock" file next to it.
+
+    Shared locks don't block each other, an exclusive lock blocks every other lock. The lock file
+    is kept, so the file itself can be replaced atomically while it is locked. Only processes and
+    threads that use HfcLock (or editHfc) are blocked. Available on POSIX systems only.
+
+    Parameters
+    ----------
+    hfc_path : str
+        The path to the HFC file.
+    exclusive : bool
+        If True, the lock is exclusive (for writing), otherwise it is shared (for reading).
+    timeout : float
+        Seconds to wait for the lock before raising TimeoutError. If None, it waits forever.
+    """
+    def __init__(self, hfc_path: str, exclusive=False, timeout=None):
+        self.hfc_path = hfc_path
+        self.exclusive = exclusive
+        self.timeout = timeout
+        self._fd = None
+
+    def acquire(self):
+        import fcntl
+        import os
+        import time
+
+        mode = fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH
+        fd = os.open(f"{self.hfc_path}.lock", os.O_RDWR | os.O_CREAT, 0o666)
+
+        try:
+            if self.timeout is None:
+                fcntl.flock(fd, mode)
+            else:
+                deadline = time.monotonic() + self.timeout
+                while True:
+                    try:
+                        fcntl.flock(fd, mode | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if time.monotonic() >= deadline:
+                            raise TimeoutError(f"Timed out waiting for the lock of {self.hfc_path}")
+                        time.sleep(0.005)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+        return self
+
+    def release(self):
+        import fcntl
+        import os
+
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+# Read the text of a hfc file and its stamp
+def _read_stamped(hfc_path: str) -> tuple:
+    import os
+
+    with open(hfc_path, "r") as hfc_file:
+        # Stat the open file, so the stamp is the one of the text even if the path is replaced
+        stat = os.fstat(hfc_file.fileno())
+        return hfc_file.read(), (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+# Parse the text read by _read_stamped, where an empty file is an empty document
+def _parse_stamped(text: str) -> HfcDocument:
+    sections = []
+    if text.strip() == "":
+        return HfcDocument(sections)
+
+    for line_num, section_name, variable_name, value in _iter_hfc(_read_hfc_lines(hfc_text=text), includes=True):
+        if variable_name is None:
+            # Included sections belong to other files, so they aren't read or edited
+            if value is None:
+                variables = HfcSection()
+                sections.append({section_name: variables})
+            continue
+
+        variables[variable_name] = _convert_value(value, line_num) if value is not None else None
+
+    return HfcDocument(sections)
+
+
+# Get the changes of both sides that can't be merged
+def _merge_conflicts(ours: list[dict], theirs: list[dict]) -> list[dict]:
+    their_changes = {(change["section"], change["variable"]): change for change in theirs}
+    their_sections = {change["section"] for change in theirs}
+    conflicts = []
+
+    for change in ours:
+        key = (change["section"], change["variable"])
+        their_change = their_changes.get(key)
+
+        if their_change is not None:
+            if their_change["change"] == change["change"] and _same_value(their_change["new"], change["new"]):
+                continue # Both sides did the same
+        elif change["variable"] is None:
+            if change["section"] not in their_sections:
+                continue
+            their_change = next(other for other in theirs if other["section"] == change["section"])
+        elif (change["section"], None) in their_changes:
+            their_change = their_changes[(change["section"], None)]
+        else:
+            continue
+
+        conflicts.append({"section": change["section"], "variable": change["variable"], "ours": change, "theirs": their_change})
+
+    return conflicts
+
+
+# Write a declaration for an edited variable, keeping the indentation and the comment of its line
+def _edited_line(variable_name: str, value, line="") -> str:
+    declaration = variable_name
+    if value is not None:
+        declaration += f" {langconf.VARIABLE_SEPARATOR} {_convert_to_hfc(value, ['[', ']'], 'false', 'true', '.')}"
+
+    stripped = _strip(line)
+    kept = _remove_comments(stripped)
+    if stripped.startswith(kept) and len(kept) < len(stripped):
+        declaration += f" {stripped[len(kept):].strip()}"
+
+    return line[:len(line) - len(line.lstrip())] + declaration
+
+
+# Apply changes returned by diffHfc to a hfc text, keeping every line they don't change
+def _edit_text(text: str, changes: list[dict]) -> str:
+    lines = text.split("\n")
+    blocks = {} # Section name -> [first line, last declaration line] of each of its blocks
+    declarations = {} # (section name, variable name) -> lines
+    includes = set()
+
+    if text.strip() != "":
+        block = None
+        for line_num, section_name, variable_name, value in _iter_hfc([_strip(line) for line in lines], includes=True):
+            index = line_num - 1
+
+            if variable_name is not None:
+                declarations.setdefault((section_name, variable_name), []).append(index)
+                block[1] = index
+            elif value is None:
+                block = [index, index]
+                blocks.setdefault(section_name, []).append(block)
+            else:
+                includes.add(index)
+
+    replaced = {} # Line -> new line, or None to remove it
+    inserted = {} # Line -> declarations added after it
+    new_sections = {} # Name -> declarations of the sections added at the end
+
+    for change in changes:
+        section_name, variable_name = change["section"], change["variable"]
+
+        if variable_name is None:
+            if change["change"] == "removed":
+                for first, last in blocks.get(section_name, []):
+                    for index in range(first, last + 1):
+                        if index not in includes:
+                            replaced[index] = None
+            elif section_name not in blocks:
+                new_sections[section_name] = [_edited_line(name, value) for name, value in change["new"].items()]
+            continue
+
+        indices = declarations.get((section_name, variable_name), [])
+        if change["change"] == "removed":
+            for index in indices:
+                replaced[index] = None
+        elif indices:
+            # The last declaration is the one that is read
+            replaced[indices[-1]] = _edited_line(variable_name, change["new"], lines[indices[-1]])
+        elif section_name in blocks:
+            inserted.setdefault(blocks[section_name][-1][1], []).append(_edited_line(variable_name, change["new"]))
+        else:
+            new_sections.setdefault(section_name, []).append(_edited_line(variable_name, change["new"]))
+
+    edited = []
+    for index, line in enumerate(lines):
+        line = replaced.get(index, line)
+        if line is not None:
+            edited.append(line)
+        edited += inserted.get(index, [])
+
+    if new_sections:
+        while edited and edited[-1].strip() == "":
+            edited.pop()
+
+        for section_name, section_lines in new_sections.items():
+            if edited:
+                edited.append("")
+            edited += [f"{langconf.SECTION_SEPARATOR} {section_name} {langconf.SECTION_SEPARATOR}", ""] + section_lines
+        edited.append("")
+
+    return "\n".join(edited)
+
+
+def editHfc(hfc_path: str, function, retries=5, merge=True, timeout=None, fsync=None) -> HfcDocument:
+    """
+    Edit a HFC file without losing the changes other editors make at the same time.
+
+    The file is read under a shared lock and function edits a copy of it with no lock held. Then,
+    under an exclusive lock, the changes of function are applied to the file (merged with the
+    changes made meanwhile, a three-way merge, see diffHfc). Changes to the same variable, or to a
+    section that the other side added or removed, conflict, and function runs again on the new
+    content.
+
+    Only the lines of the changed variables and sections are rewritten, so comments, include
+    directives and void variables are kept. Sections of included files are not part of the
+    document, so they can't be edited.
+
+    Parameters
+    ----------
+    hfc_path : str
+        The path to the HFC file. An empty file is an empty document.
+    function : callable
+        Called with the document (a HfcDocument) to change it in place, with the functions of this
+        module. If it returns a list, that list is written instead.
+    retries : int
+        How many times function runs again after a conflict.
+    merge : bool
+        If False, function runs again whenever the file changed, without merging.
+    timeout : float
+        Seconds to wait for each lock. If None, it waits forever.
+    fsync : str
+        The fsync policy of the file (see FSYNC_POLICIES). It is always replaced atomically.
+
+    Returns
+    -------
+    HfcDocument
+        The written document, without the sections of included files.
+
+    Raises
+    ------
+    HfcConflict
+        If the changes still conflict after all the retries.
+    TimeoutError
+        If a lock can't be taken in time.
+    SyntaxError
+        If a changed value can't be written as valid HFC (like a string with "="). Nothing is written.
+    """
+    import copy
+
+    for attempt in range(retries + 1):
+        with HfcLock(hfc_path, timeout=timeout):
+            text, stamp = _read_stamped(hfc_path)
+
+        base = _parse_stamped(text)
+        edited = copy.deepcopy(base)
+
+        result = function(edited)
+        if isinstance(result, list):
+            edited = result
+
+        ours = diffHfc(base, edited)
+
+        with HfcLock(hfc_path, exclusive=True, timeout=timeout):
+            current_text, current_stamp = _read_stamped(hfc_path)
+
+            if current_stamp != stamp and current_text != text:
+                if not merge:
+                    if attempt < retries:
+                        continue
+                    raise HfcConflict([{"section": change["section"], "variable": change["variable"], "ours": change, "theirs": None} for change in ours])
+
+                conflicts = _merge_conflicts(ours, diffHfc(base, _parse_stamped(current_text)))
+                if conflicts:
+                    if attempt < retries:
+                        continue
+                    raise HfcConflict(conflicts)
+
+            new_text = _edit_text(current_text, ours)
+            # Parsed before writing, so a value that doesn't round-trip never reaches the file
+            document = _parse_stamped(new_text)
+
+            if new_text != current_text:
+                _write_atomic(hfc_path, new_text, fsync)
+            return document
+
+
+# Lookups answered by HfcServer, by operation code
+_SERVER_OPERATIONS = {
+    1: ("getVariableValue", 2),
+    2: ("getVariables", 1),
+    3: ("findSection", 1),
+    4: ("getSections", 0),
+    5: ("findVariable", 1),
+}
+_SERVER_CODES = {name: code for code, (name, _) in _SERVER_OPERATIONS.items()}
+
+# Errors that clients raise again with the same type, other errors are raised as RuntimeError
+_SERVER_ERRORS = {error.__name__: error for error in [ValueError, KeyError, SyntaxError, FileNotFoundError, PermissionError, NotHFC, IncludeCycle]}
+
+# Frames are a 32-bit little-endian length followed by a UTF-8 JSON payload
+_FRAME_HEADER = "<I"
+
+# Largest request frame a server reads, so a client can't make it allocate any size
+_MAX_REQUEST_SIZE = 4 * 1024 * 1024
+
 
-        index += 1
-    
-    return list_add
+# Read exactly size bytes from a socket, or None if it closed before the first byte
+def _receive_exactly(sock, size: int):
+    data = bytearray()
 
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            if not data:
+                return None
+            raise ConnectionError("Connection closed in the middle of a frame")
+        data += chunk
 
-# Remove a variable from a hfc list
-def removeVariable(section_name: str, variable_name: str, hfc_list: list[dict[dict]]):
+    return bytes(data)
+
+
+def _pack_frame(payload) -> bytes:
+    import json
+    import struct
+
+    # JSON only holds plain values, so decoding a frame can't run code like marshal or pickle could
+    data = json.dumps(payload, separators=(",", ":"), default=_json_default).encode("utf-8")
+    return struct.pack(_FRAME_HEADER, len(data)) + data
+
+
+# Read and decode a frame, or None if the connection closed. Frames longer than max_size raise ValueError
+def _receive_frame(sock, max_size=None):
+    import json
+    import struct
+
+    header = _receive_exactly(sock, struct.calcsize(_FRAME_HEADER))
+    if header is None:
+        return None
+
+    size = struct.unpack(_FRAME_HEADER, header)[0]
+    if max_size is not None and size > max_size:
+        raise ValueError(f"Frame of {size} bytes is longer than {max_size} bytes")
+
+    data = _receive_exactly(sock, size)
+    if data is None:
+        raise ConnectionError("Connection closed in the middle of a frame")
+
+    try:
+        return json.loads(data.decode("utf-8"))
+    except RecursionError:
+        raise ValueError("Frame nested too deeply")
+
+
+class HfcServer:
     """
-    Remove a variable from a specified section in a HFC list.
+    Keeps parsed and indexed HFC documents in memory and answers lookups over a Unix domain socket,
+    so short-lived processes don't parse the same files again (see HfcClient).
+
+    Documents are parsed with parseHfc() the first time they are asked for and kept as CompactHfc.
+    A file is checked for changes at most once every check_interval seconds, and parsed again if it
+    or one of the files it includes changed. Each connection is served by its own thread.
+
+    Only files loaded with load() and files under one of the roots can be looked up, other paths
+    raise PermissionError. Symbolic links are resolved before checking.
 
     Parameters
     ----------
-    section_name : str
-        The name of the section where the variable will be removed.
-    variable_name : str
-        The name of the variable to be removed.
-    hfc_list : list[dict[dict]]
-        The HFC list to be modified.
+    socket_path : str
+        The path of the socket. A socket left behind at this path is replaced.
+    check_interval : float
+        Seconds between two checks of the same file. 0 checks on every lookup.
+    mode : int
+        The permissions of the socket file.
+    roots : list[str]
+        Directories whose files can be looked up without being loaded first.
+    """
+    def __init__(self, socket_path: str, check_interval=1.0, mode=0o600, roots=None):
+        import os
+        import socket
+        import stat
+        import threading
+
+        self.socket_path = socket_path
+        self.check_interval = check_interval
+        self.roots = [os.path.realpath(root) for root in roots or []]
+        self._loaded = set() # Real paths of the files given to load()
+        self._documents = {}  # Path asked for -> [[(path, file stamp)] of the file and its includes, last check, CompactHfc]
+        self._lock = threading.Lock()
+        self._closed = False
+
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.unlink(socket_path)
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(socket_path)
+        os.chmod(socket_path, mode)
+        self._socket.listen()
+
+    # Get a document, parsing it again if it changed
+    def _document(self, path: str) -> CompactHfc:
+        import time
+
+        now = time.monotonic()
+        cached = self._documents.get(path)
+
+        if cached is not None and now - cached[1] < self.check_interval:
+            return cached[2]
+
+        # Checked along with the file, so a link that now points elsewhere is seen
+        try:
+            real_path = self._allowed(path)
+        except PermissionError:
+            self._documents.pop(path, None)
+            raise
+
+        with self._lock:
+            cached = self._documents.get(path)
+
+            if cached is None or cached[0][0][0] != real_path or any(_file_stamp_or_none(stamp_path) != stamp for stamp_path, stamp in cached[0]):
+                _debug(f"Loading {real_path}")
+                stamps, document = self._load(real_path)
+                cached = self._documents[path] = [stamps, now, document]
+            else:
+                cached[1] = now
 
-    Returns
-    -------
-    list[dict[dict]]
-        The modified HFC list.
+        return cached[2]
 
-    Raises
-    ------
-    ValueError
-        If the section is not found in the HFC list or if the variable is not found in the section.
-    """
-    
-    list_remove = hfc_list
+    # Parse a file and get the stamps of it and of every file it includes, directly or not
+    def _load(self, real_path: str) -> tuple:
+        import os
 
-    if not _section_exists(list_remove, section_name):
-        raise ValueError(f"Section {section_name} not found in HFC list")
-    
-    # Look for section index on list
-    index = 0
-    for section in list_remove:
-        if section_name in section.keys():
-            # Remove variable
-            if _variable_exists(list_remove, section_name, variable_name):
-                list_remove[index][section_name].pop(variable_name)
-            else:
-                raise ValueError(f"Variable {variable_name} not found in section {section_name}")
-            break
+        stamps = [(real_path, _file_stamp(real_path))]
+        parsed, includes = _parse_lines(_read_hfc_lines(hfc_path=real_path), include_dir=os.path.dirname(real_path), include_stack=[real_path])
 
-        index += 1
+        # Included files are stamped by _parse_include() before they are read
+        keys = [(include, langconf, False, "") for include in includes]
+        while keys:
+            key = keys.pop(0)
+            cached = _include_cache.get(key)
 
-    # Look for section
-    index = 0
+            if cached is not None and all(key[0] != stamp_path for stamp_path, _ in stamps):
+                stamps.append((key[0], cached[0]))
+                keys += cached[2]
 
-    return list_remove
+        return stamps, CompactHfc.fromList(parsed)
 
+    def load(self, hfc_path: str):
+        """
+        Parse a file before it is asked for, and allow lookups of it.
 
-# Rename a variable in a hfc list
-def renameVariable(section_name: str, old_variable_name: str, new_variable_name: str, hfc_list: list[dict[dict]]):
+        Parameters
+        ----------
+        hfc_path : str
+            The path to the HFC file.
+        """
+        import os
+
+        self._loaded.add(os.path.realpath(hfc_path))
+        self._document(os.path.abspath(hfc_path))
+
+    # Get the real path of a file that can be looked up, or raise PermissionError
+    def _allowed(self, path: str) -> str:
+        import os
+
+        path = os.path.realpath(path)
+        if path in self._loaded or any(os.path.commonpath([path, root]) == root for root in self.roots):
+            return path
+
+        raise PermissionError(f"{path} wasn't loaded and isn't under a root of the server")
+
+    # Answer one lookup with (error name, result)
+    def _answer(self, request) -> tuple:
+        try:
+            if type(request) != list or len(request) < 2 or type(request[0]) != int or any(type(item) != str for item in request[1:]):
+                raise ValueError("A lookup must be an operation code followed by a path and names")
+
+            code, path, *names = request
+            if code not in _SERVER_OPERATIONS:
+                raise ValueError(f"Unknown operation {code}")
+
+            name, arguments = _SERVER_OPERATIONS[code]
+            if len(names) != arguments:
+                raise ValueError(f"{name} takes {arguments} name(s), got {len(names)}")
+
+            return ("", getattr(self._document(path), name)(*names))
+        except Exception as e:
+            return (type(e).__name__, str(e))
+
+    def _serve_connection(self, connection):
+        with connection:
+            try:
+                while True:
+                    requests = _receive_frame(connection, _MAX_REQUEST_SIZE)
+                    if requests is None:
+                        break
+                    if type(requests) != list:
+                        raise ValueError("A request frame must be a list of lookups")
+
+                    connection.sendall(_pack_frame([self._answer(request) for request in requests]))
+            except (ConnectionError, ValueError, TypeError):
+                pass # The client went away or sent an invalid frame
+
+    def serveForever(self):
+        """
+        Accept connections until close() is called.
+        """
+        import threading
+
+        while not self._closed:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                break
+
+            threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+
+    def close(self):
+        """
+        Stop accepting connections and remove the socket file.
+        """
+        import os
+        import socket
+
+        self._closed = True
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+class HfcClient:
     """
-    Rename a variable in a specified section in a HFC list.
+    Client of a HfcServer, with the lookups of this module taking the path of the HFC file
+    instead of a HFC list.
+
+    Use batch() to send many lookups in one round trip.
 
     Parameters
     ----------
-    section_name : str
-        The name of the section where the variable will be renamed.
-    old_variable_name : str
-        The name of the variable to be renamed.
-    new_variable_name : str
-        The new name for the variable.
-    hfc_list : list[dict[dict]]
-        The HFC list to be modified.
+    socket_path : str
+        The path of the server socket.
+    timeout : float
+        Seconds to wait for the server. If None, it waits forever.
+    """
+    def __init__(self, socket_path: str, timeout=None):
+        import socket
+
+        self.socket_path = socket_path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(socket_path)
+
+    # Build the error raised by the server
+    @staticmethod
+    def _error(name: str, message: str) -> Exception:
+        return _SERVER_ERRORS.get(name, RuntimeError)(message if name in _SERVER_ERRORS else f"{name}: {message}")
+
+    def batch(self, calls: list[tuple], batch_size=256, raise_errors=True) -> list:
+        """
+        Run many lookups, sending them in frames of batch_size lookups without waiting for the answers
+        in between. When there are many frames, they are sent by another thread while the answers are
+        read, so neither side blocks on a full socket buffer.
+
+        Parameters
+        ----------
+        calls : list[tuple]
+            One tuple per lookup with the function name followed by its arguments, like
+            ("getVariableValue", section_name, variable_name, hfc_path).
+        batch_size : int
+            Lookups per frame.
+        raise_errors : bool
+            If True, the first error is raised after every answer is read. If False, errors are
+            returned in place of their results.
+
+        Returns
+        -------
+        list
+            The result of each lookup, in order.
+
+        Raises
+        ------
+        ValueError
+            If a function name is unknown, or if a lookup fails with ValueError.
+        """
+        import os
+        import socket
+        import threading
+
+        requests = []
+        for name, *arguments in calls:
+            if name not in _SERVER_CODES:
+                raise ValueError(f"Unknown lookup {name}")
+            # The path is the last argument, made absolute since the server has its own working directory
+            requests.append((_SERVER_CODES[name], os.path.abspath(arguments[-1]), *arguments[:-1]))
+
+        frames = [_pack_frame(requests[start:start + batch_size]) for start in range(0, len(requests), batch_size)]
+        sender = None
+
+        if len(frames) == 1:
+            # The server reads the whole frame before answering, so it can be sent before reading
+            self._socket.sendall(frames[0])
+        elif frames:
+            def send():
+                try:
+                    for frame in frames:
+                        self._socket.sendall(frame)
+                except OSError:
+                    pass # The reader gets the error when the answers stop
+
+            sender = threading.Thread(target=send, daemon=True)
+            sender.start()
+
+        results = []
+        try:
+            for _ in frames:
+                answers = _receive_frame(self._socket)
+                if answers is None:
+                    raise ConnectionError("The server closed the connection")
+
+                results += [self._error(*answer) if answer[0] else answer[1] for answer in answers]
+        except BaseException:
+            if sender is not None:
+                # Unblocks the sender. A connection can't be used after a batch broke in the middle
+                self._socket.shutdown(socket.SHUT_RDWR)
+            raise
+        finally:
+            if sender is not None:
+                sender.join()
+
+        if raise_errors:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+
+        return results
+
+    def getVariableValue(self, section_name: str, variable_name: str, hfc_path: str):
+        """
+        Get the value of a variable, like getVariableValue().
+        """
+        return self.batch([("getVariableValue", section_name, variable_name, hfc_path)])[0]
+
+    def getVariables(self, section_name: str, hfc_path: str) -> dict:
+        """
+        Get all variables from a section, like getVariables().
+        """
+        return self.batch([("getVariables", section_name, hfc_path)])[0]
+
+    def findSection(self, section_name: str, hfc_path: str):
+        """
+        Look for a section, like findSection().
+        """
+        return self.batch([("findSection", section_name, hfc_path)])[0]
+
+    def getSections(self, hfc_path: str) -> list[str]:
+        """
+        Get all section names, like getSections().
+        """
+        return self.batch([("getSections", hfc_path)])[0]
+
+    def findVariable(self, variable_name: str, hfc_path: str) -> list:
+        """
+        Find all occurrences of a variable, like findVariable().
+        """
+        return self.batch([("findVariable", variable_name, hfc_path)])[0]
+
+    def close(self):
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Formats of convertFile and the extension of their files
+CONVERT_FORMATS = {"hfc": ".hfc", "ini": ".ini", "toml": ".toml", "env": ".env"}
+
+# Words read as booleans from INI and env files
+_TEXT_BOOLEANS = {"true": True, "yes": True, "on": True, "false": False, "no": False, "off": False}
+
+
+# Get the format of a file from its name
+def _convert_format(path: str) -> str:
+    import os
+
+    name = os.path.basename(path).lower()
+    if name == ".env" or name.startswith(".env."):
+        return "env"
+
+    extension = os.path.splitext(name)[1]
+    for format_name, format_extension in CONVERT_FORMATS.items():
+        if extension == format_extension:
+            return format_name
+    if extension == ".cfg":
+        return "ini"
+
+    raise ValueError(f"Unknown format of {path}")
+
+
+# Get the name of a converted file. Env files are named by their dotfile name without the dot, like
+# ".env.production" -> "env.production.hfc", and back
+def _converted_name(path: str, output_format: str) -> str:
+    import os
+
+    name = os.path.basename(path)
+    if name.lower() == ".env" or name.lower().startswith(".env."):
+        stem = name[1:]
+    else:
+        stem = os.path.splitext(name)[0]
 
-    Returns
-    -------
-    list[dict[dict]]
-        The modified HFC list.
+    if output_format == "env" and (stem.lower() == "env" or stem.lower().startswith("env.")):
+        return f".{stem}"
 
-    Raises
-    ------
-    ValueError
-        If the section is not found in the HFC list or if the variable is not found in the section.
-    """
-    
-    list_rename = hfc_list
+    return stem + CONVERT_FORMATS[output_format]
 
-    # Look for section
-    if not _section_exists(list_rename, section_name):
-        raise ValueError(f"Section {section_name} not found in HFC list")
 
-    index = 0
-    for section in hfc_list:
-        if section_name in section.keys():
-            # Rename variable in section
-            if not _variable_exists(list_rename, section_name, old_variable_name):
-                raise ValueError(f"Variable {old_variable_name} not found in section {section_name}")
-            
-            list_rename[index][section_name][new_variable_name] = list_rename[index][section_name].pop(old_variable_name)
-            break
+# Record a value that couldn't be converted as it was
+def _fidelity(report: list, line_num, section_name: str, variable_name: str, type_name: str, change: str, message: str):
+    report.append({"line": line_num, "section": section_name, "variable": variable_name, "type": type_name, "change": change, "message": message})
 
-        index += 1
 
-    return list_rename
+# Get the value and type name of the text of an INI or env value
+def _infer_text_value(text: str) -> tuple:
+    if text == "":
+        return None, "void"
+    if re.fullmatch(r"-?\d+", text):
+        return int(text), "integer"
+    if re.fullmatch(r"-?\d+\.\d+", text):
+        return float(text), "float"
+    if text.lower() in _TEXT_BOOLEANS:
+        return _TEXT_BOOLEANS[text.lower()], "boolean"
 
+    return text, _special_type(text) or "string"
 
-# Edit a variable in a hfc list
-def editVariable(section_name: str, variable_name: str, new_variable_value, hfc_list: list[dict[dict]]):
+
+# Read the conversion events of a HFC file. Events are (line_num, section_name, variable_name, value,
+# type_name), with variable_name None on section starts, like _iter_hfc
+def _read_hfc_events(path: str, report: list, default_section: str):
+    for line_num, section_name, variable_name, value in _iter_hfc(_read_hfc_lines(hfc_path=path), includes=True):
+        if variable_name is None:
+            if value is not None:
+                _fidelity(report, line_num, section_name, None, "include", "dropped", f"Include of {value} is not followed")
+            else:
+                yield line_num, section_name, None, None, None
+        elif value is None:
+            yield line_num, section_name, variable_name, None, "void"
+        else:
+            yield line_num, section_name, variable_name, _get_converted(value, line_num), _classify_value(value)
+
+
+def _read_ini_events(path: str, report: list, default_section: str):
+    section_name = None
+    pending = None # [line_num, name, text], kept until its continuation lines are read
+
+    def variable(line_num, name, text):
+        return (line_num, section_name, name, *_infer_text_value(text.strip()))
+
+    with open(path, "r") as ini_file:
+        for line_num, line in enumerate(ini_file, start=1):
+            stripped = line.strip()
+
+            if stripped == "" or stripped[0] in "#;":
+                continue
+
+            # Indented lines continue the previous value
+            if line[0] in " \t" and pending is not None:
+                pending[2] += f"\n{stripped}"
+                continue
+
+            if pending is not None:
+                yield variable(*pending)
+                pending = None
+
+            section = re.fullmatch(r"\[(.+)\]", stripped)
+            if section:
+                section_name = section.group(1).strip()
+                yield line_num, section_name, None, None, None
+                continue
+
+            if section_name is None:
+                section_name = default_section
+                yield line_num, section_name, None, None, None
+
+            separator = re.search(r"[=:]", stripped)
+            if separator is None:
+                yield line_num, section_name, stripped, None, "void"
+            else:
+                pending = [line_num, stripped[:separator.start()].strip(), stripped[separator.end():]]
+
+    if pending is not None:
+        yield variable(*pending)
+
+
+def _read_env_events(path: str, report: list, default_section: str):
+    yield 0, default_section, None, None, None
+
+    with open(path, "r") as env_file:
+        for line_num, line in enumerate(env_file, start=1):
+            stripped = line.strip()
+
+            if stripped == "" or stripped.startswith("#"):
+                continue
+            if stripped.startswith("export "):
+                stripped = stripped[len("export "):].lstrip()
+
+            if "=" not in stripped:
+                _fidelity(report, line_num, default_section, stripped, None, "dropped", "Not a NAME=value line")
+                continue
+
+            name, text = stripped.split("=", 1)
+            text = text.strip()
+
+            if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+                value = text[1:-1]
+                if text[0] == '"':
+                    value = re.sub(r'\\([\\"$`n])', lambda escape: "\n" if escape.group(1) == "n" else escape.group(1), value)
+                yield line_num, default_section, name.strip(), value, _special_type(value) or "string"
+            else:
+                text = re.split(r"\s+#", text, maxsplit=1)[0] # Inline comment
+                yield line_num, default_section, name.strip(), *_infer_text_value(text)
+
+
+def _read_toml_events(path: str, report: list, default_section: str):
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib # Python older than 3.11
+
+    with open(path, "rb") as toml_file:
+        document = tomllib.load(toml_file)
+
+    def value_of(section_name, name, value):
+        if type(value) == dict or (type(value) == list and any(type(item) == dict for item in value)):
+            _fidelity(report, None, section_name, name, "table", "dropped", "Tables inside values have no HFC equivalent")
+            return None
+        if type(value) == list:
+            return [value_of(section_name, name, item) for item in value]
+        if type(value) not in [str, int, float, bool]:
+            _fidelity(report, None, section_name, name, type(value).__name__, "degraded", "Written as a string")
+            return value.isoformat()
+        return value
+
+    def type_of(value) -> str:
+        if type(value) == str:
+            return _special_type(value) or "string"
+        return {bool: "boolean", int: "integer", float: "float", list: "list"}[type(value)]
+
+    def table(section_name, variables):
+        scalars = {name: value for name, value in variables.items() if type(value) != dict}
+        if scalars or section_name != default_section:
+            yield None, section_name, None, None, None
+
+        for name, value in scalars.items():
+            value = value_of(section_name, name, value)
+            if value is not None:
+                yield None, section_name, name, value, type_of(value)
+
+        # Tables inside tables are sections with dotted names
+        for name, value in variables.items():
+            if type(value) == dict:
+                yield from table(name if section_name == default_section else f"{section_name}.{name}", value)
+
+    yield from table(default_section, document)
+
+
+# Get the HFC declaration of a value, or None if it doesn't read back as the same value
+def _hfc_declaration(variable_name: str, value, line_num):
+    def same(a, b) -> bool:
+        if type(a) == list and type(b) == list:
+            return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+        return type(a) == type(b) and a == b
+
+    try:
+        declaration = variable_name if value is None else f"{variable_name} = {_convert_to_hfc(value, ['[', ']'], 'false', 'true', '.')}"
+        parts = _split_declaration(declaration)
+
+        if parts[0] != variable_name:
+            return None
+        if value is None:
+            return declaration if len(parts) == 1 else None
+        if len(parts) == 2 and same(_get_converted(parts[1], line_num), value):
+            return declaration
+    except (SyntaxError, ValueError, TypeError, NotHFC):
+        pass
+
+    return None
+
+
+def _write_hfc_events(events, report: list, default_section: str):
+    for line_num, section_name, variable_name, value, type_name in events:
+        if variable_name is None:
+            yield f"\n== {section_name} ==\n\n"
+            continue
+
+        declaration = _hfc_declaration(variable_name, value, line_num)
+        if declaration is None and value is not None and type(value) != str:
+            # Values HFC can't write, like negative floats, are kept as text
+            declaration = _hfc_declaration(variable_name, str(value), line_num)
+            if declaration is not None:
+                _fidelity(report, line_num, section_name, variable_name, type_name, "degraded", "Written as a string")
+
+        if declaration is None:
+            _fidelity(report, line_num, section_name, variable_name, type_name, "dropped", "Can't be written as HFC")
+            continue
+
+        yield f"{declaration}\n"
+
+
+# Text of a scalar value in INI and env files
+def _plain_text(value) -> str:
+    if type(value) == bool:
+        return "true" if value else "false"
+    if value is None:
+        return ""
+    if type(value) == list:
+        return ", ".join(_plain_text(item) for item in value)
+    return str(value)
+
+
+def _write_ini_events(events, report: list, default_section: str):
+    for line_num, section_name, variable_name, value, type_name in events:
+        if variable_name is None:
+            yield f"\n[{section_name}]\n"
+            continue
+
+        if re.search(r"[=:]", variable_name) or variable_name.startswith("[") or variable_name[0] in "#;":
+            _fidelity(report, line_num, section_name, variable_name, type_name, "dropped", "Invalid INI name")
+            continue
+
+        if type_name in ["list"] or type_name in _SCHEMA_SPECIAL_TYPES:
+            _fidelity(report, line_num, section_name, variable_name, type_name, "degraded", "Written as a string")
+        elif type(value) == str and value != value.strip():
+            _fidelity(report, line_num, section_name, variable_name, type_name, "degraded", "Surrounding spaces are lost")
+
+        text = _plain_text(value).strip().replace("\n", "\n    ")
+        yield f"{variable_name} = {text}\n" if text else f"{variable_name} =\n"
+
+
+def _write_toml_events(events, report: list, default_section: str):
+    import json
+    import math
+
+    def key(name: str) -> str:
+        return name if re.fullmatch(r"[A-Za-z0-9_-]+", name) else json.dumps(name, ensure_ascii=False)
+
+    def text(value) -> str:
+        if type(value) == bool:
+            return "true" if value else "false"
+        if type(value) == int:
+            if not -2**63 <= value < 2**63:
+                raise OverflowError
+            return str(value)
+        if type(value) == float:
+            if math.isnan(value):
+                return "nan"
+            return ("inf" if value > 0 else "-inf") if math.isinf(value) else repr(value)
+        if type(value) == list:
+            return f"[{', '.join(text(item) for item in value)}]"
+        return json.dumps(value, ensure_ascii=False)
+
+    tables = set()
+    keys = None
+    first = True
+
+    for line_num, section_name, variable_name, value, type_name in events:
+        if variable_name is None:
+            if section_name in tables:
+                keys = None
+            else:
+                tables.add(section_name)
+                keys = set()
+                # Variables of the default section are top-level keys if it comes first
+                if not (first and section_name == default_section):
+                    yield f"\n[{'.'.join(key(part) for part in section_name.split('.'))}]\n"
+            first = False
+            continue
+
+        if keys is None or variable_name in keys:
+            _fidelity(report, line_num, section_name, variable_name, type_name, "dropped", "Repeated TOML key")
+            continue
+        if value is None:
+            _fidelity(report, line_num, section_name, variable_name, type_name, "dropped", "TOML has no void values")
+            continue
+
+        try:
+            value_text = text(value)
+        except OverflowError:
+            value_text = text(str(value))
+            _fidelity(report, line_num, section_name, variable_name, type_name, "degraded", "Integer larger than 64 bits written as a string")
+        else:
+            if type_name in _SCHEMA_SPECIAL_TYPES:
+                _fidelity(report, line_num, section_name, variable_name, type_name, "degraded", "Written as a string")
+
+        keys.add(variable_name)
+        yield f"{key(variable_name)} = {value_text}\n"
+
+
+def _write_env_events(events, report: list, default_section: str):
+    for line_num, section_name, variable_name, value, type_name in events:
+        if variable_name is None:
+            continue
+
+        # Variables of the default section keep their names, others are prefixed with the section name
+        name = variable_name if section_name == default_section else f"{section_name}_{variable_name}"
+        env_name = re.sub(r"\W", "_", name)
+        if env_name == "" or env_name[0].isdigit():
+            env_name = f"_{env_name}"
+
+        if env_name != name:
+            _fidelity(report, line_num, section_name, variable_name, type_name, "degraded", f"Written as {env_name}")
+        if type_name == "list" or type_name in _SCHEMA_SPECIAL_TYPES:
+            _fidelity(report, line_num, section_name, variable_name, type_name, "degraded", "Written as a string")
+
+        text = _plain_text(value)
+        if type(value) == str or type(value) == list:
+            text = '"' + re.sub(r'([\\"$`])', r"\\\1", text).replace("\n", "\\n") + '"'
+
+        yield f"{env_name}={text}\n"
+
+
+_CONVERT_READERS = {"hfc": _read_hfc_events, "ini": _read_ini_events, "toml": _read_toml_events, "env": _read_env_events}
+_CONVERT_WRITERS = {"hfc": _write_hfc_events, "ini": _write_ini_events, "toml": _write_toml_events, "env": _write_env_events}
+
+
+def convertFile(input_path: str, output_path="", output_format="", input_format="", default_section="default", fsync=None) -> dict:
     """
-    Edit a variable's value in a specified section of a HFC list.
+    Convert a file between HFC, INI, TOML and env formats.
+
+    Values are streamed from the reader to the writer one by one, without building a document. Values
+    that can't be written with their type are reported, like special types (ip_address, hex_color...)
+    written as plain strings, or dropped when the output format can't hold them.
 
     Parameters
     ----------
-    section_name : str
-        The name of the section where the variable will be edited.
-    variable_name : str
-        The name of the variable to be edited.
-    new_variable_value : any
-        The new value for the variable.
-    hfc_list : list[dict[dict]]
-        The HFC list to be modified.
+    input_path : str
+        The path to the file to convert.
+    output_path : str
+        The path to write to. If empty, it is input_path with the extension of output_format, where
+        env files are named without their leading dot (".env" -> "env.hfc" -> ".env").
+    output_format : str
+        "hfc", "ini", "toml" or "env". If empty, it comes from the extension of output_path, or is
+        "hfc" if the input is not.
+    input_format : str
+        The format of the input. If empty, it comes from the extension of input_path.
+    default_section : str
+        The section of env variables, TOML top-level keys and INI keys before any section. Its
+        variables are written without a section to TOML and env files.
+    fsync : str
+        The fsync policy of the output (see FSYNC_POLICIES). It is always replaced atomically.
 
     Returns
     -------
-    list[dict[dict]]
-        The modified HFC list.
+    dict
+        {"input", "output", "sections", "variables", "changes"}, where changes are the values that
+        were "degraded" or "dropped", as dicts with the keys "line" (None for TOML input), "section",
+        "variable", "type", "change" and "message".
 
     Raises
     ------
     ValueError
-        If the section is not found in the HFC list or if the variable is not found in the section.
+        If a format is unknown, or if neither output_format nor output_path are given for a HFC input.
+    SyntaxError
+        If a HFC input has invalid syntax.
     """
-    list_edit = hfc_list
+    import os
 
-    # Look for section
-    if not _section_exists(list_edit, section_name):
-        raise ValueError(f"Section {section_name} not found in HFC list")
-    
-    index = 0
-    for section in hfc_list:
-        if section_name in section.keys():
-            # Edit variable in section
-            if not _variable_exists(list_edit, section_name, variable_name):
-                raise ValueError(f"Variable {variable_name} not found in section {section_name}")
+    input_format = input_format or _convert_format(input_path)
+    if not output_format:
+        if output_path == "" and input_format == "hfc":
+            raise ValueError("output_format or output_path is needed to convert a HFC file")
+        output_format = _convert_format(output_path) if output_path else "hfc"
+    if input_format not in CONVERT_FORMATS or output_format not in CONVERT_FORMATS:
+        raise ValueError(f"Unknown format {input_format if input_format not in CONVERT_FORMATS else output_format}")
 
-            list_edit[index][section_name][variable_name] = new_variable_value
-            break
+    if output_path == "":
+        output_path = os.path.join(os.path.dirname(input_path), _converted_name(input_path, output_format))
 
-        index += 1
+    report = {"input": input_path, "output": output_path, "sections": 0, "variables": 0, "changes": []}
 
-    return list_edit
+    def counted(events):
+        for event in events:
+            report["sections" if event[2] is None else "variables"] += 1
+            yield event
 
+    events = counted(_CONVERT_READERS[input_format](input_path, report["changes"], default_section))
+    text = "".join(_CONVERT_WRITERS[output_format](events, report["changes"], default_section)).lstrip("\n")
 
-# Looks for section in hfc list
-def findSection(section_name: str, hfc_list: list[dict[dict]]):
-    """
-    Look for a section in a HFC list.
+    _write_atomic(output_path, text, fsync)
 
-    Parameters
-    ----------
-    section_name : str
-        The name of the section to be found.
-    hfc_list : list[dict[dict]]
-        The HFC list to be searched.
+    return report
 
-    Returns
-    -------
-    bool
-        False if is not found
-    dict
-        The section and its variables if is found
-    """
-    if not _section_exists(hfc_list, section_name):
-        return False
 
-    for i in hfc_list:
-        if section_name in i.keys():
-            return i[section_name]
-        
+# Convert one file for convertFiles
+def _convert_task(task: tuple) -> dict:
+    path, output_format, output_dir, input_format, default_section, fsync = task
+    output_path = ""
 
-# Find all occurrences of a variable in a hfc list
-def findVariable(variable_name: str, hfc_list: list[dict[dict]]):
+    if output_dir:
+        import os
+        output_path = os.path.join(output_dir, _converted_name(path, output_format))
+
+    try:
+        return {"ok": True, **convertFile(path, output_path, output_format, input_format, default_section, fsync)}
+    except Exception as e:
+        return {"ok": False, "input": path, "error": f"{type(e).__name__}: {e}"}
+
+
+def convertFiles(paths: list[str], output_format: str, input_format="hfc", output_dir="", default_section="default", jobs=None, fsync=None) -> list[dict]:
     """
-    Find all occurrences of a variable in a HFC list.
+    Convert many files in parallel worker processes (see convertFile).
 
     Parameters
     ----------
-    variable_name : str
-        The name of the variable to be found.
-    hfc_list : list[dict[dict]]
-        The HFC list to be searched.
+    paths : list[str]
+        Files, directories (searched recursively for files of input_format) and globs.
+    output_format : str
+        "hfc", "ini", "toml" or "env".
+    input_format : str
+        The format of the files.
+    output_dir : str
+        The directory of the converted files. If empty, each one is written next to its input.
+    default_section : str
+        Passed to convertFile().
+    jobs : int
+        Number of worker processes. If None, the number of CPUs.
+    fsync : str
+        Passed to convertFile().
 
     Returns
     -------
-    list
-        A list of all occurrences of the variable in the HFC list.
+    list[dict]
+        The report of each file (see convertFile()) with "ok": True, or {"ok": False, "input", "error"}
+        for the files that failed, in the order of the paths.
+
+    Raises
+    ------
+    ValueError
+        If a format is unknown.
     """
-    variables = []
-    for i in hfc_list:
-        for key, value in i.items():
-            if variable_name in value.keys():
-                variables.append({f"{key}": {variable_name: value[variable_name]}})
+    import multiprocessing
+    import os
 
-    return variables
+    if input_format not in CONVERT_FORMATS or output_format not in CONVERT_FORMATS:
+        raise ValueError(f"Unknown format {input_format if input_format not in CONVERT_FORMATS else output_format}")
 
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
 
-# Generate a ready-to-use hfc list
-def generateHFC():
-    """
-    Generate an empty HFC list.
+    tasks = [(path, output_format, output_dir, input_format, default_section, fsync) for path in _expand_paths(paths, CONVERT_FORMATS[input_format])]
+    jobs = jobs or os.cpu_count() or 1
 
-    Returns
-    -------
-    list[dict[dict]]
-        An empty HFC list.
-    """
-    return [{"": {}}]
+    if jobs <= 1 or len(tasks) <= 1:
+        return [_convert_task(task) for task in tasks]
+
+    with multiprocessing.Pool(min(jobs, len(tasks))) as pool:
+        return pool.map(_convert_task, tasks, chunksize=max(1, len(tasks) // (jobs * 8)))
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(cli())
@@ -0,0 +1,59 @@
+import array
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+TEXT = """== Data ==
+
+integers = [1, 2, -3]
+floats = [1.5, 2]
+mixed = [1, "a"]
+booleans = [true, 1]
+big = [123456789012345678901234567890, 1]
+"""
+
+
+class NumericArraysTest(unittest.TestCase):
+    def setUp(self):
+        self.hfc = hfclib.parseHfc(hfc_text=TEXT, numeric_arrays="array")
+
+    def test_numeric_lists_are_arrays(self):
+        self.assertEqual(hfclib.getVariableValue("Data", "integers", self.hfc), array.array("q", [1, 2, -3]))
+        self.assertEqual(hfclib.getVariableValue("Data", "floats", self.hfc), array.array("d", [1.5, 2.0]))
+
+    def test_other_lists_are_kept(self):
+        self.assertEqual(hfclib.getVariableValue("Data", "mixed", self.hfc), [1, "a"])
+        self.assertEqual(hfclib.getVariableValue("Data", "booleans", self.hfc), [True, 1])
+        self.assertEqual(hfclib.getVariableValue("Data", "big", self.hfc), [123456789012345678901234567890, 1])
+
+    def test_lists_without_the_option(self):
+        self.assertEqual(hfclib.getVariableValue("Data", "integers", hfclib.parseHfc(hfc_text=TEXT)), [1, 2, -3])
+
+    def test_arrays_are_written_back(self):
+        text = hfclib.parseList(self.hfc)
+
+        self.assertIn("integers = [1, 2, -3]\n", text)
+        self.assertIn("floats = [1.5, 2.0]\n", text)
+        self.assertEqual(hfclib.parseHfc(hfc_text=text, numeric_arrays="array"), self.hfc)
+
+    def test_numpy_falls_back_to_array(self):
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+        value = hfclib.getVariableValue("Data", "integers", hfclib.parseHfc(hfc_text=TEXT, numeric_arrays="numpy"))
+
+        if numpy is None:
+            self.assertEqual(value, array.array("q", [1, 2, -3]))
+        else:
+            self.assertEqual(value.tolist(), [1, 2, -3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+TEXT = """-> Service
+== Server ==
+
+name = "café"
+port = 80
+ports = [80, 443]
+"""
+
+
+class BytesTest(unittest.TestCase):
+    def test_buffers_parse_like_text(self):
+        expected = hfclib.parseHfc(hfc_text=TEXT)
+        data = TEXT.encode("utf-8")
+
+        for buffer in [data, bytearray(data), memoryview(data), io.BytesIO(data), b"\xef\xbb\xbf" + data]:
+            self.assertEqual(hfclib.parseHfc(hfc_bytes=buffer), expected)
+
+    def test_encoding(self):
+        hfc = hfclib.parseHfc(hfc_bytes=TEXT.encode("latin-1"), encoding="latin-1")
+
+        self.assertEqual(hfclib.getVariableValue("Server", "name", hfc), "café")
+
+    def test_invalid_values_report_their_line(self):
+        with self.assertRaises(SyntaxError) as context:
+            hfclib.parseHfc(hfc_bytes=b"== Server ==\n\nport = @@\n")
+
+        self.assertEqual(str(context.exception), "Invalid variable declaration at line 3.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+SERVICE = """-> Service settings
+@include "common.hfc"
+== Server ==
+   port=80   -> public port
+flag
+
+
+host  =  "example.org"
+enabled = no
+-> Logging goes last
+== Logging ==
+level = "info"
+"""
+
+FORMATTED = """-> Service settings
+@include "common.hfc"
+
+== Server ==
+
+port = 80 -> public port
+flag
+host = "example.org"
+enabled = false
+
+-> Logging goes last
+== Logging ==
+
+level = "info"
+"""
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "service.hfc")
+
+        with open(os.path.join(self.directory.name, "common.hfc"), "w") as common_file:
+            common_file.write("== Common ==\n\nregion = \"eu\"\n")
+        with open(self.path, "w") as hfc_file:
+            hfc_file.write(SERVICE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self) -> str:
+        with open(self.path, "r") as hfc_file:
+            return hfc_file.read()
+
+    # Run the tool and get its exit code and records, by path
+    def run_cli(self, *argv) -> tuple:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            code = hfclib.cli(list(argv) + ["-j", "1"])
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        return code, {os.path.basename(record["path"]): record for record in records}
+
+    def test_parse_directories(self):
+        code, records = self.run_cli("parse", self.directory.name)
+
+        self.assertEqual(code, 0)
+        self.assertEqual(sorted(records), ["common.hfc", "service.hfc"])
+        self.assertEqual(records["service.hfc"]["result"][0], {"Common": {"region": "eu"}})
+
+    def test_failed_files_set_the_exit_code(self):
+        with open(os.path.join(self.directory.name, "broken.hfc"), "w") as hfc_file:
+            hfc_file.write("x = 1\n")
+
+        code, records = self.run_cli("parse", self.directory.name)
+
+        self.assertEqual(code, 1)
+        self.assertFalse(records["broken.hfc"]["ok"])
+        self.assertIn("SyntaxError", records["broken.hfc"]["error"])
+        self.assertTrue(records["service.hfc"]["ok"])
+
+    def test_fmt_keeps_comments_and_includes(self):
+        code, records = self.run_cli("fmt", "--check", self.path)
+        self.assertEqual((code, records["service.hfc"]["changed"]), (0, True))
+        self.assertEqual(self.read(), SERVICE)
+
+        self.run_cli("fmt", self.path)
+        self.assertEqual(self.read(), FORMATTED)
+
+        code, records = self.run_cli("fmt", self.path)
+        self.assertFalse(records["service.hfc"]["changed"])
+
+    def test_fmt_keeps_the_values(self):
+        self.run_cli("fmt", self.path)
+
+        self.assertEqual(hfclib.getVariables("Server", hfclib.parseHfc(hfc_path=self.path)), {"port": 80, "flag": None, "host": "example.org", "enabled": False})
+
+    def test_json_round_trip(self):
+        output_dir = os.path.join(self.directory.name, "out")
+        code, records = self.run_cli("to-json", "-o", output_dir, self.path)
+        self.assertEqual(code, 0)
+
+        code, records = self.run_cli("from-json", output_dir)
+        self.assertEqual(code, 0)
+        self.assertEqual(hfclib.parseHfc(hfc_path=records["service.json"]["output"]), hfclib.parseHfc(hfc_path=self.path))
+
+    def test_bench(self):
+        code, records = self.run_cli("bench", "-n", "2", self.path)
+
+        self.assertEqual(code, 0)
+        self.assertEqual(records["service.hfc"]["variables"], 6)
+        self.assertLessEqual(records["service.hfc"]["best_seconds"], records["service.hfc"]["mean_seconds"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+DOCUMENT = """== Server ==
+
+port = 80
+ratio = 0.5
+host = "example.org"
+enabled = true
+flag
+ports = [80, 443, "x"]
+big = 123456789012345678901234567890
+
+== Logging ==
+
+level = "info"
+"""
+
+
+class CompactTest(unittest.TestCase):
+    def test_same_values_as_the_list(self):
+        hfc = hfclib.parseHfc(hfc_text=DOCUMENT)
+        compact = hfclib.parseCompact(hfc_text=DOCUMENT)
+
+        self.assertEqual(compact.getSections(), hfclib.getSections(hfc))
+        self.assertEqual(compact.getVariables("Server"), hfclib.getVariables("Server", hfc))
+        self.assertEqual(compact.getVariableValue("Logging", "level"), "info")
+        self.assertEqual(compact.findSection("Logging"), hfclib.findSection("Logging", hfc))
+        self.assertEqual(compact.findVariable("level"), hfclib.findVariable("level", hfc))
+        self.assertEqual(compact.toList(), hfc)
+
+    def test_from_list_round_trip(self):
+        hfc = hfclib.parseHfc(hfc_text=DOCUMENT)
+
+        self.assertEqual(hfclib.CompactHfc.fromList(hfc).toList(), hfc)
+
+    def test_reads_return_new_objects(self):
+        compact = hfclib.parseCompact(hfc_text=DOCUMENT)
+
+        compact.getVariables("Server")["port"] = 8080
+        compact.getVariableValue("Server", "ports").append(1)
+
+        self.assertEqual(compact.getVariableValue("Server", "port"), 80)
+        self.assertEqual(compact.getVariableValue("Server", "ports"), [80, 443, "x"])
+
+    def test_invalid_syntax(self):
+        with self.assertRaises(SyntaxError):
+            hfclib.parseCompact(hfc_text="== Server ==\n\nport = @@\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+class BuildConfigTest(unittest.TestCase):
+    def setUp(self):
+        self.hfc = hfclib.parseHfc(hfc_text='== Server ==\n\nport = 80\nuser name = "admin"\n\n== web-cache ==\n\nsize = 64\n')
+
+    def test_sections_are_attributes(self):
+        config = hfclib.buildConfig(self.hfc)
+
+        self.assertEqual(config.Server.port, 80)
+        self.assertEqual(config.Server.user_name, "admin")
+        self.assertEqual(config.web_cache.size, 64)
+        self.assertFalse(hasattr(config.Server, "__dict__"))
+
+    def test_config_is_frozen(self):
+        config = hfclib.buildConfig(self.hfc)
+
+        with self.assertRaises(AttributeError):
+            config.Server.port = 8080
+        with self.assertRaises(AttributeError):
+            config.Server = None
+
+    def test_schema_defaults_and_violations(self):
+        schema = hfclib.Schema().addVariable("Server", "workers", type=int, required=False, default=4)
+
+        self.assertEqual(hfclib.buildConfig(self.hfc, schema).Server.workers, 4)
+
+        schema.addVariable("Server", "host", type=str)
+        with self.assertRaises(hfclib.SchemaError):
+            hfclib.buildConfig(self.hfc, schema)
+
+    def test_clashing_names(self):
+        hfc = hfclib.parseHfc(hfc_text="== Server ==\n\nuser name = 1\nuser-name = 2\n")
+
+        with self.assertRaises(ValueError):
+            hfclib.buildConfig(hfc)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+class ConvertTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def test_env_file_is_named_without_its_dot(self):
+        path = self.write(".env", "PORT=80\nHOST=example.org\n")
+
+        report = hfclib.convertFile(path, output_format="hfc")
+
+        self.assertEqual(report["output"], os.path.join(self.directory.name, "env.hfc"))
+        self.assertEqual(hfclib.getVariables("default", hfclib.parseHfc(hfc_path=report["output"])), {"PORT": 80, "HOST": "example.org"})
+
+        back = hfclib.convertFile(report["output"], output_format="env")
+        self.assertEqual(back["output"], path)
+
+    def test_converted_names(self):
+        self.assertEqual(hfclib._converted_name("configs/.env.production", "hfc"), "env.production.hfc")
+        self.assertEqual(hfclib._converted_name("configs/env.production.hfc", "env"), ".env.production")
+        self.assertEqual(hfclib._converted_name("configs/app.hfc", "toml"), "app.toml")
+        self.assertEqual(hfclib._converted_name("configs/app.toml", "env"), "app.env")
+
+    def test_directories_include_dotfiles(self):
+        env = self.write("configs/.env", "PORT=80\n")
+        production = self.write("configs/deploy/.env.production", "PORT=443\n")
+        named = self.write("configs/app.env", "PORT=8080\n")
+        self.write("configs/app.hfc", "== Server ==\n\nport = 80\n")
+
+        self.assertEqual(hfclib._expand_paths([os.path.join(self.directory.name, "configs")], ".env"), sorted([env, production, named]))
+
+        output_dir = os.path.join(self.directory.name, "out")
+        reports = hfclib.convertFiles([os.path.join(self.directory.name, "configs")], "hfc", "env", output_dir=output_dir, jobs=1)
+
+        self.assertTrue(all(report["ok"] for report in reports))
+        self.assertEqual(sorted(os.listdir(output_dir)), ["app.hfc", "env.hfc", "env.production.hfc"])
+
+    def test_degraded_values_are_reported(self):
+        path = self.write("app.hfc", "== default ==\n\naddress = 10.0.0.1\nflag\n")
+
+        report = hfclib.convertFile(path, output_format="toml")
+
+        self.assertEqual([change["change"] for change in report["changes"]], ["degraded", "dropped"])
+        self.assertEqual(report["output"], os.path.join(self.directory.name, "app.toml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
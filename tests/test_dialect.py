@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+class DialectTest(unittest.TestCase):
+    def test_default_dialect_parses_like_langconf(self):
+        text = '-> comment\n== Server ==\n\nport = 80\nenabled = yes\nports = [80, 443]\n'
+
+        self.assertEqual(hfclib.parseHfc(hfc_text=text, dialect=hfclib.compileDialect()), hfclib.parseHfc(hfc_text=text))
+
+    def test_overrides(self):
+        dialect = hfclib.compileDialect(COMMENT_CHARS=["#"], BOOLEAN_TRUE=["on"], BOOLEAN_FALSE=["off"], SECTION_SEPARATOR="##")
+        text = "# comment\n## Server ##\n\nenabled = on\ndebug = off\n"
+
+        hfc = hfclib.parseHfc(hfc_text=text, dialect=dialect)
+
+        self.assertEqual(hfc, [{"Server": {"enabled": True, "debug": False}}])
+        self.assertEqual(hfclib.parseHfc(hfc_text=hfclib.parseList(hfc, bool_false="off", bool_true="on", dialect=dialect), dialect=dialect), hfc)
+        self.assertEqual(hfclib.parseCompact(hfc_text=text, dialect=dialect).toList(), hfc)
+
+    def test_dialects_are_cached_and_frozen(self):
+        dialect = hfclib.compileDialect({"COMMENT_CHARS": ["#"]})
+
+        self.assertIs(hfclib.compileDialect(COMMENT_CHARS=["#"]), dialect)
+        with self.assertRaises(AttributeError):
+            dialect.COMMENT_CHARS = ["//"]
+
+    def test_unknown_setting(self):
+        with self.assertRaises(ValueError):
+            hfclib.compileDialect(COMMENT_CHAR="#")
+
+
+if __name__ == "__main__":
+    unittest.main()
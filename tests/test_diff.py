@@ -0,0 +1,91 @@
+import array
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+OLD = """== Server ==
+
+port = 80
+host = "example.org"
+tags = [1, 2]
+
+== Logging ==
+
+level = "info"
+"""
+
+
+class DiffHfcTest(unittest.TestCase):
+    def test_equal_documents(self):
+        self.assertEqual(hfclib.diffHfc(hfclib.parseHfc(hfc_text=OLD), hfclib.parseHfc(hfc_text=OLD)), [])
+
+    def test_changed_added_and_removed(self):
+        new = OLD.replace("port = 80", "port = 8080").replace("host = \"example.org\"\n", "workers = 4\n").replace("== Logging ==\n\nlevel = \"info\"\n", "== Cache ==\n\nsize = 64\n")
+        changes = hfclib.diffHfc(hfclib.parseHfc(hfc_text=OLD), hfclib.parseHfc(hfc_text=new))
+
+        self.assertEqual(changes, [
+            {"change": "changed", "section": "Server", "variable": "port", "old": 80, "new": 8080},
+            {"change": "removed", "section": "Server", "variable": "host", "old": "example.org", "new": None},
+            {"change": "added", "section": "Server", "variable": "workers", "old": None, "new": 4},
+            {"change": "removed", "section": "Logging", "variable": None, "old": {"level": "info"}, "new": None},
+            {"change": "added", "section": "Cache", "variable": None, "old": None, "new": {"size": 64}},
+        ])
+
+    def test_types_are_compared(self):
+        for old, new in [(1, True), (1, 1.0), ([1, 2], [True, 2]), ([1, [2]], [1, [2.0]]), (array.array("q", [1]), array.array("d", [1.0]))]:
+            changes = hfclib.diffHfc([{"Server": {"value": old}}], [{"Server": {"value": new}}])
+            self.assertEqual(len(changes), 1, (old, new))
+
+        self.assertEqual(hfclib.diffHfc([{"Server": {"value": array.array("q", [1])}}], [{"Server": {"value": array.array("q", [1])}}]), [])
+
+    def test_nested_list_types_in_parsed_documents(self):
+        old = hfclib.parseHfc(hfc_text="== Server ==\n\ntags = [1, 2]\n")
+        new = hfclib.parseHfc(hfc_text="== Server ==\n\ntags = [true, 2]\n")
+
+        self.assertEqual(hfclib.diffHfc(old, new), [{"change": "changed", "section": "Server", "variable": "tags", "old": [1, 2], "new": [True, 2]}])
+
+    def test_section_digests_follow_changes(self):
+        old = hfclib.parseHfc(hfc_text=OLD)
+        new = hfclib.parseHfc(hfc_text=OLD)
+
+        self.assertEqual(hfclib.diffHfc(old, new), [])
+
+        # The digest cached by the first diff isn't used after a change
+        new[1]["Logging"]["level"] = "debug"
+        self.assertEqual(hfclib.diffHfc(old, new), [{"change": "changed", "section": "Logging", "variable": "level", "old": "info", "new": "debug"}])
+
+        new[1]["Logging"]["level"] = "info"
+        self.assertEqual(hfclib.diffHfc(old, new), [])
+
+        # List values can change in place, so their sections are compared every time
+        new[0]["Server"]["tags"].append(3)
+        self.assertEqual(len(hfclib.diffHfc(old, new)), 1)
+
+    def test_repeated_sections_are_merged(self):
+        old = hfclib.parseHfc(hfc_text="== Server ==\nport = 80\n== Server ==\nhost = \"a\"\n")
+        new = hfclib.parseHfc(hfc_text="== Server ==\nport = 80\nhost = \"a\"\n")
+
+        self.assertEqual(hfclib.diffHfc(old, new), [])
+
+    def test_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            old_path = os.path.join(directory, "old.hfc")
+            new_path = os.path.join(directory, "new.hfc")
+
+            with open(old_path, "w") as hfc_file:
+                hfc_file.write(OLD)
+            with open(new_path, "w") as hfc_file:
+                hfc_file.write(OLD.replace("\"info\"", "\"debug\""))
+
+            self.assertEqual(hfclib.diffHfc(old_path, old_path), [])
+            self.assertEqual(hfclib.diffHfc(old_path, new_path), [{"change": "changed", "section": "Logging", "variable": "level", "old": "info", "new": "debug"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
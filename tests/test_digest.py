@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+GOLDEN = """== Server ==
+
+port = 80
+enabled = true
+
+== Logging ==
+
+level = "info"
+"""
+
+
+class DigestTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as hfc_file:
+            hfc_file.write(text)
+        return path
+
+    def test_equivalent_spellings_have_the_same_digest(self):
+        other = "-> comment\n== Server ==\nenabled=yes\nport   =  80\n== Logging ==\nlevel = \"info\"\n"
+
+        self.assertEqual(hfclib.digestHfc(hfc_text=GOLDEN)["document"], hfclib.digestHfc(hfc_text=other)["document"])
+
+    def test_section_digests(self):
+        a = hfclib.digestHfc(hfc_text=GOLDEN)
+        b = hfclib.digestHfc(hfc_text=GOLDEN.replace('"info"', '"debug"'))
+
+        self.assertNotEqual(a["document"], b["document"])
+        self.assertEqual(a["sections"]["Server"], b["sections"]["Server"])
+        self.assertNotEqual(a["sections"]["Logging"], b["sections"]["Logging"])
+
+    def test_included_files_change_the_digest(self):
+        self.write("common.hfc", "== Common ==\n\nregion = \"eu\"\n")
+        path = self.write("service.hfc", '@include "common.hfc"\n' + GOLDEN)
+
+        before = hfclib.digestHfc(hfc_path=path)
+        self.write("common.hfc", "== Common ==\n\nregion = \"us\"\n")
+        after = hfclib.digestHfc(hfc_path=path)
+
+        self.assertEqual(before["includes"], [os.path.join(self.directory.name, "common.hfc")])
+        self.assertNotEqual(before["sections"]["Common"], after["sections"]["Common"])
+
+    def test_manifest(self):
+        path = self.write("a.hfc", GOLDEN)
+        broken = os.path.join(self.directory.name, "missing.hfc")
+        manifest_path = os.path.join(self.directory.name, "manifest.json")
+
+        digests = hfclib.buildDigestManifest([path, broken], manifest_path)
+
+        self.assertEqual(digests[os.path.abspath(path)]["document"], hfclib.digestHfc(hfc_path=path)["document"])
+        self.assertIn("error", digests[os.path.abspath(broken)])
+        with open(manifest_path) as manifest_file:
+            self.assertIn(os.path.abspath(path), json.load(manifest_file))
+
+        self.write("a.hfc", GOLDEN.replace("80", "8080"))
+        os.utime(path, (1, 1))
+        digests = hfclib.buildDigestManifest([path], manifest_path)
+
+        self.assertEqual(digests[os.path.abspath(path)]["document"], hfclib.digestHfc(hfc_path=path)["document"])
+
+    def test_scan_drift(self):
+        golden = self.write("golden.hfc", GOLDEN)
+        same = self.write("same.hfc", GOLDEN.replace("true", "yes"))
+        drifted = self.write("drifted.hfc", GOLDEN.replace('"info"', '"debug"'))
+        broken = self.write("broken.hfc", "== Server ==\n\nport = @@\n")
+
+        report = hfclib.scanDrift(golden, [same, drifted, broken])
+
+        self.assertEqual([entry["path"] for entry in report if "error" not in entry], [drifted])
+        self.assertEqual(report[0]["sections"], ["Logging"])
+        self.assertEqual([entry["path"] for entry in report if "error" in entry], [broken])
+
+
+if __name__ == "__main__":
+    unittest.main()
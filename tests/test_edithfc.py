@@ -0,0 +1,134 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+SERVICE = """-> Service settings
+@include "common.hfc"
+
+== Server ==
+
+port = 80 -> public port
+flag
+host = "example.org"
+
+== Logging ==
+
+level = "info"
+"""
+
+
+class EditHfcTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "service.hfc")
+
+        with open(os.path.join(self.directory.name, "common.hfc"), "w") as common_file:
+            common_file.write("== Common ==\n\nregion = \"eu\"\n")
+        with open(self.path, "w") as hfc_file:
+            hfc_file.write(SERVICE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self) -> str:
+        with open(self.path, "r") as hfc_file:
+            return hfc_file.read()
+
+    def test_unchanged_document_keeps_the_file(self):
+        hfclib.editHfc(self.path, lambda hfc: None)
+
+        self.assertEqual(self.read(), SERVICE)
+
+    def test_concurrent_edits_are_merged_into_the_text(self):
+        calls = []
+
+        def edit(hfc):
+            calls.append(len(calls))
+            hfclib.editVariable("Server", "port", 8080, hfc)
+
+            # Another editor changes the file while this one holds no lock
+            if len(calls) == 1:
+                hfclib.editHfc(self.path, lambda other: hfclib.editVariable("Logging", "level", "debug", other))
+
+        document = hfclib.editHfc(self.path, edit)
+
+        self.assertEqual(calls, [0])
+        self.assertEqual(self.read(), SERVICE.replace("port = 80 ", "port = 8080 ").replace('"info"', '"debug"'))
+        self.assertEqual(hfclib.getVariableValue("Server", "port", document), 8080)
+
+        parsed = hfclib.parseHfc(hfc_path=self.path)
+        self.assertEqual(hfclib.getVariables("Server", parsed), {"port": 8080, "flag": None, "host": "example.org"})
+        self.assertEqual(hfclib.getVariableValue("Logging", "level", parsed), "debug")
+        self.assertEqual(hfclib.getVariableValue("Common", "region", parsed), "eu")
+
+    def test_conflicting_edit_runs_again(self):
+        calls = []
+
+        def edit(hfc):
+            calls.append(len(calls))
+            hfclib.editVariable("Server", "port", 8080, hfc)
+
+            if len(calls) == 1:
+                hfclib.editHfc(self.path, lambda other: hfclib.editVariable("Server", "port", 9090, other))
+
+        hfclib.editHfc(self.path, edit)
+
+        self.assertEqual(calls, [0, 1])
+        self.assertIn("port = 8080 -> public port\nflag\n", self.read())
+
+    def test_added_and_removed_sections(self):
+        def edit(hfc):
+            hfc[:] = [section for section in hfc if "Logging" not in section]
+            hfclib.addSection("Cache", hfc)
+            hfclib.addVariable("Cache", "size", 64, hfc)
+
+        hfclib.editHfc(self.path, edit)
+        text = self.read()
+
+        self.assertNotIn("Logging", text)
+        self.assertTrue(text.startswith('-> Service settings\n@include "common.hfc"\n'))
+        self.assertTrue(text.endswith("== Cache ==\n\nsize = 64\n"))
+        self.assertEqual(hfclib.getSections(hfclib.parseHfc(hfc_path=self.path)), ["Common", "Server", "Cache"])
+
+    def test_conflicts_raise_after_the_retries(self):
+        calls = []
+
+        def edit(hfc):
+            calls.append(len(calls))
+            hfclib.editVariable("Server", "port", 8080, hfc)
+            hfclib.editHfc(self.path, lambda other: hfclib.editVariable("Server", "port", 9000 + len(calls), other))
+
+        with self.assertRaises(hfclib.HfcConflict) as context:
+            hfclib.editHfc(self.path, edit, retries=1)
+
+        self.assertEqual(calls, [0, 1])
+        self.assertEqual(context.exception.conflicts[0]["section"], "Server")
+        self.assertEqual(context.exception.conflicts[0]["variable"], "port")
+
+    def test_invalid_values_write_nothing(self):
+        with self.assertRaises(SyntaxError):
+            hfclib.editHfc(self.path, lambda hfc: hfclib.editVariable("Server", "host", "a = b", hfc))
+
+        self.assertEqual(self.read(), SERVICE)
+
+    def test_exclusive_lock_blocks_other_locks(self):
+        with hfclib.HfcLock(self.path):
+            with hfclib.HfcLock(self.path, timeout=0.1):
+                pass
+
+            with self.assertRaises(TimeoutError):
+                hfclib.HfcLock(self.path, exclusive=True, timeout=0.1).acquire()
+
+        with hfclib.HfcLock(self.path, exclusive=True):
+            with self.assertRaises(TimeoutError):
+                hfclib.editHfc(self.path, lambda hfc: None, timeout=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import array
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+class IncludeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.write("common.hfc", "== Common ==\n\nregion = \"eu\"\nsizes = [1, 2, 3]\n")
+        self.write("service.hfc", "@include \"common.hfc\"\n\n== Server ==\n\nport = 80\n")
+        hfclib.clearIncludeCache()
+
+    def tearDown(self):
+        hfclib.clearIncludeCache()
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def write(self, name: str, text: str):
+        with open(self.path(name), "w") as hfc_file:
+            hfc_file.write(text)
+
+    def test_included_sections_are_composed_in_place(self):
+        parsed = hfclib.parseHfc(hfc_path=self.path("service.hfc"))
+
+        self.assertEqual(hfclib.getSections(parsed), ["Common", "Server"])
+        self.assertEqual(hfclib.getVariableValue("Common", "region", parsed), "eu")
+
+    def test_changed_include_is_parsed_again(self):
+        hfclib.parseHfc(hfc_path=self.path("service.hfc"))
+        self.write("common.hfc", "== Common ==\n\nregion = \"us-east\"\n")
+
+        self.assertEqual(hfclib.getVariableValue("Common", "region", hfclib.parseHfc(hfc_path=self.path("service.hfc"))), "us-east")
+
+    def test_included_values_are_copied(self):
+        first = hfclib.parseHfc(hfc_path=self.path("service.hfc"))
+        hfclib.getVariableValue("Common", "sizes", first).append(4)
+
+        second = hfclib.parseHfc(hfc_path=self.path("service.hfc"))
+        self.assertEqual(hfclib.getVariableValue("Common", "sizes", second), [1, 2, 3])
+
+    def test_includes_use_the_parse_options(self):
+        lazy = hfclib.parseHfc(hfc_path=self.path("service.hfc"), lazy=True)
+        self.assertIsInstance(lazy[0]["Common"], hfclib.LazySection)
+        self.assertEqual(lazy[0]["Common"]["region"], "eu")
+
+        arrays = hfclib.parseHfc(hfc_path=self.path("service.hfc"), numeric_arrays="array")
+        self.assertEqual(hfclib.getVariableValue("Common", "sizes", arrays), array.array("q", [1, 2, 3]))
+
+        plain = hfclib.parseHfc(hfc_path=self.path("service.hfc"))
+        self.assertEqual(type(hfclib.getVariableValue("Common", "sizes", plain)), list)
+
+    def test_cycles_are_detected(self):
+        self.write("a.hfc", "@include \"b.hfc\"\n== A ==\nx = 1\n")
+        self.write("b.hfc", "@include \"a.hfc\"\n== B ==\ny = 2\n")
+        self.write("self.hfc", "@include \"self.hfc\"\n")
+
+        for name in ["a.hfc", "self.hfc"]:
+            with self.assertRaises(hfclib.IncludeCycle):
+                hfclib.parseHfc(hfc_path=self.path(name))
+            with self.assertRaises(hfclib.IncludeCycle):
+                hfclib.parseCompact(hfc_path=self.path(name))
+
+    def test_compact_documents_resolve_includes(self):
+        compact = hfclib.parseCompact(hfc_path=self.path("service.hfc"))
+
+        self.assertEqual(compact.getSections(), ["Common", "Server"])
+        self.assertEqual(compact.getVariableValue("Common", "sizes"), [1, 2, 3])
+        self.assertEqual(compact.toList(), hfclib.parseHfc(hfc_path=self.path("service.hfc")))
+
+    def test_published_documents_resolve_includes(self):
+        publisher = hfclib.HfcPublisher(f"hfclib-include-{os.getpid()}")
+        try:
+            publisher.publish(hfc_path=self.path("service.hfc"))
+            attached = hfclib.attachHfc(publisher.name)
+
+            self.assertEqual(attached.getVariableValue("Common", "region"), "eu")
+            attached.close()
+        finally:
+            publisher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
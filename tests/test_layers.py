@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+BASE = """== Server ==
+
+port = 80
+host = "example.org"
+workers = 4
+tags = [1, 2]
+
+== Logging ==
+
+level = "info"
+"""
+
+HOST = """== Server ==
+
+port = 8080
+
+== Cache ==
+
+size = 64
+"""
+
+
+class HfcLayersTest(unittest.TestCase):
+    def setUp(self):
+        self.layers = hfclib.HfcLayers([hfclib.parseHfc(hfc_text=BASE), hfclib.parseHfc(hfc_text=HOST)])
+
+    def test_later_layers_take_precedence(self):
+        self.assertEqual(self.layers.getVariableValue("Server", "port"), 8080)
+        self.assertEqual(self.layers.getVariableValue("Server", "host"), "example.org")
+        self.assertEqual(self.layers.source("Server", "port"), 1)
+        self.assertEqual(self.layers.source("Server", "host"), 0)
+        self.assertEqual(self.layers.getSections(), ["Server", "Logging", "Cache"])
+
+    def test_variables_keep_declaration_order(self):
+        self.assertEqual(list(self.layers.getVariables("Server")), ["port", "host", "workers", "tags"])
+
+        # The order doesn't depend on the hash seed
+        code = f"import hfclib; layers = hfclib.HfcLayers([hfclib.parseHfc(hfc_text={BASE!r}), hfclib.parseHfc(hfc_text={HOST!r})]); print(list(layers.getVariables('Server')))"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        outputs = set()
+        for seed in ("1", "2", "3"):
+            environment = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=root)
+            outputs.add(subprocess.run([sys.executable, "-c", code], env=environment, capture_output=True, text=True, check=True).stdout)
+
+        self.assertEqual(outputs, {"['port', 'host', 'workers', 'tags']\n"})
+
+    def test_unchanged_layer_recomputes_nothing(self):
+        self.assertEqual(self.layers.setLayer(0, hfclib.parseHfc(hfc_text=BASE)), 0)
+
+    def test_changed_layer_recomputes_changed_keys(self):
+        changed = BASE.replace("workers = 4", "workers = 8").replace("tags = [1, 2]", "tags = [true, 2]")
+
+        self.assertEqual(self.layers.setLayer(0, hfclib.parseHfc(hfc_text=changed)), 2)
+        self.assertEqual(self.layers.getVariableValue("Server", "workers"), 8)
+        self.assertEqual(self.layers.getVariableValue("Server", "tags"), [True, 2])
+
+    def test_removed_sections_and_overridden_keys(self):
+        self.assertEqual(self.layers.setLayer(1, hfclib.parseHfc(hfc_text="== Server ==\n\nport = 9090\n")), 2)
+        self.assertEqual(self.layers.getSections(), ["Server", "Logging"])
+
+        # port is overridden by the new top layer, so changing it in the base recomputes nothing
+        self.layers.addLayer(hfclib.parseHfc(hfc_text="== Server ==\n\nport = 1\n"))
+        self.assertEqual(self.layers.setLayer(0, hfclib.parseHfc(hfc_text=BASE.replace("port = 80", "port = 81"))), 0)
+        self.assertEqual(self.layers.getVariableValue("Server", "port"), 1)
+
+        with self.assertRaises(ValueError):
+            self.layers.getVariables("Cache")
+
+
+if __name__ == "__main__":
+    unittest.main()
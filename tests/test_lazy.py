@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+TEXT = """== Server ==
+
+port = 80
+bad = @@
+ports = [80, 443]
+
+== Logging ==
+
+level = "info"
+"""
+
+
+class LazyTest(unittest.TestCase):
+    def test_values_are_converted_when_read(self):
+        hfc = hfclib.parseHfc(hfc_text=TEXT, lazy=True)
+        server = hfclib.findSection("Server", hfc)
+
+        self.assertIsInstance(server, hfclib.LazySection)
+        self.assertIsInstance(dict.__getitem__(server, "port"), hfclib._RawValue)
+        self.assertEqual(hfclib.getVariableValue("Server", "port", hfc), 80)
+        self.assertEqual(dict.__getitem__(server, "port"), 80)
+        self.assertEqual(hfclib.getVariables("Logging", hfc), {"level": "info"})
+
+    def test_invalid_values_raise_when_read(self):
+        hfc = hfclib.parseHfc(hfc_text=TEXT, lazy=True)
+
+        with self.assertRaises(SyntaxError):
+            hfclib.getVariableValue("Server", "bad", hfc)
+
+    def test_resolve_collects_the_errors(self):
+        hfc = hfclib.parseHfc(hfc_text=TEXT, lazy=True)
+
+        self.assertEqual([line for line, _ in hfclib.resolveHfc(hfc, fail_fast=False)], [4])
+        with self.assertRaises(SyntaxError):
+            hfclib.resolveHfc(hfc)
+
+    def test_same_document_as_eager_parsing(self):
+        text = TEXT.replace("bad = @@\n", "")
+
+        self.assertEqual(hfclib.parseHfc(hfc_text=text, lazy=True), hfclib.parseHfc(hfc_text=text))
+
+    def test_schema_is_not_accepted(self):
+        with self.assertRaises(ValueError):
+            hfclib.parseHfc(hfc_text=TEXT, lazy=True, schema=hfclib.Schema())
+
+
+if __name__ == "__main__":
+    unittest.main()
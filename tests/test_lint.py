@@ -0,0 +1,70 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+class LintHfcTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as hfc_file:
+            hfc_file.write(text)
+        return path
+
+    def test_valid_text(self):
+        self.assertEqual(hfclib.lintHfc(hfc_text="== Server ==\n\nport = 80\nflag\nhosts = [\"a\", \"b\"]\n"), [])
+
+    def test_every_error_is_reported(self):
+        diagnostics = hfclib.lintHfc(hfc_text="orphan = 1\n== Server ==\nport = 80\nvalue = @@\nlist = [1, [2]\n")
+
+        self.assertEqual([(diagnostic["line"], diagnostic["code"]) for diagnostic in diagnostics], [(1, "HFC002"), (4, "HFC004"), (5, "HFC005")])
+        self.assertEqual(diagnostics[0]["column"], 1)
+
+    def test_include_at_the_top_of_the_file(self):
+        self.write("common.hfc", "== Common ==\n\nregion = \"eu\"\n")
+        path = self.write("service.hfc", "@include \"common.hfc\"\n\n== Server ==\n\nport = 80\n")
+
+        self.assertEqual(hfclib.lintHfc(hfc_path=path), [])
+        self.assertEqual(hfclib.lintHfc(hfc_path=path, lint_includes=True), [])
+
+    def test_missing_includes_and_cycles(self):
+        path = self.write("service.hfc", "@include \"missing.hfc\"\n@include \"service.hfc\"\n")
+
+        self.assertEqual([diagnostic["code"] for diagnostic in hfclib.lintHfc(hfc_path=path)], ["HFC006", "HFC007"])
+
+    def test_included_files_are_linted(self):
+        common = self.write("common.hfc", "== Common ==\n\nregion = @@\n")
+        path = self.write("service.hfc", "@include \"common.hfc\"\n\n== Server ==\n\nport = 80\n")
+
+        self.assertEqual(hfclib.lintHfc(hfc_path=path), [])
+        self.assertEqual(hfclib.lintHfc(hfc_path=path, lint_includes=True), [
+            {"line": 3, "column": 10, "code": "HFC004", "message": "Invalid variable declaration at line 3.", "path": common},
+        ])
+
+    def test_cli_validate_accepts_includes(self):
+        self.write("common.hfc", "== Common ==\n\nregion = \"eu\"\n")
+        path = self.write("service.hfc", "@include \"common.hfc\"\n\n== Server ==\n\nport = 80\n")
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            code = hfclib.cli(["validate", path, "-j", "1"])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(output.getvalue()), {"path": path, "ok": True, "diagnostics": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+TEXT = """== Server ==
+
+port = 80
+hosts = ["a"]
+
+== Logging ==
+
+level = "info"
+"""
+
+
+class MemoTest(unittest.TestCase):
+    def setUp(self):
+        self.document = hfclib.parseHfc(hfc_text=TEXT)
+
+    def test_results_are_memoized(self):
+        self.assertEqual(hfclib.getVariableValue("Server", "port", self.document), 80)
+        self.assertEqual(len(self.document._memo), 1)
+        self.assertEqual(hfclib.getVariableValue("Server", "port", self.document), 80)
+        self.assertEqual(len(self.document._memo), 1)
+
+    def test_module_functions_bump_the_version(self):
+        self.assertEqual(hfclib.getVariableValue("Server", "port", self.document), 80)
+        version = self.document.version
+
+        hfclib.editVariable("Server", "port", 8080, self.document)
+        self.assertGreater(self.document.version, version)
+        self.assertEqual(hfclib.getVariableValue("Server", "port", self.document), 8080)
+
+    def test_direct_edits_are_noticed(self):
+        self.assertEqual(hfclib.getVariableValue("Server", "port", self.document), 80)
+        self.assertEqual(hfclib.findVariable("port", self.document), [{"Server": {"port": 80}}])
+
+        self.document[0]["Server"]["port"] = 5
+        self.assertEqual(hfclib.getVariableValue("Server", "port", self.document), 5)
+        self.assertEqual(hfclib.findVariable("port", self.document), [{"Server": {"port": 5}}])
+
+        hfclib.getVariables("Server", self.document)["port"] = 7
+        self.assertEqual(hfclib.getVariableValue("Server", "port", self.document), 7)
+
+        del self.document[0]["Server"]["port"]
+        with self.assertRaises(ValueError):
+            hfclib.getVariableValue("Server", "port", self.document)
+
+    def test_other_sections_keep_their_results(self):
+        hfclib.getVariableValue("Logging", "level", self.document)
+        self.document[0]["Server"]["port"] = 5
+
+        self.assertEqual(self.document._memoized(None, ("getVariableValue", ("Logging", "level")), (), {}, "section", "Logging"), "info")
+
+    def test_returned_values_are_the_document_values(self):
+        hfclib.getVariableValue("Server", "hosts", self.document).append("b")
+        self.assertEqual(self.document[0]["Server"]["hosts"], ["a", "b"])
+        self.assertEqual(hfclib.getVariableValue("Server", "hosts", self.document), ["a", "b"])
+
+        self.assertIs(hfclib.getVariables("Server", self.document), self.document[0]["Server"])
+
+    def test_built_lists_are_copies(self):
+        hfclib.getSections(self.document).append("Other")
+        self.assertEqual(hfclib.getSections(self.document), ["Server", "Logging"])
+
+    def test_list_methods_bump_the_version(self):
+        self.assertEqual(hfclib.getSections(self.document), ["Server", "Logging"])
+
+        self.document.append({"Cache": hfclib.HfcSection(size=64)})
+        self.assertEqual(hfclib.getSections(self.document), ["Server", "Logging", "Cache"])
+
+        del self.document[0]
+        self.assertEqual(hfclib.getSections(self.document), ["Logging", "Cache"])
+
+    def test_plain_sections_are_not_memoized(self):
+        self.document.append({"Plain": {"x": 1}})
+        self.assertEqual(hfclib.getVariableValue("Plain", "x", self.document), 1)
+
+        self.document[-1]["Plain"]["x"] = 2
+        self.assertEqual(hfclib.getVariableValue("Plain", "x", self.document), 2)
+
+    def test_pickled_documents_keep_their_version(self):
+        hfclib.editVariable("Server", "port", 8080, self.document)
+        copy = pickle.loads(pickle.dumps(self.document))
+
+        self.assertIsInstance(copy, hfclib.HfcDocument)
+        self.assertEqual(copy.version, self.document.version)
+        self.assertEqual(hfclib.getVariableValue("Server", "port", copy), 8080)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+TEXT = """== Server ==
+
+port = 80
+flag
+
+== Logging ==
+
+level = "info"
+
+== Ports ==
+
+ports = [80, 443]
+"""
+
+
+class RenderCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.document = hfclib.HfcDocument(hfclib.parseHfc(hfc_text=TEXT))
+        self.text = hfclib.parseList(self.document)
+
+    def test_sections_are_cached(self):
+        self.assertEqual(len(self.document._render_cache), 2)
+        self.assertEqual(hfclib.parseList(self.document), self.text)
+        self.assertEqual(hfclib.parseList(self.document), hfclib.parseList(list(self.document)))
+
+    def test_changes_render_again(self):
+        hfclib.editVariable("Server", "port", 8080, self.document)
+        self.assertEqual(hfclib.parseList(self.document), self.text.replace("port = 80", "port = 8080"))
+
+        hfclib.findSection("Logging", self.document)["level"] = "debug"
+        self.assertIn('level = "debug"', hfclib.parseList(self.document))
+
+    def test_lists_are_not_cached(self):
+        hfclib.getVariableValue("Ports", "ports", self.document).append(8080)
+
+        self.assertIn("ports = [80, 443, 8080]", hfclib.parseList(self.document))
+
+    def test_options_render_again(self):
+        self.assertEqual(hfclib.parseList(self.document, spacing=False), hfclib.parseList(list(self.document), spacing=False))
+
+    def test_removed_sections_leave_the_cache(self):
+        del self.document[1]
+        hfclib.parseList(self.document)
+
+        self.assertEqual(len(self.document._render_cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+SERVER = """== Server ==
+
+ip = 10.0.0.1
+port = 99999
+mode = "fast"
+"""
+
+
+class SchemaTest(unittest.TestCase):
+    def setUp(self):
+        self.schema = hfclib.Schema()
+        self.schema.addVariable("Server", "ip", type="ip_address")
+        self.schema.addVariable("Server", "port", type=int, min=1, max=65535)
+        self.schema.addVariable("Server", "mode", choices=["safe", "slow"])
+        self.schema.addVariable("Server", "workers", type=int, required=False, default=4)
+
+    def test_every_violation_is_collected(self):
+        with self.assertRaises(hfclib.SchemaError) as context:
+            hfclib.parseHfc(hfc_text=SERVER, schema=self.schema)
+
+        self.assertEqual(len(context.exception.violations), 2)
+        self.assertEqual([line for line, _ in context.exception.violations], [4, 5])
+
+    def test_fail_fast_stops_at_the_first_violation(self):
+        with self.assertRaises(hfclib.SchemaError) as context:
+            hfclib.parseHfc(hfc_text=SERVER, schema=self.schema, fail_fast=True)
+
+        self.assertEqual(len(context.exception.violations), 1)
+
+    def test_valid_document(self):
+        text = SERVER.replace("99999", "8080").replace('"fast"', '"safe"')
+
+        hfc = hfclib.parseHfc(hfc_text=text, schema=self.schema)
+
+        self.assertEqual(hfclib.getVariableValue("Server", "port", hfc), 8080)
+        self.assertEqual(hfclib.validateHfc(hfc, self.schema), [])
+
+    def test_missing_and_strict(self):
+        schema = hfclib.Schema(strict=True).addVariable("Server", "ip", type="ip_address")
+        hfc = hfclib.parseHfc(hfc_text="== Server ==\n\nport = 80\n\n== Other ==\n")
+
+        self.assertEqual(len(hfclib.validateHfc(hfc, schema)), 3)
+        self.assertEqual(len(hfclib.validateHfc(hfc, schema, fail_fast=True)), 1)
+
+    def test_unknown_type(self):
+        with self.assertRaises(ValueError):
+            hfclib.Schema().addVariable("Server", "port", type="number").compile()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+class HfcServerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.write("service.hfc", "@include \"common.hfc\"\n\n== Server ==\n\nport = 80\nhosts = [\"a\", \"b\"]\n")
+        self.write("common.hfc", "== Common ==\n\nregion = \"eu\"\n")
+
+        self.server = hfclib.HfcServer(os.path.join(self.directory.name, "hfc.sock"), check_interval=0)
+        self.server.load(self.path)
+        self.thread = threading.Thread(target=self.server.serveForever, daemon=True)
+        self.thread.start()
+        self.client = hfclib.HfcClient(self.server.socket_path, timeout=10)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+        self.thread.join(10)
+        self.directory.cleanup()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as hfc_file:
+            hfc_file.write(text)
+        return path
+
+    # Write a file again, with a different stamp even within the resolution of the clock
+    def rewrite(self, name: str, text: str):
+        path = self.write(name, text)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_lookups(self):
+        self.assertEqual(self.client.getVariableValue("Server", "port", self.path), 80)
+        self.assertEqual(self.client.getVariables("Server", self.path), {"port": 80, "hosts": ["a", "b"]})
+        self.assertEqual(self.client.getSections(self.path), ["Common", "Server"])
+        self.assertEqual(self.client.findVariable("region", self.path), [{"Common": {"region": "eu"}}])
+
+        with self.assertRaises(ValueError):
+            self.client.getVariableValue("Server", "missing", self.path)
+
+    def test_batches(self):
+        calls = [("getVariableValue", "Server", "port", self.path), ("getVariableValue", "Server", "missing", self.path)] * 300
+        results = self.client.batch(calls, batch_size=64, raise_errors=False)
+
+        self.assertEqual(len(results), 600)
+        self.assertEqual(results[::2], [80] * 300)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results[1::2]))
+
+        with self.assertRaises(ValueError):
+            self.client.batch(calls[:2])
+
+    def test_changed_files_are_parsed_again(self):
+        self.assertEqual(self.client.getVariableValue("Server", "port", self.path), 80)
+
+        self.rewrite("service.hfc", "@include \"common.hfc\"\n\n== Server ==\n\nport = 8080\n")
+        self.assertEqual(self.client.getVariableValue("Server", "port", self.path), 8080)
+
+    def test_changed_includes_are_parsed_again(self):
+        self.assertEqual(self.client.getVariableValue("Common", "region", self.path), "eu")
+
+        self.rewrite("common.hfc", "== Common ==\n\nregion = \"us\"\n")
+        self.assertEqual(self.client.getVariableValue("Common", "region", self.path), "us")
+
+        # Another document parsing the include first doesn't hide the change
+        other = self.write("other.hfc", "@include \"common.hfc\"\n")
+        self.server.load(other)
+        self.rewrite("common.hfc", "== Common ==\n\nregion = \"ap\"\n")
+        self.assertEqual(self.client.getVariableValue("Common", "region", other), "ap")
+        self.assertEqual(self.client.getVariableValue("Common", "region", self.path), "ap")
+
+    def test_only_allowed_files_are_read(self):
+        secret = self.write("secret.hfc", "== Secret ==\n\nkey = \"x\"\n")
+
+        with self.assertRaises(PermissionError):
+            self.client.getSections(secret)
+
+    def test_invalid_frames_close_the_connection(self):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(10)
+        connection.connect(self.server.socket_path)
+        connection.sendall(struct.pack("<I", 2) + b"{}")
+
+        self.assertEqual(connection.recv(1), b"")
+        connection.close()
+
+        # Other connections keep working
+        self.assertEqual(self.client.getVariableValue("Server", "port", self.path), 80)
+
+
+class HfcServerRootsTest(unittest.TestCase):
+    def test_files_under_roots(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = os.path.join(directory, "configs")
+            os.mkdir(root)
+            path = os.path.join(root, "service.hfc")
+            with open(path, "w") as hfc_file:
+                hfc_file.write("== Server ==\n\nport = 80\n")
+
+            server = hfclib.HfcServer(os.path.join(directory, "hfc.sock"), roots=[root])
+            thread = threading.Thread(target=server.serveForever, daemon=True)
+            thread.start()
+
+            try:
+                with hfclib.HfcClient(server.socket_path, timeout=10) as client:
+                    self.assertEqual(client.getVariableValue("Server", "port", path), 80)
+
+                    with self.assertRaises(PermissionError):
+                        client.getSections(os.path.join(root, "..", "other.hfc"))
+            finally:
+                server.close()
+                thread.join(10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import multiprocessing
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+# Read a published variable in a worker process
+def read_port(name: str) -> int:
+    attached = hfclib.attachHfc(name)
+    try:
+        return attached.getVariableValue("Server", "port")
+    finally:
+        attached.close()
+
+
+class SharedHfcTest(unittest.TestCase):
+    def setUp(self):
+        self.name = f"hfclib-test-{os.getpid()}"
+        self.publisher = hfclib.HfcPublisher(self.name)
+        self.publisher.publish(hfc_text="== Server ==\n\nport = 80\nhost = \"example.org\"\n")
+
+    def tearDown(self):
+        self.publisher.close()
+
+    def test_attach_reads_the_document(self):
+        attached = hfclib.attachHfc(self.name)
+
+        self.assertEqual(attached.getVariableValue("Server", "port"), 80)
+        self.assertEqual(attached.getVariableValue("Server", "host"), "example.org")
+        self.assertFalse(attached.stale())
+        attached.close()
+
+    def test_segments_are_mapped_read_only(self):
+        attached = hfclib.attachHfc(self.name)
+
+        with self.assertRaises(TypeError):
+            attached._segment.buf[0] = 0
+        with self.assertRaises(TypeError):
+            attached._control.buf[0] = 0
+        attached.close()
+
+    def test_reattach_after_publish(self):
+        attached = hfclib.attachHfc(self.name)
+        self.publisher.publish(hfc_text="== Server ==\n\nport = 8080\n")
+
+        self.assertTrue(attached.stale())
+        attached = attached.reattach()
+        self.assertEqual(attached.getVariableValue("Server", "port"), 8080)
+        self.assertEqual(attached.generation, self.publisher.generation)
+        attached.close()
+
+    def test_workers_leave_the_segments_in_place(self):
+        with multiprocessing.Pool(2) as pool:
+            self.assertEqual(pool.map(read_port, [self.name] * 4), [80] * 4)
+
+        self.assertEqual(read_port(self.name), 80)
+
+    def test_missing_document(self):
+        with self.assertRaises(FileNotFoundError):
+            hfclib.attachHfc(f"{self.name}-missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+class HfcStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = hfclib.HfcStore([{"Server": {"port": 80, "host": "example.org"}}, {"Logging": {"level": "info"}}])
+
+    def test_writes_publish_new_snapshots(self):
+        before = self.store.snapshot()
+        after = self.store.editVariable("Server", "port", 8080)
+
+        self.assertEqual(after.version, before.version + 1)
+        self.assertEqual(after.getVariableValue("Server", "port"), 8080)
+        self.assertEqual(before.getVariableValue("Server", "port"), 80)
+        self.assertIs(self.store.snapshot(), after)
+
+    def test_snapshots_are_read_only(self):
+        snapshot = self.store.snapshot()
+
+        with self.assertRaises(TypeError):
+            snapshot.getVariables("Server")["port"] = 1
+
+        copy = snapshot.toList()
+        copy[0]["Server"]["port"] = 1
+        self.assertEqual(snapshot.getVariableValue("Server", "port"), 80)
+
+    def test_remove_section_with_variables(self):
+        snapshot = self.store.removeSection("Server")
+
+        self.assertEqual(snapshot.getSections(), ["Logging"])
+        self.assertEqual(self.store.snapshot().toList(), [{"Logging": {"level": "info"}}])
+
+        with self.assertRaises(ValueError):
+            self.store.removeSection("Server")
+
+    def test_concurrent_writers_keep_every_change(self):
+        def write(index):
+            for number in range(50):
+                self.store.addVariable("Server", f"key_{index}_{number}", number)
+
+        threads = [threading.Thread(target=write, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = self.store.snapshot()
+        self.assertEqual(snapshot.version, 200)
+        self.assertEqual(len(snapshot.getVariables("Server")), 202)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import stat
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hfclib
+
+
+class AtomicWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.a = os.path.join(self.directory.name, "a.hfc")
+        self.b = os.path.join(self.directory.name, "b.hfc")
+
+        for path in [self.a, self.b]:
+            with open(path, "w") as hfc_file:
+                hfc_file.write("== Old ==\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, path: str) -> str:
+        with open(path, "r") as hfc_file:
+            return hfc_file.read()
+
+    def test_documents_are_saved(self):
+        for fsync in hfclib.FSYNC_POLICIES:
+            saved = hfclib.saveHfcFiles({self.a: [{"Server": {"port": 80}}], self.b: "== Raw ==\n"}, fsync=fsync)
+
+            self.assertEqual(saved, [self.a, self.b])
+            self.assertEqual(hfclib.parseHfc(hfc_path=self.a), [{"Server": {"port": 80}}])
+            self.assertEqual(self.read(self.b), "== Raw ==\n")
+            self.assertEqual(sorted(os.listdir(self.directory.name)), ["a.hfc", "b.hfc"])
+
+    def test_failed_write_replaces_nothing(self):
+        missing = os.path.join(self.directory.name, "missing", "c.hfc")
+
+        with self.assertRaises(FileNotFoundError):
+            hfclib.saveHfcFiles({self.a: "== New ==\n", missing: "== New ==\n"})
+
+        self.assertEqual(self.read(self.a), "== Old ==\n")
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["a.hfc", "b.hfc"])
+
+    def test_mode_is_kept(self):
+        os.chmod(self.a, 0o640)
+
+        hfclib.parseList([{"Server": {"port": 80}}], write_path=self.a, fsync="file")
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.a).st_mode), 0o640)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            hfclib.saveHfcFiles({self.a: "== New ==\n"}, fsync="always")
+
+        self.assertEqual(self.read(self.a), "== Old ==\n")
+
+
+if __name__ == "__main__":
+    unittest.main()